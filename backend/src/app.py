@@ -11,15 +11,24 @@ import logging
 import os
 import time
 from pathlib import Path
-from typing import Any, Dict, List, cast
+from typing import Any, Dict, List, NamedTuple, Optional, cast
 
 import simple_websocket.ws  # pyright: ignore[reportMissingTypeStubs]
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_sock import Sock  # pyright: ignore[reportMissingTypeStubs]
 
 from src.config import config
+from src.services.analysis_jobs import DONE_EVENT, AnalysisJob, AnalysisJobManager, PartialCallback, format_sse
 from src.services.analyzers import ConversationAnalyzer, PronunciationAssessor
+from src.services.background_loop import background_loop
+from src.services.event_filter import EventFilter, parse_event_patterns
 from src.services.managers import AgentManager, ScenarioManager
+from src.services.metrics import metrics
+from src.services.rolling_evaluator import RollingEvaluator
+from src.services.session_capture import SessionCaptureStore
+from src.services.session_registry import SessionRegistry, install_drain_on_sigterm
+from src.services.state_store import create_state_store
+from src.services.transports import BlockingClientTransport
 from src.services.websocket_handler import VoiceProxyHandler
 
 # Constants
@@ -34,17 +43,34 @@ API_CONFIG_ENDPOINT = "/api/config"
 API_SCENARIOS_ENDPOINT = "/api/scenarios"
 API_AGENTS_CREATE_ENDPOINT = "/api/agents/create"
 API_ANALYZE_ENDPOINT = "/api/analyze"
+API_ANALYZE_JOBS_ENDPOINT = "/api/analyze/jobs"
 API_GRAPH_SCENARIO_ENDPOINT = "/api/scenarios/graph"
+API_METRICS_ENDPOINT = "/api/metrics"
+
+# Content types
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+EVENT_STREAM_CONTENT_TYPE = "text/event-stream"
+
+# Unit of SESSION_CAPTURE_MAX_TOTAL_MB
+BYTES_PER_MB = 1024 * 1024
+
+# Seconds between keep-alive comments on an idle event stream
+SSE_KEEPALIVE_SECONDS = 15.0
 
 # Error messages
 SCENARIO_ID_REQUIRED = "scenario_id is required"
 SCENARIO_NOT_FOUND = "Scenario not found"
 TRANSCRIPT_REQUIRED = "scenario_id and transcript are required"
+SESSION_NOT_FOUND = "Session not found or expired"
+JOB_NOT_FOUND = "Analysis job not found or expired"
+JOB_QUEUE_FULL = "Too many analysis jobs queued, try again later"
 
 # HTTP status codes
+HTTP_ACCEPTED = 202
 HTTP_BAD_REQUEST = 400
 HTTP_NOT_FOUND = 404
 HTTP_INTERNAL_SERVER_ERROR = 500
+HTTP_SERVICE_UNAVAILABLE = 503
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -55,11 +81,58 @@ app = Flask(__name__, static_folder=STATIC_FOLDER, static_url_path=STATIC_URL_PA
 sock = Sock(app)
 
 # Initialize managers and analyzers
-scenario_manager = ScenarioManager()
-agent_manager = AgentManager()
+state_store = create_state_store(config["state_store_url"])
+scenario_manager = ScenarioManager(store=state_store)
+agent_manager = AgentManager(store=state_store)
 conversation_analyzer = ConversationAnalyzer()
 pronunciation_assessor = PronunciationAssessor()
-voice_proxy_handler = VoiceProxyHandler(agent_manager)
+session_capture_store = (
+    SessionCaptureStore(
+        config["session_capture_ttl_seconds"],
+        config["session_capture_max_audio_seconds"],
+        config["session_capture_max_total_mb"] * BYTES_PER_MB,
+    )
+    if config["session_capture_enabled"]
+    else None
+)
+rolling_evaluator = (
+    RollingEvaluator(conversation_analyzer, config["session_capture_ttl_seconds"])
+    if session_capture_store and config["rolling_evaluation_enabled"]
+    else None
+)
+if session_capture_store and rolling_evaluator:
+    session_capture_store.add_turn_listener(rolling_evaluator.on_turn)
+analysis_jobs = AnalysisJobManager(
+    config["analysis_job_workers"], config["analysis_job_max_queued"], config["analysis_job_ttl_seconds"]
+)
+session_registry = SessionRegistry(config["max_concurrent_sessions"], config["session_retry_after_seconds"])
+voice_proxy_handler = VoiceProxyHandler(
+    agent_manager,
+    upstream_pool_size=config["upstream_pool_size"],
+    upstream_pool_max_idle_seconds=config["upstream_pool_max_idle_seconds"],
+    inbound_queue_depth=config["proxy_inbound_queue_depth"],
+    outbound_queue_depth=config["proxy_outbound_queue_depth"],
+    audio_coalesce_ms=config["proxy_audio_coalesce_ms"],
+    audio_coalesce_max_bytes=config["proxy_audio_coalesce_max_bytes"],
+    event_filter=EventFilter(
+        allow=parse_event_patterns(config["proxy_event_allowlist"]),
+        deny=parse_event_patterns(config["proxy_event_denylist"]),
+    ),
+    capture_store=session_capture_store,
+    session_registry=session_registry,
+    upstream_reconnect_attempts=config["upstream_reconnect_attempts"],
+    upstream_reconnect_backoff_seconds=config["upstream_reconnect_backoff_seconds"],
+)
+
+
+class AnalysisRequest(NamedTuple):
+    """Validated inputs of an analysis request."""
+
+    scenario_id: str
+    transcript: str
+    audio_data: List[Dict[str, Any]]
+    reference_text: str
+    session_id: Optional[str] = None
 
 
 @app.route("/")
@@ -135,18 +208,109 @@ def delete_agent(agent_id: str):
 @app.route(API_ANALYZE_ENDPOINT, methods=["POST"])
 def analyze_conversation():
     """Analyze a conversation for performance assessment."""
+    analysis_request = _parse_analyze_request()
+    if not isinstance(analysis_request, AnalysisRequest):
+        return analysis_request
+
+    return _perform_conversation_analysis(*analysis_request)
+
+
+@app.route(API_ANALYZE_JOBS_ENDPOINT, methods=["POST"])
+def create_analysis_job():
+    """Queue a conversation analysis and return its job id without waiting for the result."""
+    analysis_request = _parse_analyze_request()
+    if not isinstance(analysis_request, AnalysisRequest):
+        return analysis_request
+
+    scenario_id, transcript, audio_data, reference_text, session_id = analysis_request
+    job = analysis_jobs.submit(
+        {
+            "ai_assessment": lambda report: _assess_conversation(scenario_id, transcript, session_id, report),
+            "pronunciation_assessment": lambda _report: pronunciation_assessor.assess_pronunciation(
+                audio_data, reference_text
+            ),
+        }
+    )
+    if job is None:
+        return jsonify({"error": JOB_QUEUE_FULL}), HTTP_SERVICE_UNAVAILABLE
+
+    return (
+        jsonify(
+            {
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": f"{API_ANALYZE_JOBS_ENDPOINT}/{job.id}",
+                "events_url": f"{API_ANALYZE_JOBS_ENDPOINT}/{job.id}/events",
+            }
+        ),
+        HTTP_ACCEPTED,
+    )
+
+
+@app.route(f"{API_ANALYZE_JOBS_ENDPOINT}/<job_id>")
+def get_analysis_job(job_id: str):
+    """Get the status and the results available so far of an analysis job."""
+    job = analysis_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": JOB_NOT_FOUND}), HTTP_NOT_FOUND
+    return jsonify(job.snapshot())
+
+
+@app.route(f"{API_ANALYZE_JOBS_ENDPOINT}/<job_id>/events")
+def stream_analysis_job(job_id: str):
+    """Stream an analysis job's results as server-sent events as each part finishes."""
+    job = analysis_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": JOB_NOT_FOUND}), HTTP_NOT_FOUND
+    return Response(
+        _stream_job_events(job),
+        mimetype=EVENT_STREAM_CONTENT_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _stream_job_events(job: AnalysisJob):
+    """Yield the job's events, including those published before the client connected."""
+    seen = 0
+    while True:
+        events = job.wait_for_events(seen, SSE_KEEPALIVE_SECONDS)
+        if not events:
+            yield ": keep-alive\n\n"
+            continue
+        seen += len(events)
+        for event, data in events:
+            yield format_sse(event, data)
+            if event == DONE_EVENT:
+                return
+
+
+def _parse_analyze_request():
+    """Read the analysis inputs, or build the error response for an invalid request."""
     data = cast(Dict[str, Any], request.json)
     scenario_id = cast(str, data.get("scenario_id"))
     transcript = cast(str, data.get("transcript"))
     audio_data = data.get("audio_data", [])
     reference_text = cast(str, data.get("reference_text"))
+    session_id = data.get("session_id")
+
+    if session_id:
+        capture = session_capture_store.get(session_id) if session_capture_store else None
+        if capture:
+            audio_data = capture.audio_data()
+            transcript = transcript or capture.transcript()
+            reference_text = reference_text or capture.reference_text()
+        elif audio_data:
+            # Capture disabled, expired or held by another worker: use the audio the client recorded
+            logger.warning("Session %s not captured here, analyzing the posted audio", session_id)
+        else:
+            return jsonify({"error": SESSION_NOT_FOUND}), HTTP_NOT_FOUND
 
     _log_analyze_request(scenario_id, transcript, reference_text)
 
     if not scenario_id or not transcript:
         return jsonify({"error": TRANSCRIPT_REQUIRED}), HTTP_BAD_REQUEST
 
-    return _perform_conversation_analysis(scenario_id, transcript, audio_data, reference_text)
+    return AnalysisRequest(scenario_id, transcript, audio_data, reference_text, session_id)
 
 
 def _log_analyze_request(scenario_id: str, transcript: str, reference_text: str):
@@ -164,33 +328,67 @@ def _perform_conversation_analysis(
     transcript: str,
     audio_data: List[Dict[str, Any]],
     reference_text: str,
+    session_id: Optional[str] = None,
 ):
-    """Perform the actual conversation analysis."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    """Perform the actual conversation analysis on the shared background event loop."""
 
-    try:
-        tasks = [
-            conversation_analyzer.analyze_conversation(scenario_id, transcript),
+    async def analyze():
+        return await asyncio.gather(
+            _assess_conversation(scenario_id, transcript, session_id),
             pronunciation_assessor.assess_pronunciation(audio_data, reference_text),
-        ]
+            return_exceptions=True,
+        )
 
-        results = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    ai_assessment, pronunciation = background_loop.run(analyze())
 
-        ai_assessment, pronunciation = results
+    if isinstance(ai_assessment, Exception):
+        logger.error("AI assessment failed: %s", ai_assessment)
+        ai_assessment = None
 
-        if isinstance(ai_assessment, Exception):
-            logger.error("AI assessment failed: %s", ai_assessment)
-            ai_assessment = None
+    if isinstance(pronunciation, Exception):
+        logger.error("Pronunciation assessment failed: %s", pronunciation)
+        pronunciation = None
 
-        if isinstance(pronunciation, Exception):
-            logger.error("Pronunciation assessment failed: %s", pronunciation)
-            pronunciation = None
+    return jsonify({"ai_assessment": ai_assessment, "pronunciation_assessment": pronunciation})
 
-        return jsonify({"ai_assessment": ai_assessment, "pronunciation_assessment": pronunciation})
 
-    finally:
-        loop.close()
+async def _assess_conversation(
+    scenario_id: str,
+    transcript: str,
+    session_id: Optional[str],
+    report: Optional[PartialCallback] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Evaluate a conversation, merging the session's running evaluation when one covers it.
+
+    Args:
+        scenario_id: The scenario identifier
+        transcript: The conversation transcript
+        session_id: The proxy session id, if the conversation was captured
+        report: If given, the evaluation is streamed and each section reported as it completes
+
+    Returns:
+        Optional[Dict[str, Any]]: The evaluation or None if it fails
+    """
+    if session_id and rolling_evaluator:
+        evaluation = await rolling_evaluator.final_evaluation(session_id, scenario_id)
+        if evaluation is not None:
+            if report is not None:
+                for name, value in evaluation.items():
+                    report(name, value)
+            return evaluation
+
+    if report is not None:
+        return await conversation_analyzer.stream_conversation_analysis(scenario_id, transcript, report)
+    return await conversation_analyzer.analyze_conversation(scenario_id, transcript)
+
+
+@app.route(API_METRICS_ENDPOINT)
+def get_metrics():
+    """Export in-process metrics as JSON, or as Prometheus text with ?format=prometheus."""
+    if request.args.get("format") == "prometheus":
+        return Response(metrics.render_prometheus(), mimetype=PROMETHEUS_CONTENT_TYPE)
+    return jsonify(metrics.snapshot())
 
 
 @app.route(f"/{AUDIO_PROCESSOR_FILE}")
@@ -211,7 +409,7 @@ def voice_proxy(ws: simple_websocket.ws.Server):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
-    loop.run_until_complete(voice_proxy_handler.handle_connection(ws))
+    loop.run_until_complete(voice_proxy_handler.handle_connection(BlockingClientTransport(ws)))
 
 
 @app.route(API_GRAPH_SCENARIO_ENDPOINT, methods=["POST"])
@@ -234,7 +432,7 @@ def generate_graph_scenario():
             with open(canned_file, encoding="utf-8") as f:
                 graph_data = json.load(f)
 
-        scenario = scenario_manager.generate_scenario_from_graph(graph_data)
+        scenario = background_loop.run(scenario_manager.generate_scenario_from_graph(graph_data))
 
         return jsonify(scenario)
     except Exception as e:
@@ -242,6 +440,22 @@ def generate_graph_scenario():
         return jsonify({"error": str(e)}), HTTP_INTERNAL_SERVER_ERROR
 
 
+def limit_sessions_to_receive_workers(registry: SessionRegistry, receive_workers: int) -> None:
+    """
+    Cap concurrent voice sessions at the receive threads of the threaded Flask server.
+
+    Every Flask session holds a ``websocket_receive`` worker until it ends, so a session
+    admitted beyond the pool size would never get its messages read.
+
+    Args:
+        registry: The session registry to limit
+        receive_workers: Size of the ``websocket_receive`` executor
+    """
+    if not registry.max_sessions or registry.max_sessions > receive_workers:
+        logger.info("Limiting voice sessions to %s, the number of WebSocket receive threads", receive_workers)
+        registry.max_sessions = receive_workers
+
+
 def main():
     """Run the Flask application."""
     host = config["host"]
@@ -249,6 +463,8 @@ def main():
     print(f"Starting Voice Live Demo on http://{host}:{port}")
 
     debug_mode = os.getenv("FLASK_ENV") == "development"
+    limit_sessions_to_receive_workers(session_registry, config["executor_websocket_io_workers"])
+    install_drain_on_sigterm(session_registry, config["drain_timeout_seconds"])
     app.run(host=host, port=port, debug=debug_mode)
 
 
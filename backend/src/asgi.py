@@ -0,0 +1,245 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+ASGI entry point for the upskilling agent.
+
+Serves ``/ws/voice`` and the analysis job event streams natively on the server's event
+loop, so an idle voice session or a client waiting for an analysis costs a coroutine
+instead of a worker thread. All other HTTP routes are handed to the existing Flask
+application through a bounded WSGI thread pool.
+
+Run with:
+    uvicorn src.asgi:application --host 0.0.0.0 --port 8000
+    hypercorn src.asgi:application --bind 0.0.0.0:8000
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from a2wsgi import WSGIMiddleware
+
+from src.app import (
+    API_ANALYZE_JOBS_ENDPOINT,
+    EVENT_STREAM_CONTENT_TYPE,
+    HTTP_NOT_FOUND,
+    JOB_NOT_FOUND,
+    SSE_KEEPALIVE_SECONDS,
+    WEBSOCKET_ENDPOINT,
+    analysis_jobs,
+    app,
+    session_registry,
+    voice_proxy_handler,
+)
+from src.config import config
+from src.services.analysis_jobs import DONE_EVENT, AnalysisJob, AnalysisJobManager, format_sse
+from src.services.background_loop import background_loop
+from src.services.executors import executors
+from src.services.session_registry import install_drain_on_sigterm
+from src.services.transports import AsgiClientTransport
+from src.services.websocket_handler import VoiceProxyHandler
+
+# WebSocket close code for connections to unknown paths
+WS_CLOSE_POLICY_VIOLATION = 1008
+
+# Path suffix of an analysis job's event stream
+JOB_EVENTS_SUFFIX = "/events"
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+LifespanHook = Callable[[], Awaitable[None]]
+
+
+class VoiceLiveASGIApp:
+    """ASGI application combining the Flask REST API with the native voice WebSocket and job streams."""
+
+    def __init__(
+        self,
+        wsgi_app: Any,
+        handler: VoiceProxyHandler,
+        wsgi_workers: int,
+        jobs: Optional[AnalysisJobManager] = None,
+    ):
+        """
+        Initialize the ASGI application.
+
+        Args:
+            wsgi_app: The Flask application serving the HTTP routes
+            handler: The voice proxy handler serving the WebSocket endpoint
+            wsgi_workers: Number of threads available to the WSGI application
+            jobs: Analysis jobs whose event streams are served natively (left to Flask if None)
+        """
+        self.http_app = WSGIMiddleware(wsgi_app, workers=wsgi_workers)
+        self.handler = handler
+        self.jobs = jobs
+        self.startup_hooks: List[LifespanHook] = []
+        self.shutdown_hooks: List[LifespanHook] = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Dispatch an ASGI connection by scope type."""
+        if scope["type"] == "websocket":
+            await self._handle_websocket(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self._handle_lifespan(receive, send)
+        else:
+            job_id = self._job_events_id(scope)
+            if job_id is not None:
+                await self._handle_job_events(job_id, receive, send)
+            else:
+                await self.http_app(scope, receive, send)  # pyright: ignore[reportArgumentType]
+
+    def _job_events_id(self, scope: Scope) -> Optional[str]:
+        """Get the job id of a ``GET /api/analyze/jobs/<id>/events`` request, if it is one."""
+        if self.jobs is None or scope["type"] != "http" or scope.get("method") != "GET":
+            return None
+        path: str = scope["path"]
+        prefix = f"{API_ANALYZE_JOBS_ENDPOINT}/"
+        if not path.startswith(prefix) or not path.endswith(JOB_EVENTS_SUFFIX):
+            return None
+        job_id = path[len(prefix) : -len(JOB_EVENTS_SUFFIX)]
+        return job_id if job_id and "/" not in job_id else None
+
+    async def _handle_job_events(self, job_id: str, receive: Receive, send: Send) -> None:
+        """Stream an analysis job's events as server-sent events on the event loop."""
+        job = self.jobs.get(job_id) if self.jobs else None
+        if job is None:
+            body = json.dumps({"error": JOB_NOT_FOUND}).encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": HTTP_NOT_FOUND,
+                    "headers": [(b"content-type", b"application/json")],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", EVENT_STREAM_CONTENT_TYPE.encode()),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+        try:
+            await self._send_job_events(job, send, disconnected)
+        finally:
+            disconnected.cancel()
+
+    async def _send_job_events(self, job: AnalysisJob, send: Send, disconnected: "asyncio.Future[None]") -> None:
+        """Send the job's events, including those published before the client connected, until done."""
+        seen = 0
+        while not disconnected.done():
+            waiting = asyncio.ensure_future(job.next_events(seen, SSE_KEEPALIVE_SECONDS))
+            await asyncio.wait({waiting, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if not waiting.done():
+                waiting.cancel()
+                return
+            events = waiting.result()
+            if not events:
+                await send({"type": "http.response.body", "body": b": keep-alive\n\n", "more_body": True})
+                continue
+            seen += len(events)
+            for event, data in events:
+                done = event == DONE_EVENT
+                await send(
+                    {"type": "http.response.body", "body": format_sse(event, data).encode(), "more_body": not done}
+                )
+                if done:
+                    return
+
+    async def _handle_websocket(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve the voice proxy WebSocket and reject any other path."""
+        if scope["path"] != WEBSOCKET_ENDPOINT:
+            await receive()
+            await send({"type": "websocket.close", "code": WS_CLOSE_POLICY_VIOLATION})
+            return
+
+        transport = AsgiClientTransport(receive, send)
+        if not await transport.accept():
+            return
+
+        logger.info("New WebSocket connection")
+        try:
+            await self.handler.handle_connection(transport)
+        finally:
+            await transport.close()
+
+    async def _handle_lifespan(self, receive: Receive, send: Send) -> None:
+        """Run startup and shutdown hooks for the ASGI lifespan protocol."""
+        while True:
+            event = await receive()
+            if event["type"] == "lifespan.startup":
+                try:
+                    for hook in self.startup_hooks:
+                        await hook()
+                except Exception as e:
+                    logger.error("ASGI startup failed: %s", e)
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif event["type"] == "lifespan.shutdown":
+                for hook in self.shutdown_hooks:
+                    try:
+                        await hook()
+                    except Exception as e:
+                        logger.error("ASGI shutdown hook failed: %s", e)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def _wait_for_disconnect(receive: Receive) -> None:
+    """Return once the HTTP client has gone away."""
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _install_drain() -> None:
+    """Drain voice sessions on SIGTERM before the server shuts down."""
+    install_drain_on_sigterm(session_registry, config["drain_timeout_seconds"])
+
+
+async def _shutdown_analysis_jobs() -> None:
+    """Cancel unfinished analysis jobs, ending their event streams, while the background loop still runs."""
+    analysis_jobs.shutdown()
+
+
+async def _shutdown_executors() -> None:
+    """Stop the blocking-work executors and the background event loop."""
+    executors.shutdown()
+    background_loop.stop()
+
+
+application = VoiceLiveASGIApp(app, voice_proxy_handler, config["asgi_wsgi_workers"], analysis_jobs)
+application.startup_hooks.append(voice_proxy_handler.start)
+application.startup_hooks.append(_install_drain)
+application.shutdown_hooks.append(voice_proxy_handler.stop)
+application.shutdown_hooks.append(_shutdown_analysis_jobs)
+application.shutdown_hooks.append(_shutdown_executors)
+
+
+def main():
+    """Run the ASGI application with uvicorn."""
+    import uvicorn  # pylint: disable=C0415
+
+    host = config["host"]
+    port = config["port"]
+    print(f"Starting Voice Live Demo (ASGI) on http://{host}:{port}")
+
+    uvicorn.run(application, host=host, port=port)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,36 @@ DEFAULT_VOICE_NAME = "en-US-Ava:DragonHDLatestNeural"
 DEFAULT_VOICE_TYPE = "azure-standard"
 DEFAULT_AVATAR_CHARACTER = "lisa"
 DEFAULT_AVATAR_STYLE = "casual-sitting"
+DEFAULT_ASGI_WSGI_WORKERS = 10
+DEFAULT_UPSTREAM_POOL_SIZE = 0
+DEFAULT_UPSTREAM_POOL_MAX_IDLE_SECONDS = 60
+DEFAULT_UPSTREAM_RECONNECT_ATTEMPTS = 3
+DEFAULT_UPSTREAM_RECONNECT_BACKOFF_SECONDS = 0.5
+DEFAULT_PROXY_INBOUND_QUEUE_DEPTH = 50
+DEFAULT_PROXY_OUTBOUND_QUEUE_DEPTH = 100
+DEFAULT_PROXY_AUDIO_COALESCE_MS = 0
+DEFAULT_EXECUTOR_WEBSOCKET_IO_WORKERS = 200
+DEFAULT_EXECUTOR_WEBSOCKET_SEND_WORKERS = 32
+DEFAULT_EXECUTOR_SPEECH_WORKERS = 4
+DEFAULT_EXECUTOR_STATE_STORE_WORKERS = 8
+DEFAULT_OPENAI_MAX_CONNECTIONS = 20
+DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_OPENAI_KEEPALIVE_EXPIRY_SECONDS = 120
+DEFAULT_OPENAI_TIMEOUT_SECONDS = 120
+DEFAULT_MAX_CONCURRENT_SESSIONS = 0
+DEFAULT_SESSION_RETRY_AFTER_SECONDS = 5
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 300
+DEFAULT_SESSION_CAPTURE_TTL_SECONDS = 1800
+DEFAULT_SESSION_CAPTURE_MAX_AUDIO_SECONDS = 600
+DEFAULT_SESSION_CAPTURE_MAX_TOTAL_MB = 512
+DEFAULT_PROXY_AUDIO_COALESCE_MAX_BYTES = 19200
+DEFAULT_ANALYSIS_JOB_WORKERS = 4
+DEFAULT_ANALYSIS_JOB_MAX_QUEUED = 50
+DEFAULT_ANALYSIS_JOB_TTL_SECONDS = 600
+DEFAULT_EVALUATION_CACHE_MAX_ENTRIES = 256
+DEFAULT_EVALUATION_CACHE_TTL_SECONDS = 86400
+DEFAULT_EVALUATION_TOKEN_BUDGET = 6000
+DEFAULT_EVALUATION_ASSISTANT_TURN_MAX_WORDS = 40
 
 
 class Config:
@@ -54,6 +84,8 @@ class Config:
             "azure_speech_region": os.getenv("AZURE_SPEECH_REGION", DEFAULT_REGION),
             "azure_speech_language": os.getenv("AZURE_SPEECH_LANGUAGE", DEFAULT_SPEECH_LANGUAGE),
             "api_version": DEFAULT_API_VERSION,
+            "voice_live_url": os.getenv("VOICE_LIVE_URL", ""),
+            "state_store_url": os.getenv("STATE_STORE_URL", ""),
             # NEW ADDITIONS
             "azure_input_transcription_model": os.getenv(
                 "AZURE_INPUT_TRANSCRIPTION_MODEL", DEFAULT_INPUT_TRANSCRIPTION_MODEL
@@ -68,6 +100,79 @@ class Config:
             "azure_voice_type": os.getenv("AZURE_VOICE_TYPE", DEFAULT_VOICE_TYPE),
             "azure_avatar_character": os.getenv("AZURE_AVATAR_CHARACTER", DEFAULT_AVATAR_CHARACTER),
             "azure_avatar_style": os.getenv("AZURE_AVATAR_STYLE", DEFAULT_AVATAR_STYLE),
+            "asgi_wsgi_workers": int(os.getenv("ASGI_WSGI_WORKERS", str(DEFAULT_ASGI_WSGI_WORKERS))),
+            "upstream_pool_size": int(os.getenv("UPSTREAM_POOL_SIZE", str(DEFAULT_UPSTREAM_POOL_SIZE))),
+            "upstream_pool_max_idle_seconds": float(
+                os.getenv("UPSTREAM_POOL_MAX_IDLE_SECONDS", str(DEFAULT_UPSTREAM_POOL_MAX_IDLE_SECONDS))
+            ),
+            "upstream_reconnect_attempts": int(
+                os.getenv("UPSTREAM_RECONNECT_ATTEMPTS", str(DEFAULT_UPSTREAM_RECONNECT_ATTEMPTS))
+            ),
+            "upstream_reconnect_backoff_seconds": float(
+                os.getenv("UPSTREAM_RECONNECT_BACKOFF_SECONDS", str(DEFAULT_UPSTREAM_RECONNECT_BACKOFF_SECONDS))
+            ),
+            "proxy_inbound_queue_depth": int(
+                os.getenv("PROXY_INBOUND_QUEUE_DEPTH", str(DEFAULT_PROXY_INBOUND_QUEUE_DEPTH))
+            ),
+            "proxy_outbound_queue_depth": int(
+                os.getenv("PROXY_OUTBOUND_QUEUE_DEPTH", str(DEFAULT_PROXY_OUTBOUND_QUEUE_DEPTH))
+            ),
+            "max_concurrent_sessions": int(os.getenv("MAX_CONCURRENT_SESSIONS", str(DEFAULT_MAX_CONCURRENT_SESSIONS))),
+            "session_retry_after_seconds": float(
+                os.getenv("SESSION_RETRY_AFTER_SECONDS", str(DEFAULT_SESSION_RETRY_AFTER_SECONDS))
+            ),
+            "drain_timeout_seconds": float(os.getenv("DRAIN_TIMEOUT_SECONDS", str(DEFAULT_DRAIN_TIMEOUT_SECONDS))),
+            "executor_websocket_io_workers": int(
+                os.getenv("EXECUTOR_WEBSOCKET_IO_WORKERS", str(DEFAULT_EXECUTOR_WEBSOCKET_IO_WORKERS))
+            ),
+            "executor_websocket_send_workers": int(
+                os.getenv("EXECUTOR_WEBSOCKET_SEND_WORKERS", str(DEFAULT_EXECUTOR_WEBSOCKET_SEND_WORKERS))
+            ),
+            "executor_speech_workers": int(os.getenv("EXECUTOR_SPEECH_WORKERS", str(DEFAULT_EXECUTOR_SPEECH_WORKERS))),
+            "executor_state_store_workers": int(
+                os.getenv("EXECUTOR_STATE_STORE_WORKERS", str(DEFAULT_EXECUTOR_STATE_STORE_WORKERS))
+            ),
+            "openai_max_connections": int(os.getenv("OPENAI_MAX_CONNECTIONS", str(DEFAULT_OPENAI_MAX_CONNECTIONS))),
+            "openai_max_keepalive_connections": int(
+                os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", str(DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS))
+            ),
+            "openai_keepalive_expiry_seconds": float(
+                os.getenv("OPENAI_KEEPALIVE_EXPIRY_SECONDS", str(DEFAULT_OPENAI_KEEPALIVE_EXPIRY_SECONDS))
+            ),
+            "openai_timeout_seconds": float(os.getenv("OPENAI_TIMEOUT_SECONDS", str(DEFAULT_OPENAI_TIMEOUT_SECONDS))),
+            "session_capture_enabled": self._parse_bool_env("SESSION_CAPTURE_ENABLED", True),
+            "session_capture_ttl_seconds": float(
+                os.getenv("SESSION_CAPTURE_TTL_SECONDS", str(DEFAULT_SESSION_CAPTURE_TTL_SECONDS))
+            ),
+            "session_capture_max_audio_seconds": float(
+                os.getenv("SESSION_CAPTURE_MAX_AUDIO_SECONDS", str(DEFAULT_SESSION_CAPTURE_MAX_AUDIO_SECONDS))
+            ),
+            "session_capture_max_total_mb": int(
+                os.getenv("SESSION_CAPTURE_MAX_TOTAL_MB", str(DEFAULT_SESSION_CAPTURE_MAX_TOTAL_MB))
+            ),
+            "proxy_event_allowlist": os.getenv("PROXY_EVENT_ALLOWLIST", ""),
+            "proxy_event_denylist": os.getenv("PROXY_EVENT_DENYLIST", ""),
+            "proxy_audio_coalesce_ms": int(os.getenv("PROXY_AUDIO_COALESCE_MS", str(DEFAULT_PROXY_AUDIO_COALESCE_MS))),
+            "proxy_audio_coalesce_max_bytes": int(
+                os.getenv("PROXY_AUDIO_COALESCE_MAX_BYTES", str(DEFAULT_PROXY_AUDIO_COALESCE_MAX_BYTES))
+            ),
+            "analysis_job_workers": int(os.getenv("ANALYSIS_JOB_WORKERS", str(DEFAULT_ANALYSIS_JOB_WORKERS))),
+            "analysis_job_max_queued": int(os.getenv("ANALYSIS_JOB_MAX_QUEUED", str(DEFAULT_ANALYSIS_JOB_MAX_QUEUED))),
+            "analysis_job_ttl_seconds": float(
+                os.getenv("ANALYSIS_JOB_TTL_SECONDS", str(DEFAULT_ANALYSIS_JOB_TTL_SECONDS))
+            ),
+            "evaluation_cache_max_entries": int(
+                os.getenv("EVALUATION_CACHE_MAX_ENTRIES", str(DEFAULT_EVALUATION_CACHE_MAX_ENTRIES))
+            ),
+            "evaluation_cache_ttl_seconds": float(
+                os.getenv("EVALUATION_CACHE_TTL_SECONDS", str(DEFAULT_EVALUATION_CACHE_TTL_SECONDS))
+            ),
+            "evaluation_cache_dir": os.getenv("EVALUATION_CACHE_DIR", ""),
+            "rolling_evaluation_enabled": self._parse_bool_env("ROLLING_EVALUATION_ENABLED", False),
+            "evaluation_token_budget": int(os.getenv("EVALUATION_TOKEN_BUDGET", str(DEFAULT_EVALUATION_TOKEN_BUDGET))),
+            "evaluation_assistant_turn_max_words": int(
+                os.getenv("EVALUATION_ASSISTANT_TURN_MAX_WORDS", str(DEFAULT_EVALUATION_ASSISTANT_TURN_MAX_WORDS))
+            ),
         }
         return result
 
@@ -0,0 +1,367 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Background analysis jobs whose results are polled or streamed as server-sent events."""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from src.services.background_loop import background_loop
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+
+# Event sent once every part of a job has finished
+DONE_EVENT = "done"
+
+# Suffix of the events reporting a section of a part's result before the part finishes
+PARTIAL_EVENT_SUFFIX = ".partial"
+
+# Metric names
+ANALYSIS_JOBS_METRIC = "analysis_jobs_total"
+ANALYSIS_JOBS_QUEUED_METRIC = "analysis_jobs_queued"
+ANALYSIS_JOBS_RUNNING_METRIC = "analysis_jobs_running"
+ANALYSIS_JOB_WAIT_METRIC = "analysis_job_wait_seconds"
+ANALYSIS_JOB_PART_METRIC = "analysis_job_part_seconds"
+ANALYSIS_JOB_SECONDS_METRIC = "analysis_job_seconds"
+
+# Buckets covering queueing delays and model or speech calls of up to a minute
+ANALYSIS_JOB_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Receives a section (name, value) of a part's result as soon as it is available
+PartialCallback = Callable[[str, Any], None]
+
+# A part of an analysis, such as the AI assessment, returning its JSON result;
+# parts able to report sections early call the callback they are given
+AnalysisPart = Callable[[PartialCallback], Awaitable[Any]]
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format one server-sent event.
+
+    Args:
+        event: The event name
+        data: JSON-serializable event data
+
+    Returns:
+        str: The event in ``text/event-stream`` format
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class AnalysisJob:
+    """One analysis request and the results of its parts as they finish."""
+
+    def __init__(self, parts: Mapping[str, AnalysisPart]):
+        """
+        Initialize the job.
+
+        Args:
+            parts: The analysis parts to run concurrently, keyed by result name
+        """
+        self.id = uuid.uuid4().hex
+        self.parts = dict(parts)
+        self.status = QUEUED
+        self.results: Dict[str, Any] = {}
+        self.partials: Dict[str, Dict[str, Any]] = {}
+        self.events: List[Tuple[str, Any]] = []
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._condition = threading.Condition()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe the job's progress and the results available so far.
+
+        Returns:
+            Dict[str, Any]: Job id, status, pending part names, sections reported by pending
+            parts and the finished results
+        """
+        with self._condition:
+            end = self.finished_at or time.monotonic()
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "pending": [name for name in self.parts if name not in self.results],
+                "partial": {
+                    name: dict(sections) for name, sections in self.partials.items() if name not in self.results
+                },
+                "elapsed_seconds": round(end - self.submitted_at, 3),
+                **self.results,
+            }
+
+    def wait_for_events(self, start: int, timeout: float) -> List[Tuple[str, Any]]:
+        """
+        Wait for events after the first ``start`` ones.
+
+        Args:
+            start: Number of events already seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            List[Tuple[str, Any]]: The new events as (name, data) pairs, empty on timeout
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: len(self.events) > start, timeout)
+            return self.events[start:]
+
+    async def next_events(self, start: int, timeout: float) -> List[Tuple[str, Any]]:
+        """
+        Wait for events after the first ``start`` ones without blocking a thread.
+
+        Args:
+            start: Number of events already seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            List[Tuple[str, Any]]: The new events as (name, data) pairs, empty on timeout
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._condition:
+            if len(self.events) > start:
+                return self.events[start:]
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._condition:
+                self._waiters.remove(waiter)
+        with self._condition:
+            return self.events[start:]
+
+    def start(self) -> bool:
+        """
+        Mark the job as running.
+
+        Returns:
+            bool: False if the job was cancelled before it started
+        """
+        with self._condition:
+            if self.finished_at is not None:
+                return False
+            self.status = RUNNING
+            self.started_at = time.monotonic()
+            self._publish("status", {"status": RUNNING})
+            return True
+
+    def set_partial(self, name: str, section: str, value: Any) -> None:
+        """Record and publish a section of a part's result before the part finishes."""
+        with self._condition:
+            self.partials.setdefault(name, {})[section] = value
+            self._publish(f"{name}{PARTIAL_EVENT_SUFFIX}", {"section": section, "value": value})
+
+    def set_result(self, name: str, result: Any) -> None:
+        """Record and publish the result of one part."""
+        with self._condition:
+            self.results[name] = result
+            self._publish(name, result)
+
+    def finish(self, status: str = COMPLETED) -> None:
+        """Mark the job as finished with the given status and publish the final snapshot, once."""
+        with self._condition:
+            if self.finished_at is not None:
+                return
+            self.status = status
+            self.finished_at = time.monotonic()
+            self._publish(DONE_EVENT, self.snapshot())
+
+    def cancel(self) -> bool:
+        """
+        Finish a job that has not started, with None for every part.
+
+        Returns:
+            bool: True if the job was still queued and is now cancelled
+        """
+        with self._condition:
+            if self.status != QUEUED or self.finished_at is not None:
+                return False
+            for name in self.parts:
+                self.results.setdefault(name, None)
+            self.finish(CANCELLED)
+            return True
+
+    def _publish(self, event: str, data: Any) -> None:
+        self.events.append((event, data))
+        self._condition.notify_all()
+        for loop, ready in self._waiters:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                logger.debug("Event stream of job %s outlived its event loop", self.id)
+
+
+class AnalysisJobManager:
+    """
+    Runs analysis jobs on a bounded pool of worker threads.
+
+    Each worker waits while its job's parts run concurrently on the shared background
+    event loop, so the workers bound how many analyses are in flight.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queued`` wait for a
+    worker; further submissions are rejected so that a burst cannot grow the backlog
+    without bound. Finished jobs are kept for ``ttl_seconds`` for clients to collect.
+    """
+
+    def __init__(self, max_workers: int, max_queued: int, ttl_seconds: float):
+        """
+        Initialize the manager.
+
+        Args:
+            max_workers: Jobs run concurrently
+            max_queued: Jobs allowed to wait for a worker
+            ttl_seconds: How long a finished job is kept
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.ttl_seconds = ttl_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-")
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._in_flight: Dict[str, "Future[None]"] = {}
+        self._closed = False
+
+    def submit(self, parts: Mapping[str, AnalysisPart]) -> Optional[AnalysisJob]:
+        """
+        Queue an analysis job.
+
+        Args:
+            parts: The analysis parts to run concurrently, keyed by result name
+
+        Returns:
+            Optional[AnalysisJob]: The queued job, or None if the queue is full
+        """
+        with self._lock:
+            self._expire()
+            if self._queued >= self.max_queued:
+                metrics.increment(ANALYSIS_JOBS_METRIC, status="rejected")
+                logger.warning("Analysis job rejected, %s job(s) already queued", self._queued)
+                return None
+            job = AnalysisJob(parts)
+            self._jobs[job.id] = job
+            self._queued += 1
+            metrics.set_gauge(ANALYSIS_JOBS_QUEUED_METRIC, self._queued)
+        self._pool.submit(self._run, job)
+        logger.info("Queued analysis job %s", job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """
+        Get a job by id.
+
+        Args:
+            job_id: The job identifier
+
+        Returns:
+            Optional[AnalysisJob]: The job, or None if unknown or expired
+        """
+        with self._lock:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def _run(self, job: AnalysisJob) -> None:
+        """Run a job on a worker thread."""
+        if not job.start():
+            # Cancelled by shutdown, which already took it off the queue
+            return
+        self._update(queued=-1, running=1)
+        metrics.observe(ANALYSIS_JOB_WAIT_METRIC, time.monotonic() - job.submitted_at, buckets=ANALYSIS_JOB_BUCKETS)
+        status = COMPLETED
+        try:
+            future = background_loop.submit(self._run_parts(job))
+            with self._lock:
+                self._in_flight[job.id] = future
+                if self._closed:
+                    future.cancel()
+            future.result()
+        except CancelledError:
+            logger.warning("Analysis job %s cancelled by shutdown", job.id)
+            status = CANCELLED
+        except Exception as e:
+            logger.error("Analysis job %s failed: %s", job.id, e)
+        finally:
+            with self._lock:
+                self._in_flight.pop(job.id, None)
+            for name in job.parts:
+                if name not in job.results:
+                    job.set_result(name, None)
+            job.finish(status)
+            self._update(running=-1)
+            metrics.increment(ANALYSIS_JOBS_METRIC, status=status)
+            elapsed = time.monotonic() - job.submitted_at
+            metrics.observe(ANALYSIS_JOB_SECONDS_METRIC, elapsed, buckets=ANALYSIS_JOB_BUCKETS)
+            logger.info("Analysis job %s finished in %.2fs", job.id, elapsed)
+
+    async def _run_parts(self, job: AnalysisJob) -> None:
+        """Run the parts of a job concurrently, publishing each result as it finishes."""
+        await asyncio.gather(*(self._run_part(job, name, part) for name, part in job.parts.items()))
+
+    async def _run_part(self, job: AnalysisJob, name: str, part: AnalysisPart) -> None:
+        """Run one part, recording None if it fails."""
+        started = time.monotonic()
+        try:
+            result = await part(lambda section, value: job.set_partial(name, section, value))
+        except Exception as e:
+            logger.error("Analysis job %s: %s failed: %s", job.id, name, e)
+            result = None
+        metrics.observe(ANALYSIS_JOB_PART_METRIC, time.monotonic() - started, buckets=ANALYSIS_JOB_BUCKETS, part=name)
+        job.set_result(name, result)
+
+    def _update(self, queued: int = 0, running: int = 0) -> None:
+        """Adjust and publish the queued and running counts."""
+        with self._lock:
+            self._queued += queued
+            self._running += running
+            metrics.set_gauge(ANALYSIS_JOBS_QUEUED_METRIC, self._queued)
+            metrics.set_gauge(ANALYSIS_JOBS_RUNNING_METRIC, self._running)
+
+    def _expire(self) -> None:
+        """Drop jobs that finished more than the TTL ago."""
+        now = time.monotonic()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        """
+        Stop the workers and cancel unfinished jobs.
+
+        Queued jobs are finished as cancelled and the parts of running jobs are cancelled
+        on the background event loop, so every job publishes its final event and open
+        event streams end.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._closed = True
+            jobs = list(self._jobs.values())
+            in_flight = list(self._in_flight.values())
+        for future in in_flight:
+            future.cancel()
+        cancelled = sum(job.cancel() for job in jobs)
+        if cancelled:
+            self._update(queued=-cancelled)
+            metrics.increment(ANALYSIS_JOBS_METRIC, cancelled, status=CANCELLED)
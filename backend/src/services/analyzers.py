@@ -5,21 +5,27 @@
 
 """Analysis components for conversation and pronunciation assessment."""
 
-import asyncio
 import base64
+import copy
 import io
 import json
 import logging
+import time
 import wave
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import azure.cognitiveservices.speech as speechsdk  # pyright: ignore[reportMissingTypeStubs]
 import yaml
-from openai import AzureOpenAI
 
 from src.config import config
+from src.services.evaluation_cache import EvaluationCache, evaluation_cache, make_cache_key
+from src.services.executors import SPEECH_EXECUTOR, executors
+from src.services.metrics import metrics
+from src.services.openai_client import SharedOpenAIClient, shared_openai_client
 from src.services.scenario_utils import determine_scenario_directory
+from src.services.streaming_json import IncrementalObjectParser
+from src.services.transcript_compaction import TranscriptCompactor, transcript_compactor
 
 logger = logging.getLogger(__name__)
 
@@ -50,21 +56,47 @@ AUDIO_BITS_PER_SAMPLE = 16
 # Assessment constants
 MAX_STRENGTHS_COUNT = 3
 MAX_IMPROVEMENTS_COUNT = 3
+MAX_EVIDENCE_NOTES = 8
+
+# Part of every evaluation cache key; bump when the evaluation messages or response format change
+EVALUATION_SCHEMA_VERSION = 1
+
+# Scored sections of an evaluation and the scores summed into their totals
+SECTION_SCORES = {
+    "speaking_tone_style": ("professional_tone", "active_listening", "engagement_quality"),
+    "conversation_content": ("needs_assessment", "value_proposition", "objection_handling"),
+}
+
+# Time from request to the first streamed evaluation section
+EVALUATION_FIRST_SECTION_METRIC = "evaluation_first_section_seconds"
+EVALUATION_FIRST_SECTION_BUCKETS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# Receives each evaluation section (name, value) as soon as it is complete
+SectionCallback = Callable[[str, Any], None]
 
 
 class ConversationAnalyzer:
     """Analyzes sales conversations using Azure OpenAI."""
 
-    def __init__(self, scenario_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        scenario_dir: Optional[Path] = None,
+        cache: Optional[EvaluationCache] = None,
+        compactor: Optional[TranscriptCompactor] = None,
+    ):
         """
         Initialize the conversation analyzer.
 
         Args:
             scenario_dir: Directory containing evaluation scenario files
+            cache: Cache of evaluation results, defaults to the process-wide cache
+            compactor: Transcript compactor applied before evaluation, defaults to the configured one
         """
         self.scenario_dir = determine_scenario_directory(scenario_dir)
         self.evaluation_scenarios = self._load_evaluation_scenarios()
         self.openai_client = self._initialize_openai_client()
+        self.cache = cache if cache is not None else evaluation_cache
+        self.compactor = compactor if compactor is not None else transcript_compactor
 
     def _load_evaluation_scenarios(self) -> Dict[str, Any]:
         """
@@ -92,12 +124,12 @@ class ConversationAnalyzer:
         logger.info("Total evaluation scenarios loaded: %s", len(scenarios))
         return scenarios
 
-    def _initialize_openai_client(self) -> Optional[AzureOpenAI]:
+    def _initialize_openai_client(self) -> Optional[SharedOpenAIClient]:
         """
         Initialize the Azure OpenAI client.
 
         Returns:
-            Optional[AzureOpenAI]: Initialized client or None if configuration missing
+            Optional[SharedOpenAIClient]: The shared client or None if configuration missing
         """
         try:
             endpoint = config["azure_openai_endpoint"]
@@ -107,14 +139,8 @@ class ConversationAnalyzer:
                 logger.error("Azure OpenAI endpoint or API key not configured")
                 return None
 
-            client = AzureOpenAI(
-                api_version=config["api_version"],
-                azure_endpoint=endpoint,
-                api_key=api_key,
-            )
-
             logger.info("ConversationAnalyzer initialized with endpoint: %s", endpoint)
-            return client
+            return shared_openai_client
 
         except Exception as e:
             logger.error("Failed to initialize OpenAI client: %s", e)
@@ -145,6 +171,47 @@ class ConversationAnalyzer:
 
         return await self._call_evaluation_model(evaluation_scenario, transcript)
 
+    async def stream_conversation_analysis(
+        self, scenario_id: str, transcript: str, on_section: SectionCallback
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Analyze a conversation transcript, reporting each evaluation section as it is generated.
+
+        Scored sections are reported with their total already computed. A cached
+        evaluation reports all of its sections at once.
+
+        Args:
+            scenario_id: The scenario identifier
+            transcript: The conversation transcript to analyze
+            on_section: Called with the name and value of each completed section
+
+        Returns:
+            Optional[Dict[str, Any]]: Analysis results or None if analysis fails
+        """
+        logger.info("Starting streamed conversation analysis for scenario: %s", scenario_id)
+
+        evaluation_scenario = self.evaluation_scenarios.get(scenario_id)
+        if not evaluation_scenario:
+            logger.error("Evaluation scenario not found: %s", scenario_id)
+            return None
+
+        if not self.openai_client:
+            logger.error("OpenAI client not configured")
+            return None
+
+        reported: List[str] = []
+
+        def report(name: str, value: Any) -> None:
+            reported.append(name)
+            on_section(name, value)
+
+        result = await self._call_evaluation_model(evaluation_scenario, transcript, on_section=report)
+        # Sections of a cached or shared evaluation were not streamed to this caller
+        for name, value in (result or {}).items():
+            if name not in reported:
+                on_section(name, value)
+        return result
+
     def _build_evaluation_prompt(self, scenario: Dict[str, Any], transcript: str) -> str:
         """Build the evaluation prompt."""
         base_prompt = scenario["messages"][0]["content"]
@@ -173,13 +240,21 @@ class ConversationAnalyzer:
         {transcript}
         """
 
-    async def _call_evaluation_model(self, scenario: Dict[str, Any], transcript: str) -> Optional[Dict[str, Any]]:
+    async def _call_evaluation_model(
+        self, scenario: Dict[str, Any], transcript: str, on_section: Optional[SectionCallback] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Call OpenAI with structured outputs for evaluation.
 
+        The transcript is compacted to the token budget first. Results are cached by the
+        hash of the prompt, which contains the scenario and the compacted transcript, the
+        model and the schema version, so re-analyzing a conversation reuses the earlier
+        evaluation.
+
         Args:
             scenario: The evaluation scenario configuration
             transcript: The conversation transcript
+            on_section: If given, the response is streamed and each section reported as it completes
 
         Returns:
             Optional[Dict[str, Any]]: Evaluation results or None if call fails
@@ -188,18 +263,38 @@ class ConversationAnalyzer:
         if not self.openai_client:
             logger.error("OpenAI client not configured")
             return None
-        openai_client = self.openai_client
 
         try:
-            evaluation_prompt = self._build_evaluation_prompt(scenario, transcript)
-
-            completion = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: openai_client.chat.completions.create(
-                    model=config["model_deployment_name"],
-                    messages=self._build_evaluation_messages(evaluation_prompt),  # pyright: ignore[reportArgumentType]
-                    response_format=self._get_response_format(),  # pyright: ignore[reportArgumentType]
-                ),
+            evaluation_prompt = self._build_evaluation_prompt(scenario, self.compactor.compact(transcript).text)
+        except (KeyError, IndexError, TypeError) as e:
+            logger.error("Error in evaluation model: invalid evaluation scenario: %s", e)
+            return None
+
+        model = config["model_deployment_name"]
+        key = make_cache_key(EVALUATION_SCHEMA_VERSION, model, evaluation_prompt)
+        if on_section is not None:
+            return await self.cache.get_or_compute(
+                key, lambda: self._stream_evaluation(evaluation_prompt, model, on_section)
+            )
+        return await self.cache.get_or_compute(key, lambda: self._request_evaluation(evaluation_prompt, model))
+
+    async def _request_evaluation(self, evaluation_prompt: str, model: str) -> Optional[Dict[str, Any]]:
+        """
+        Request an evaluation from the model.
+
+        Args:
+            evaluation_prompt: The full evaluation prompt
+            model: The model deployment to use
+
+        Returns:
+            Optional[Dict[str, Any]]: Evaluation results or None if call fails
+        """
+        assert self.openai_client is not None
+        try:
+            completion = await self.openai_client.get().chat.completions.create(
+                model=model,
+                messages=self._build_evaluation_messages(evaluation_prompt),  # pyright: ignore[reportArgumentType]
+                response_format=self._get_response_format(),  # pyright: ignore[reportArgumentType]
             )
 
             if completion.choices[0].message.content:
@@ -213,6 +308,56 @@ class ConversationAnalyzer:
             logger.error("Error in evaluation model: %s", e)
             return None
 
+    async def _stream_evaluation(
+        self, evaluation_prompt: str, model: str, on_section: SectionCallback
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Stream an evaluation from the model, reporting each top-level section as it completes.
+
+        Args:
+            evaluation_prompt: The full evaluation prompt
+            model: The model deployment to use
+            on_section: Called with the name and value of each completed section
+
+        Returns:
+            Optional[Dict[str, Any]]: Evaluation results or None if call fails
+        """
+        assert self.openai_client is not None
+        started = time.monotonic()
+        parser = IncrementalObjectParser()
+        evaluation_json: Dict[str, Any] = {}
+        try:
+            stream = await self.openai_client.get().chat.completions.create(
+                model=model,
+                messages=self._build_evaluation_messages(evaluation_prompt),  # pyright: ignore[reportArgumentType]
+                response_format=self._get_response_format(),  # pyright: ignore[reportArgumentType]
+                stream=True,
+            )
+
+            async for chunk in stream:
+                # Azure sends content filter results in chunks without choices
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for name, value in parser.feed(chunk.choices[0].delta.content):
+                    if not evaluation_json:
+                        metrics.observe(
+                            EVALUATION_FIRST_SECTION_METRIC,
+                            time.monotonic() - started,
+                            buckets=EVALUATION_FIRST_SECTION_BUCKETS,
+                        )
+                    evaluation_json[name] = self._process_section(name, value)
+                    on_section(name, evaluation_json[name])
+
+            if not parser.done:
+                logger.error("Incomplete evaluation received from OpenAI")
+                return None
+
+            return self._process_evaluation_result(evaluation_json)
+
+        except Exception as e:
+            logger.error("Error in streamed evaluation model: %s", e)
+            return None
+
     def _build_evaluation_messages(self, evaluation_prompt: str) -> List[Dict[str, str]]:
         """Build the messages for the evaluation API call."""
         return [
@@ -292,25 +437,114 @@ class ConversationAnalyzer:
 
     def _process_evaluation_result(self, evaluation_json: Dict[str, Any]) -> Dict[str, Any]:
         """Process and validate evaluation results."""
-        evaluation_json["speaking_tone_style"]["total"] = sum(
-            [
-                evaluation_json["speaking_tone_style"]["professional_tone"],
-                evaluation_json["speaking_tone_style"]["active_listening"],
-                evaluation_json["speaking_tone_style"]["engagement_quality"],
-            ]
-        )
-
-        evaluation_json["conversation_content"]["total"] = sum(
-            [
-                evaluation_json["conversation_content"]["needs_assessment"],
-                evaluation_json["conversation_content"]["value_proposition"],
-                evaluation_json["conversation_content"]["objection_handling"],
-            ]
-        )
+        for name in SECTION_SCORES:
+            evaluation_json[name] = self._process_section(name, evaluation_json[name])
 
         logger.info("Evaluation processed with score: %s", evaluation_json.get("overall_score"))
         return evaluation_json
 
+    def _process_section(self, name: str, value: Any) -> Any:
+        """Recompute the total of a scored section from its individual scores."""
+        scores = SECTION_SCORES.get(name)
+        if scores is not None:
+            value["total"] = sum(value[score] for score in scores)
+        return value
+
+    async def evaluate_turns(
+        self, scenario_id: str, state: Optional[Dict[str, Any]], new_transcript: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update a running evaluation with the turns that followed it.
+
+        Only the new turns and the compact running evaluation are sent, so the cost of
+        an update does not grow with the length of the conversation.
+
+        Args:
+            scenario_id: The scenario identifier
+            state: The running evaluation so far, or None at the start of the conversation
+            new_transcript: The turns not yet evaluated, as ``role: content`` lines
+
+        Returns:
+            Optional[Dict[str, Any]]: The updated running evaluation or None if the update fails
+        """
+        evaluation_scenario = self.evaluation_scenarios.get(scenario_id)
+        if not evaluation_scenario:
+            logger.error("Evaluation scenario not found: %s", scenario_id)
+            return None
+
+        if not self.openai_client:
+            logger.error("OpenAI client not configured")
+            return None
+
+        try:
+            evaluation_prompt = self._build_turn_evaluation_prompt(
+                evaluation_scenario, state, self.compactor.compact(new_transcript).text
+            )
+            completion = await self.openai_client.get().chat.completions.create(
+                model=config["model_deployment_name"],
+                messages=self._build_evaluation_messages(evaluation_prompt),  # pyright: ignore[reportArgumentType]
+                response_format=self._get_rolling_response_format(),  # pyright: ignore[reportArgumentType]
+            )
+
+            if completion.choices[0].message.content:
+                updated = json.loads(completion.choices[0].message.content)
+                updated["evidence"] = updated["evidence"][-MAX_EVIDENCE_NOTES:]
+                return updated
+
+            logger.error("No content received from OpenAI")
+            return None
+
+        except Exception as e:
+            logger.error("Error in turn evaluation: %s", e)
+            return None
+
+    def merge_rolling_evaluation(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn a running evaluation into a final evaluation without another model call.
+
+        Args:
+            state: The running evaluation covering the whole conversation
+
+        Returns:
+            Dict[str, Any]: The evaluation in the same format as ``analyze_conversation``
+        """
+        evaluation_json = {key: copy.deepcopy(value) for key, value in state.items() if key != "evidence"}
+        evaluation_json = self._process_evaluation_result(evaluation_json)
+        evaluation_json["overall_score"] = sum(evaluation_json[name]["total"] for name in SECTION_SCORES)
+        return evaluation_json
+
+    def _build_turn_evaluation_prompt(
+        self, scenario: Dict[str, Any], state: Optional[Dict[str, Any]], new_transcript: str
+    ) -> str:
+        """Build the prompt that updates a running evaluation with new turns."""
+        if state is None:
+            running = "This is the start of the conversation; no turns have been evaluated yet."
+        else:
+            running = f"""The earlier turns were already evaluated. The running evaluation so far is:
+        {json.dumps(state)}"""
+
+        return self._build_evaluation_prompt(
+            scenario,
+            f"""{running}
+
+        Update the running evaluation so it covers the whole conversation so far, including the new
+        turns below. Adjust scores only where the new turns give reason to. Keep at most
+        {MAX_EVIDENCE_NOTES} evidence notes: short observations quoting or paraphrasing what the user
+        said that justify the scores, replacing the least informative ones first.
+
+        NEW TURNS:
+        {new_transcript}""",
+        )
+
+    def _get_rolling_response_format(self) -> Dict[str, Any]:
+        """Get the structured response format of a running evaluation: the evaluation plus evidence notes."""
+        response_format = self._get_response_format()
+        response_format["json_schema"]["name"] = "rolling_sales_evaluation"
+        schema = response_format["json_schema"]["schema"]
+        schema["properties"]["evidence"] = {"type": "array", "items": {"type": "string"}}
+        schema["required"].append("evidence")
+        return response_format
+
 
 class PronunciationAssessor:
     """Assesses pronunciation using Azure Speech Services."""
@@ -451,7 +685,7 @@ class PronunciationAssessor:
         )
         pronunciation_config.apply_to(speech_recognizer)
 
-        result = await asyncio.get_event_loop().run_in_executor(None, speech_recognizer.recognize_once)
+        result = await executors.run(SPEECH_EXECUTOR, speech_recognizer.recognize_once)
 
         pronunciation_result = speechsdk.PronunciationAssessmentResult(result)
         return self._build_assessment_result(pronunciation_result, result)
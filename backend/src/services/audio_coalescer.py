@@ -0,0 +1,123 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Coalescing of consecutive input audio append events before they go upstream."""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.services.backpressure import INPUT_AUDIO_APPEND_TYPE, ForwardingQueue, join_base64_audio
+from src.services.event_classifier import classify_event_type
+from src.services.metrics import metrics
+from src.services.transports import Frame
+
+logger = logging.getLogger(__name__)
+
+# Metric names
+COALESCE_FLUSHES_METRIC = "voice_proxy_audio_coalesce_flushes_total"
+COALESCE_FRAMES_METRIC = "voice_proxy_audio_coalesce_frames_total"
+COALESCE_DELAY_METRIC = "voice_proxy_audio_coalesce_delay_seconds_total"
+COALESCE_MAX_DELAY_METRIC = "voice_proxy_audio_coalesce_max_delay_seconds"
+
+
+def _parse_append(frame: Frame) -> Optional[Tuple[Dict[str, Any], str]]:
+    """Parse an ``input_audio_buffer.append`` frame into its event and audio payload."""
+    if classify_event_type(frame) != INPUT_AUDIO_APPEND_TYPE:
+        return None
+    try:
+        event = json.loads(frame)
+    except ValueError:
+        return None
+    audio = event.get("audio")
+    return (event, audio) if isinstance(audio, str) else None
+
+
+class AudioCoalescer:
+    """
+    Merges consecutive input audio appends from an inbound queue into fewer upstream frames.
+
+    A batch starts with the first queued append and is flushed when the window since that
+    append has elapsed, when the batch reaches the size limit, or as soon as any other event
+    arrives, so events such as ``input_audio_buffer.commit`` are never reordered or held
+    behind audio. The delay added to each batch is bounded by the window and exported as
+    metrics so its effect on turn detection can be observed.
+    """
+
+    def __init__(self, window_seconds: float, max_bytes: int, session_id: str):
+        """
+        Initialize the coalescer.
+
+        Args:
+            window_seconds: Longest time the first append of a batch is held back
+            max_bytes: Decoded audio size at which a batch is flushed immediately
+            session_id: Session the coalescer forwards for
+        """
+        self.window_seconds = window_seconds
+        self.max_bytes = max_bytes
+        self.session_id = session_id
+
+    async def drain(self, queue: ForwardingQueue, send: Callable[[Frame], Awaitable[None]]) -> None:
+        """
+        Send queued frames in order, coalescing runs of audio appends.
+
+        Args:
+            queue: The inbound queue to read from
+            send: Sends a frame upstream
+        """
+        while True:
+            frame = await queue.get()
+            parsed = _parse_append(frame)
+            if parsed is None:
+                await send(frame)
+                queue.ack()
+                continue
+
+            started = time.monotonic()
+            deadline = started + self.window_seconds
+            event, audio = parsed
+            parts = [audio]
+            size = len(audio) * 3 // 4
+            held_back: Optional[Frame] = None
+
+            while size < self.max_bytes:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    next_frame = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                next_parsed = _parse_append(next_frame)
+                if next_parsed is None:
+                    held_back = next_frame
+                    break
+                parts.append(next_parsed[1])
+                size += len(next_parsed[1]) * 3 // 4
+
+            if len(parts) > 1:
+                event["audio"] = join_base64_audio(parts)
+                frame = json.dumps(event)
+            await send(frame)
+            queue.ack(len(parts))
+            self._record_flush(len(parts), time.monotonic() - started)
+
+            if held_back is not None:
+                await send(held_back)
+                queue.ack()
+
+    def _record_flush(self, frame_count: int, delay: float) -> None:
+        """Record a flushed batch and the delay it added."""
+        metrics.increment(COALESCE_FLUSHES_METRIC)
+        metrics.increment(COALESCE_FRAMES_METRIC, frame_count)
+        metrics.increment(COALESCE_DELAY_METRIC, delay)
+        if delay > metrics.get(COALESCE_MAX_DELAY_METRIC, session=self.session_id):
+            metrics.set_gauge(COALESCE_MAX_DELAY_METRIC, delay, session=self.session_id)
+
+    def close(self) -> None:
+        """Remove the per-session delay gauge."""
+        metrics.remove_gauge(COALESCE_MAX_DELAY_METRIC, session=self.session_id)
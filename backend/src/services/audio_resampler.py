@@ -0,0 +1,187 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Streaming downsampling of response audio for low-bandwidth clients."""
+
+import base64
+import json
+import logging
+import re
+import time
+from math import gcd
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.services.metrics import metrics
+from src.services.transports import Frame
+
+logger = logging.getLogger(__name__)
+
+# Sample rate of Voice Live response audio and the rates clients may request
+SOURCE_SAMPLE_RATE = 24000
+SUPPORTED_OUTPUT_SAMPLE_RATES = frozenset({24000, 16000, 8000})
+
+# Filter taps per unit of the larger resampling factor
+TAPS_PER_FACTOR = 16
+
+# Fraction of the output Nyquist frequency kept by the anti-aliasing filter
+CUTOFF_RATIO = 0.9
+
+# Base64 payloads contain no escapes, so the delta can be replaced without a full decode
+_DELTA_FIELD_PATTERN = re.compile(r'"delta"\s*:\s*"([A-Za-z0-9+/=]*)"')
+
+# Metric names
+DOWNSAMPLE_BYTES_SAVED_METRIC = "voice_proxy_downsample_bytes_saved_total"
+DOWNSAMPLE_SECONDS_METRIC = "voice_proxy_downsample_seconds"
+
+# Per-chunk processing time buckets
+DOWNSAMPLE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+
+
+def _lowpass_filter(up: int, down: int) -> np.ndarray:
+    """Design a windowed-sinc anti-aliasing filter for the upsampled signal."""
+    factor = max(up, down)
+    taps = TAPS_PER_FACTOR * factor + 1
+    cutoff = CUTOFF_RATIO / factor
+    n = np.arange(taps) - (taps - 1) / 2
+    h = np.sinc(cutoff * n) * np.hamming(taps)
+    return (h / h.sum()).astype(np.float32)
+
+
+class PcmResampler:
+    """
+    Rational-ratio resampler for a continuous stream of mono PCM16 chunks.
+
+    The signal is conceptually upsampled by ``up``, low-pass filtered and decimated by
+    ``down``, but only the kept output samples are computed. Filter history and output
+    phase carry over between chunks, so chunk boundaries produce no clicks.
+    """
+
+    def __init__(self, from_rate: int, to_rate: int):
+        """
+        Initialize the resampler.
+
+        Args:
+            from_rate: Input sample rate in Hz
+            to_rate: Output sample rate in Hz
+        """
+        divisor = gcd(from_rate, to_rate)
+        self.up = to_rate // divisor
+        self.down = from_rate // divisor
+        self._filter = _lowpass_filter(self.up, self.down)[::-1].copy()
+        self._history = np.zeros(-(-(len(self._filter) - 1) // self.up), dtype=np.float32)
+        self._consumed = 0
+        self._next_output = 0
+
+    def process(self, pcm: bytes) -> bytes:
+        """
+        Resample the next chunk of the stream.
+
+        Args:
+            pcm: Little-endian PCM16 samples
+
+        Returns:
+            bytes: Resampled little-endian PCM16 samples
+        """
+        samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2).astype(np.float32)
+        if not len(samples):
+            return b""
+        buffer = np.concatenate((self._history, samples))
+        upsampled = np.zeros(len(buffer) * self.up, dtype=np.float32)
+        upsampled[:: self.up] = buffer * self.up
+
+        taps = len(self._filter)
+        start = (self._consumed - len(self._history)) * self.up
+        first = self._next_output - start - (taps - 1)
+        windows = sliding_window_view(upsampled, taps)[first :: self.down]
+        output = windows @ self._filter
+
+        self._next_output += len(output) * self.down
+        self._consumed += len(samples)
+        self._history = buffer[len(buffer) - len(self._history) :]
+        return np.clip(np.rint(output), -32768, 32767).astype("<i2").tobytes()
+
+
+class ResponseAudioDownsampler:
+    """Rewrites the ``response.audio.delta`` frames of one session at a lower sample rate."""
+
+    def __init__(self, session_id: str, output_sample_rate: int):
+        """
+        Initialize the downsampler.
+
+        Args:
+            session_id: The proxy session id
+            output_sample_rate: Sample rate requested by the client
+        """
+        self.session_id = session_id
+        self.output_sample_rate = output_sample_rate
+        self.resampler = PcmResampler(SOURCE_SAMPLE_RATE, output_sample_rate)
+        self.frames = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+
+    def convert(self, frame: Frame) -> Frame:
+        """
+        Downsample the audio of a ``response.audio.delta`` frame.
+
+        Args:
+            frame: A raw audio delta frame
+
+        Returns:
+            Frame: The frame with resampled audio, or the original frame if it has no audio
+        """
+        started = time.perf_counter()
+        converted = self._convert(frame)
+        if converted is None:
+            return frame
+
+        elapsed = time.perf_counter() - started
+        saved = len(frame) - len(converted)
+        self.frames += 1
+        self.bytes_in += len(frame)
+        self.bytes_out += len(converted)
+        self.seconds += elapsed
+        metrics.increment(DOWNSAMPLE_BYTES_SAVED_METRIC, saved, rate=self.output_sample_rate)
+        metrics.observe(DOWNSAMPLE_SECONDS_METRIC, elapsed, buckets=DOWNSAMPLE_BUCKETS)
+        return converted
+
+    def _convert(self, frame: Frame) -> Optional[str]:
+        """Resample the delta payload, or return None if the frame has none."""
+        if not isinstance(frame, str):
+            return None
+        match = _DELTA_FIELD_PATTERN.search(frame)
+        if match is not None:
+            audio = self._resample(match.group(1))
+            return f"{frame[: match.start(1)]}{audio}{frame[match.end(1):]}"
+        try:
+            event = json.loads(frame)
+        except ValueError:
+            return None
+        if not isinstance(event, dict) or not isinstance(event.get("delta"), str):
+            return None
+        event["delta"] = self._resample(event["delta"])
+        return json.dumps(event)
+
+    def _resample(self, audio: str) -> str:
+        """Resample a base64 PCM16 payload."""
+        return base64.b64encode(self.resampler.process(base64.b64decode(audio))).decode("ascii")
+
+    def log_summary(self) -> None:
+        """Log the bytes saved and processing time added for the session."""
+        if not self.frames:
+            return
+        logger.info(
+            "Session %s downsampled %d audio frame(s) to %d Hz: %d -> %d bytes (%.0f%% saved), %.3f ms per frame",
+            self.session_id,
+            self.frames,
+            self.output_sample_rate,
+            self.bytes_in,
+            self.bytes_out,
+            100 * (1 - self.bytes_out / self.bytes_in),
+            1000 * self.seconds / self.frames,
+        )
@@ -0,0 +1,166 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Process-wide event loop on a dedicated thread for coroutines started by synchronous request handlers."""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional, TypeVar
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Metric names
+BACKGROUND_LOOP_LAG_METRIC = "background_loop_lag_seconds"
+BACKGROUND_LOOP_TASKS_METRIC = "background_loop_tasks"
+BACKGROUND_LOOP_PENDING_METRIC = "background_loop_pending_submissions"
+BACKGROUND_LOOP_SUBMITTED_METRIC = "background_loop_submitted_total"
+
+# Scheduling delay buckets, from healthy sub-millisecond lag to a loop blocked for seconds
+BACKGROUND_LOOP_LAG_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+DEFAULT_LAG_INTERVAL_SECONDS = 1.0
+
+
+class BackgroundLoop:
+    """
+    A long-lived event loop running on its own thread.
+
+    Synchronous code, such as Flask handlers, submits coroutines to it instead of creating
+    and closing an event loop per request, so loop-bound state like the pooled connections
+    of async clients is reused across requests. A monitor task measures how late the loop
+    wakes up from a sleep, which exposes blocking calls made on the loop.
+    """
+
+    def __init__(self, name: str = "background-loop", lag_interval_seconds: float = DEFAULT_LAG_INTERVAL_SECONDS):
+        """
+        Initialize the loop; its thread is started on first use.
+
+        Args:
+            name: Name of the loop thread
+            lag_interval_seconds: Interval between loop lag measurements
+        """
+        self.name = name
+        self.lag_interval_seconds = lag_interval_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started if needed."""
+        with self._lock:
+            if self._loop is None:
+                self._start()
+            assert self._loop is not None
+            return self._loop
+
+    def _start(self) -> None:
+        """Start the loop thread and wait until the loop runs."""
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(loop, started), name=self.name, daemon=True)
+        self._thread.start()
+        started.wait()
+        self._loop = loop
+        logger.info("Started background event loop on thread %s", self.name)
+
+    def _run(self, loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        """Run the loop until it is stopped, then close it."""
+        asyncio.set_event_loop(loop)
+        loop.create_task(self._monitor())
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """
+        Schedule a coroutine on the loop.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            Future[T]: A thread-safe future resolving to the coroutine's result
+        """
+        self._update_pending(1)
+        metrics.increment(BACKGROUND_LOOP_SUBMITTED_METRIC)
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(lambda _: self._update_pending(-1))
+        return future
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the loop and wait for its result from the calling thread.
+
+        Args:
+            coro: The coroutine to run
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            T: The coroutine's result
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def _update_pending(self, delta: int) -> None:
+        """Adjust and publish the number of submitted coroutines still running."""
+        with self._lock:
+            self._pending += delta
+            metrics.set_gauge(BACKGROUND_LOOP_PENDING_METRIC, self._pending)
+
+    async def _monitor(self) -> None:
+        """Record loop lag and task count at a fixed interval."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval_seconds
+            await asyncio.sleep(self.lag_interval_seconds)
+            metrics.observe(
+                BACKGROUND_LOOP_LAG_METRIC, max(0.0, loop.time() - expected), buckets=BACKGROUND_LOOP_LAG_BUCKETS
+            )
+            # The monitor itself is not counted
+            metrics.set_gauge(BACKGROUND_LOOP_TASKS_METRIC, len(asyncio.all_tasks(loop)) - 1)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Cancel the loop's tasks, stop the loop and wait for its thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread to exit
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._cancel_tasks(), loop)
+        thread.join(timeout)
+        logger.info("Stopped background event loop")
+
+    async def _cancel_tasks(self) -> None:
+        """Cancel every other task, then stop the loop."""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        asyncio.get_running_loop().stop()
+
+
+background_loop = BackgroundLoop()
@@ -0,0 +1,241 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Bounded forwarding queues with a stale-audio congestion policy."""
+
+import asyncio
+import base64
+import json
+import logging
+from collections import deque
+from typing import Deque, FrozenSet, List, Optional
+
+from src.services.event_classifier import classify_event_type
+from src.services.metrics import metrics
+from src.services.transports import Frame
+
+logger = logging.getLogger(__name__)
+
+# Event types
+INPUT_AUDIO_APPEND_TYPE = "input_audio_buffer.append"
+RESPONSE_AUDIO_DELTA_TYPE = "response.audio.delta"
+
+# Metric names
+QUEUE_DEPTH_METRIC = "voice_proxy_queue_depth"
+FRAMES_DROPPED_METRIC = "voice_proxy_frames_dropped_total"
+FRAMES_MERGED_METRIC = "voice_proxy_frames_merged_total"
+
+# Queue directions
+INBOUND = "client_to_azure"
+OUTBOUND = "azure_to_client"
+
+
+class _QueuedFrame:
+    """A queued frame whose event type is only parsed when congestion needs it."""
+
+    __slots__ = ("frame", "_event_type", "_classified")
+
+    def __init__(self, frame: Frame):
+        self.frame = frame
+        self._event_type: Optional[str] = None
+        self._classified = False
+
+    @property
+    def event_type(self) -> Optional[str]:
+        """The event ``type`` of a JSON text frame, or None."""
+        if not self._classified:
+            self._event_type = classify_event_type(self.frame)
+            self._classified = True
+        return self._event_type
+
+
+def join_base64_audio(parts: List[str]) -> str:
+    """
+    Join base64 audio chunks into one base64 payload.
+
+    Chunks whose decoded length is a multiple of three carry no padding, so they can be
+    concatenated as text; otherwise the audio is decoded and re-encoded.
+
+    Args:
+        parts: Base64 encoded audio chunks in order
+
+    Returns:
+        str: Base64 encoding of the concatenated audio
+    """
+    if not any(part.endswith("=") for part in parts[:-1]):
+        return "".join(parts)
+    return base64.b64encode(b"".join(base64.b64decode(part) for part in parts)).decode("ascii")
+
+
+def audio_append_frame(audio: str) -> str:
+    """
+    Build an ``input_audio_buffer.append`` frame.
+
+    Base64 contains no characters that need JSON escaping, so the frame is formatted
+    directly rather than serialized.
+
+    Args:
+        audio: Base64 encoded PCM16 audio
+
+    Returns:
+        str: The append frame
+    """
+    return f'{{"type": "{INPUT_AUDIO_APPEND_TYPE}", "audio": "{audio}"}}'
+
+
+def merge_audio_appends(first: Frame, second: Frame) -> str:
+    """
+    Merge two ``input_audio_buffer.append`` frames into one.
+
+    Args:
+        first: The earlier append frame
+        second: The later append frame
+
+    Returns:
+        str: A single append frame carrying both audio payloads in order
+    """
+    first_event = json.loads(first)
+    second_event = json.loads(second)
+    first_event["audio"] = join_base64_audio([first_event["audio"], second_event["audio"]])
+    return json.dumps(first_event)
+
+
+class ForwardingQueue:
+    """
+    Bounded queue between a reader and a writer of one forwarding direction.
+
+    When the queue is full, frames of a mergeable type are merged into a queued frame of
+    the same type at the tail, and frames of a droppable type replace the oldest queued
+    frame of that type. Any other frame waits for space, which pushes back on the reader.
+
+    With ``redeliver``, frames taken by ``get`` are kept until the writer acknowledges
+    them, so that frames whose send was interrupted can be put back with ``restore``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        direction: str,
+        session_id: str,
+        merge_types: FrozenSet[str] = frozenset(),
+        drop_types: FrozenSet[str] = frozenset(),
+        redeliver: bool = False,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of queued frames
+            direction: Forwarding direction label used in metrics
+            session_id: Session label used in metrics
+            merge_types: Event types merged into the tail under congestion
+            drop_types: Event types whose oldest queued frame is dropped under congestion
+            redeliver: Keep taken frames until acknowledged so they can be restored
+        """
+        self.maxsize = maxsize
+        self.direction = direction
+        self.session_id = session_id
+        self.merge_types = merge_types
+        self.drop_types = drop_types
+        self.redeliver = redeliver
+        self._items: Deque[_QueuedFrame] = deque()
+        self._unacked: Deque[_QueuedFrame] = deque()
+        self._condition = asyncio.Condition()
+
+    def qsize(self) -> int:
+        """Number of frames currently queued."""
+        return len(self._items)
+
+    async def put(self, frame: Frame) -> None:
+        """Queue a frame, applying the congestion policy when the queue is full."""
+        async with self._condition:
+            queued = _QueuedFrame(frame)
+            if len(self._items) >= self.maxsize and self._relieve_congestion(queued):
+                return
+            await self._condition.wait_for(lambda: len(self._items) < self.maxsize)
+            self._items.append(queued)
+            self._publish_depth()
+            self._condition.notify_all()
+
+    async def get(self) -> Frame:
+        """Take the oldest frame, waiting until one is available."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: len(self._items) > 0)
+            queued = self._items.popleft()
+            if self.redeliver:
+                self._unacked.append(queued)
+            self._publish_depth()
+            self._condition.notify_all()
+            return queued.frame
+
+    def ack(self, count: int = 1) -> None:
+        """
+        Acknowledge that the oldest taken frames have been sent.
+
+        Args:
+            count: Number of frames, in the order they were taken
+        """
+        for _ in range(min(count, len(self._unacked))):
+            self._unacked.popleft()
+
+    def restore(self) -> int:
+        """
+        Put frames taken but not acknowledged back at the head of the queue, in order.
+
+        Only call this while no writer is reading the queue.
+
+        Returns:
+            int: The number of restored frames
+        """
+        restored = len(self._unacked)
+        self._items.extendleft(reversed(self._unacked))
+        self._unacked.clear()
+        if restored:
+            self._publish_depth()
+        return restored
+
+    def close(self) -> None:
+        """Remove the per-session depth gauge."""
+        metrics.remove_gauge(QUEUE_DEPTH_METRIC, session=self.session_id, direction=self.direction)
+
+    def _relieve_congestion(self, queued: _QueuedFrame) -> bool:
+        """
+        Absorb a frame into a full queue by merging or dropping stale audio.
+
+        Returns:
+            bool: True if the frame was absorbed and must not be queued
+        """
+        event_type = queued.event_type
+        if event_type in self.merge_types:
+            tail = self._items[-1]
+            if tail.event_type == event_type:
+                try:
+                    tail.frame = merge_audio_appends(tail.frame, queued.frame)
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.debug("Could not merge %s frames: %s", event_type, e)
+                    return False
+                metrics.increment(FRAMES_MERGED_METRIC, direction=self.direction, type=event_type)
+                return True
+
+        if event_type in self.drop_types:
+            stale = self._find_oldest(event_type)
+            if stale is not None:
+                self._items.remove(stale)
+                self._items.append(queued)
+                metrics.increment(FRAMES_DROPPED_METRIC, direction=self.direction, type=event_type)
+                return True
+
+        return False
+
+    def _find_oldest(self, event_type: str) -> Optional[_QueuedFrame]:
+        """Find the oldest queued frame of an event type."""
+        for item in self._items:
+            if item.event_type == event_type:
+                return item
+        return None
+
+    def _publish_depth(self) -> None:
+        """Publish the current queue depth for this session."""
+        metrics.set_gauge(QUEUE_DEPTH_METRIC, len(self._items), session=self.session_id, direction=self.direction)
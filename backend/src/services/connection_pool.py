@@ -0,0 +1,210 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Pool of pre-warmed upstream Azure Voice Live connections."""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import websockets.asyncio.client
+from websockets.protocol import State
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Metric names
+POOL_HITS_METRIC = "voice_proxy_upstream_pool_hits_total"
+POOL_MISSES_METRIC = "voice_proxy_upstream_pool_misses_total"
+POOL_EVICTIONS_METRIC = "voice_proxy_upstream_pool_evictions_total"
+POOL_CONNECT_FAILURES_METRIC = "voice_proxy_upstream_pool_connect_failures_total"
+POOL_IDLE_METRIC = "voice_proxy_upstream_pool_idle_connections"
+
+DEFAULT_REFILL_INTERVAL_SECONDS = 1.0
+
+
+class UpstreamKey(NamedTuple):
+    """Identifies interchangeable upstream connections."""
+
+    target: str
+    voice: str
+    avatar: str
+
+
+class _IdleConnection(NamedTuple):
+    """An open upstream connection waiting in the pool."""
+
+    ws: websockets.asyncio.client.ClientConnection
+    idle_since: float
+
+
+ConnectionFactory = Callable[[UpstreamKey], Awaitable[Optional[websockets.asyncio.client.ClientConnection]]]
+
+
+class UpstreamConnectionPool:
+    """
+    Keeps already-open upstream connections ready for new voice sessions.
+
+    Connections are bound to the event loop that opened them, so the pool is started
+    from, and only hands out connections to, a single long-lived loop.
+    """
+
+    def __init__(
+        self,
+        connect: ConnectionFactory,
+        size_per_key: int,
+        max_idle_seconds: float,
+        refill_interval: float = DEFAULT_REFILL_INTERVAL_SECONDS,
+    ):
+        """
+        Initialize the connection pool.
+
+        Args:
+            connect: Opens and pre-configures a new upstream connection for a key
+            size_per_key: Number of idle connections to keep per key
+            max_idle_seconds: Idle connections older than this are closed and replaced,
+                and keys not requested for this long stop being refilled
+            refill_interval: Seconds between background maintenance passes
+        """
+        self.connect = connect
+        self.size_per_key = size_per_key
+        self.max_idle_seconds = max_idle_seconds
+        self.refill_interval = refill_interval
+        self._idle: Dict[UpstreamKey, List[_IdleConnection]] = {}
+        self._wanted: Dict[UpstreamKey, Optional[float]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the background refill task is running."""
+        return self._task is not None and not self._task.done()
+
+    async def start(self, keys: Iterable[UpstreamKey] = ()) -> None:
+        """
+        Start background refilling on the running event loop.
+
+        Args:
+            keys: Keys to keep warm permanently
+        """
+        if self.running:
+            return
+        for key in keys:
+            self._wanted[key] = None
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._maintain())
+        logger.info("Upstream connection pool started with %s connection(s) per key", self.size_per_key)
+
+    async def stop(self) -> None:
+        """Stop refilling and close all idle connections."""
+        if self._task:
+            # wait_for may swallow a cancellation that races the wakeup event, so also use a flag
+            self._stopping = True
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for key, connections in self._idle.items():
+            for connection in connections:
+                await self._close(connection.ws)
+            metrics.set_gauge(POOL_IDLE_METRIC, 0, target=key.target)
+        self._idle.clear()
+
+    async def acquire(self, key: UpstreamKey) -> Optional[websockets.asyncio.client.ClientConnection]:
+        """
+        Take a warm connection for a key.
+
+        Args:
+            key: The upstream key the session needs
+
+        Returns:
+            Optional[ClientConnection]: An open connection, or None on a miss
+        """
+        if not self.running or asyncio.get_running_loop() is not self._loop:
+            return None
+
+        if key not in self._wanted or self._wanted[key] is not None:
+            self._wanted[key] = time.monotonic()
+        self._wakeup.set()
+
+        connections = self._idle.get(key, [])
+        while connections:
+            connection = connections.pop()
+            if connection.ws.state is State.OPEN:
+                metrics.increment(POOL_HITS_METRIC, target=key.target)
+                self._update_idle_gauge(key)
+                return connection.ws
+            await self._close(connection.ws)
+
+        metrics.increment(POOL_MISSES_METRIC, target=key.target)
+        self._update_idle_gauge(key)
+        return None
+
+    def idle_count(self, key: UpstreamKey) -> int:
+        """Number of idle connections currently held for a key."""
+        return len(self._idle.get(key, []))
+
+    async def _maintain(self) -> None:
+        """Evict stale connections and top up every wanted key."""
+        while not self._stopping:
+            try:
+                await self._evict_stale()
+                await self._refill()
+            except Exception as e:
+                logger.error("Upstream connection pool maintenance failed: %s", e)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.refill_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _evict_stale(self) -> None:
+        """Close idle connections that are closed or past the idle limit, and forget unused keys."""
+        now = time.monotonic()
+        for key, last_requested in list(self._wanted.items()):
+            if last_requested is not None and now - last_requested > self.max_idle_seconds:
+                del self._wanted[key]
+
+        for key, connections in self._idle.items():
+            keep: List[_IdleConnection] = []
+            for connection in connections:
+                if connection.ws.state is State.OPEN and now - connection.idle_since <= self.max_idle_seconds:
+                    keep.append(connection)
+                else:
+                    metrics.increment(POOL_EVICTIONS_METRIC, target=key.target)
+                    await self._close(connection.ws)
+            self._idle[key] = keep
+            self._update_idle_gauge(key)
+
+    async def _refill(self) -> None:
+        """Open connections until every wanted key has its target size."""
+        for key in list(self._wanted):
+            missing = self.size_per_key - self.idle_count(key)
+            if missing <= 0:
+                continue
+            results = await asyncio.gather(*(self.connect(key) for _ in range(missing)), return_exceptions=True)
+            for ws in results:
+                if isinstance(ws, BaseException) or ws is None:
+                    metrics.increment(POOL_CONNECT_FAILURES_METRIC, target=key.target)
+                    continue
+                self._idle.setdefault(key, []).append(_IdleConnection(ws, time.monotonic()))
+            self._update_idle_gauge(key)
+
+    def _update_idle_gauge(self, key: UpstreamKey) -> None:
+        """Publish the idle connection count for a key."""
+        metrics.set_gauge(POOL_IDLE_METRIC, self.idle_count(key), target=key.target)
+
+    async def _close(self, ws: websockets.asyncio.client.ClientConnection) -> None:
+        """Close a connection, ignoring errors."""
+        try:
+            await ws.close()
+        except Exception:
+            logger.debug("Error closing pooled upstream connection")
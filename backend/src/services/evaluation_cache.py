@@ -0,0 +1,248 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Content-addressed cache of conversation evaluations."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.config import config
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Metric names
+EVALUATION_CACHE_REQUESTS_METRIC = "evaluation_cache_requests_total"
+EVALUATION_CACHE_ENTRIES_METRIC = "evaluation_cache_entries"
+EVALUATION_CACHE_EVICTIONS_METRIC = "evaluation_cache_evictions_total"
+
+# Lookup results
+MEMORY_HIT = "memory_hit"
+DISK_HIT = "disk_hit"
+SHARED = "shared"
+MISS = "miss"
+
+DISK_FILE_SUFFIX = ".json"
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Hash the inputs that determine an evaluation.
+
+    Args:
+        parts: JSON-serializable values, such as the schema version, model and prompt
+
+    Returns:
+        str: Hex SHA-256 digest of the parts
+    """
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """
+    Caches evaluation results by the hash of their inputs.
+
+    Entries live in a bounded in-memory LRU and, if a directory is given, in JSON files
+    that survive restarts and are shared by workers on the same host. Both tiers expire
+    entries after ``ttl_seconds``. Concurrent lookups of a key that is being computed
+    wait for that computation instead of starting their own.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, directory: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Entries kept in memory, 0 to disable the memory tier
+            ttl_seconds: How long an entry is served, 0 to disable caching
+            directory: Directory of the on-disk tier, or None to keep entries in memory only
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.directory = Path(directory) if directory else None
+        # Values are stored serialized so every hit returns a fresh copy
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[Optional[Dict[str, Any]]]"] = {}
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any tier can hold entries."""
+        return self.ttl_seconds > 0 and (self.max_entries > 0 or self.directory is not None)
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached evaluation, computing and storing it on a miss.
+
+        Failed evaluations (None) are shared with concurrent callers but not stored.
+
+        Args:
+            key: The cache key from ``make_cache_key``
+            compute: Coroutine function producing the evaluation
+
+        Returns:
+            Optional[Dict[str, Any]]: The evaluation, or None if it could not be computed
+        """
+        if not self.enabled:
+            return await compute()
+
+        cached, result = self.get(key)
+        if cached is not None:
+            metrics.increment(EVALUATION_CACHE_REQUESTS_METRIC, result=result)
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            metrics.increment(EVALUATION_CACHE_REQUESTS_METRIC, result=SHARED)
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The caller computing the entry was cancelled, so compute it here instead
+                return await self.get_or_compute(key, compute)
+            return _copy(value)
+
+        metrics.increment(EVALUATION_CACHE_REQUESTS_METRIC, result=MISS)
+        future: "asyncio.Future[Optional[Dict[str, Any]]]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+            if value is not None:
+                self.set(key, value)
+            future.set_result(_copy(value))
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters receive the exception; without them it would be reported as never retrieved
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Look up an entry in memory, then on disk.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], str]: A copy of the entry or None, and the lookup result
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, payload = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return json.loads(payload), MEMORY_HIT
+                del self._entries[key]
+                metrics.increment(EVALUATION_CACHE_EVICTIONS_METRIC, reason="expired")
+                metrics.set_gauge(EVALUATION_CACHE_ENTRIES_METRIC, len(self._entries))
+
+        disk_entry = self._read_disk(key, now)
+        if disk_entry is None:
+            return None, MISS
+        stored_at, payload = disk_entry
+        self._remember(key, stored_at, payload)
+        return json.loads(payload), DISK_HIT
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store an entry in every enabled tier.
+
+        Args:
+            key: The cache key
+            value: The JSON-serializable evaluation
+        """
+        stored_at = time.time()
+        payload = json.dumps(value)
+        self._remember(key, stored_at, payload)
+        self._write_disk(key, stored_at, payload)
+
+    def clear(self) -> None:
+        """Drop every memory entry; files on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+            metrics.set_gauge(EVALUATION_CACHE_ENTRIES_METRIC, 0)
+
+    def _remember(self, key: str, stored_at: float, payload: str) -> None:
+        """Add an entry to the memory tier, evicting the least recently used ones."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (stored_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.increment(EVALUATION_CACHE_EVICTIONS_METRIC, reason="lru")
+            metrics.set_gauge(EVALUATION_CACHE_ENTRIES_METRIC, len(self._entries))
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}{DISK_FILE_SUFFIX}"
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        """Read an unexpired entry from the disk tier, deleting it if expired."""
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Unreadable evaluation cache file %s: %s", path, e)
+            return None
+
+        stored_at = stored.get("stored_at", 0.0)
+        if now - stored_at > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            metrics.increment(EVALUATION_CACHE_EVICTIONS_METRIC, reason="expired")
+            return None
+        return stored_at, json.dumps(stored.get("value"))
+
+    def _write_disk(self, key: str, stored_at: float, payload: str) -> None:
+        """Write an entry to the disk tier atomically, so readers never see a partial file."""
+        if self.directory is None:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(f'{{"stored_at": {stored_at}, "value": {payload}}}')
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning("Failed to write evaluation cache entry %s: %s", key, e)
+
+
+def _copy(value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return None if value is None else json.loads(json.dumps(value))
+
+
+evaluation_cache = EvaluationCache(
+    max_entries=config["evaluation_cache_max_entries"],
+    ttl_seconds=config["evaluation_cache_ttl_seconds"],
+    directory=config["evaluation_cache_dir"] or None,
+)
@@ -0,0 +1,104 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Cheap event type classification of forwarded Voice Live frames."""
+
+import json
+import re
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set
+
+from src.services.transports import Frame
+
+# Characters scanned for the top-level "type" field before falling back to a full parse.
+# Voice Live and the browser put "type" (and at most a short event id) before any payload.
+TYPE_SCAN_LIMIT = 256
+
+_TYPE_FIELD_PATTERN = re.compile(r'"type"\s*:\s*"([^"\\]*)"')
+
+
+class ClassifiedEvent(NamedTuple):
+    """The event type of a frame and, for inspected types, its decoded event."""
+
+    type: Optional[str]
+    event: Optional[Dict[str, Any]]
+
+
+def _parse_event(frame: Frame) -> Optional[Dict[str, Any]]:
+    """Fully decode a JSON text frame into an event object."""
+    try:
+        event = json.loads(frame)
+    except (TypeError, ValueError):
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def classify_event_type(frame: Frame) -> Optional[str]:
+    """
+    Get the event type of a frame without decoding its payload.
+
+    The top-level ``type`` field is read from the start of the frame. Only frames where it
+    cannot be found there unambiguously, because it comes after a nested object or a long
+    field, are fully decoded.
+
+    Args:
+        frame: A raw text or binary frame
+
+    Returns:
+        Optional[str]: The event type, or None for binary or non-event frames
+    """
+    if not isinstance(frame, str):
+        return None
+
+    prefix = frame[:TYPE_SCAN_LIMIT]
+    match = _TYPE_FIELD_PATTERN.search(prefix)
+    if match is not None:
+        opening = prefix.find("{")
+        preceding = prefix[opening + 1 : match.start()]
+        if opening != -1 and not prefix[:opening].strip() and "{" not in preceding and "[" not in preceding:
+            return match.group(1)
+
+    event = _parse_event(frame)
+    if event is None:
+        return None
+    event_type = event.get("type")
+    return event_type if isinstance(event_type, str) else None
+
+
+class EventClassifier:
+    """
+    Classifies forwarded frames, decoding only the event types registered for inspection.
+
+    Proxy features that need more than the type, such as the contents of a transcript,
+    register that type; every other frame, including multi-kilobyte audio deltas, is only
+    classified by its prefix.
+    """
+
+    def __init__(self, inspect_types: Iterable[str] = ()):
+        """
+        Initialize the classifier.
+
+        Args:
+            inspect_types: Event types whose frames are fully decoded
+        """
+        self.inspect_types: Set[str] = set(inspect_types)
+
+    def register(self, event_type: str) -> None:
+        """Register an event type whose frames need a full decode."""
+        self.inspect_types.add(event_type)
+
+    def classify(self, frame: Frame) -> ClassifiedEvent:
+        """
+        Classify a frame.
+
+        Args:
+            frame: A raw text or binary frame
+
+        Returns:
+            ClassifiedEvent: The event type, with the decoded event for inspected types
+        """
+        event_type = classify_event_type(frame)
+        if event_type is None or event_type not in self.inspect_types:
+            return ClassifiedEvent(event_type, None)
+        return ClassifiedEvent(event_type, _parse_event(frame))
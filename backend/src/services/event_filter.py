@@ -0,0 +1,100 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Allowlist/denylist filtering of upstream events before they reach the client."""
+
+import fnmatch
+from typing import Dict, Iterable, List, Optional
+
+from src.services.metrics import metrics
+from src.services.transports import Frame
+
+# Metric names
+EVENTS_FILTERED_METRIC = "voice_proxy_events_filtered_total"
+BYTES_SAVED_METRIC = "voice_proxy_event_bytes_saved_total"
+
+
+def parse_event_patterns(value: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated list of event type patterns.
+
+    Args:
+        value: Patterns such as ``"response.text.*,rate_limits.updated"``
+
+    Returns:
+        List[str]: The non-empty patterns
+    """
+    if not value:
+        return []
+    return [pattern.strip() for pattern in value.split(",") if pattern.strip()]
+
+
+class EventFilter:
+    """
+    Decides which upstream events are forwarded to the client.
+
+    Patterns use shell-style wildcards (``response.text.*``). When an allowlist is set,
+    only matching event types are forwarded; matching the denylist always drops an event.
+    Frames without an event type, such as binary frames, are always forwarded. Decisions
+    are cached per event type since the set of types is small.
+    """
+
+    def __init__(self, allow: Iterable[str] = (), deny: Iterable[str] = ()):
+        """
+        Initialize the filter.
+
+        Args:
+            allow: Event type patterns to forward (empty forwards everything)
+            deny: Event type patterns never forwarded
+        """
+        self.allow = list(allow)
+        self.deny = list(deny)
+        self._decisions: Dict[str, bool] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any pattern is configured."""
+        return bool(self.allow or self.deny)
+
+    def allows(self, event_type: Optional[str]) -> bool:
+        """
+        Check whether an event type is forwarded.
+
+        Args:
+            event_type: The event type, or None for untyped frames
+
+        Returns:
+            bool: True if the event is forwarded
+        """
+        if event_type is None:
+            return True
+        decision = self._decisions.get(event_type)
+        if decision is None:
+            decision = self._matches(event_type, self.allow) if self.allow else True
+            decision = decision and not self._matches(event_type, self.deny)
+            self._decisions[event_type] = decision
+        return decision
+
+    def should_forward(self, frame: Frame, event_type: Optional[str]) -> bool:
+        """
+        Check a frame against the filter and count it when dropped.
+
+        Args:
+            frame: A raw upstream frame
+            event_type: The frame's event type, as returned by the event classifier
+
+        Returns:
+            bool: True if the frame is forwarded
+        """
+        if not self.enabled or self.allows(event_type):
+            return True
+        metrics.increment(EVENTS_FILTERED_METRIC, type=event_type)
+        metrics.increment(BYTES_SAVED_METRIC, len(str(frame).encode("utf-8")), type=event_type)
+        return False
+
+    @staticmethod
+    def _matches(event_type: str, patterns: List[str]) -> bool:
+        """Check whether an event type matches any pattern."""
+        return any(fnmatch.fnmatchcase(event_type, pattern) for pattern in patterns)
@@ -0,0 +1,156 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Named, separately sized thread pools for blocking work with queue and wait metrics."""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Mapping, TypeVar
+
+from src.config import config
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Executor names
+WEBSOCKET_RECEIVE_EXECUTOR = "websocket_receive"
+WEBSOCKET_SEND_EXECUTOR = "websocket_send"
+SPEECH_EXECUTOR = "speech"
+STATE_STORE_EXECUTOR = "state_store"
+
+# Metric names
+EXECUTOR_QUEUE_DEPTH_METRIC = "executor_queue_depth"
+EXECUTOR_ACTIVE_METRIC = "executor_active_threads"
+EXECUTOR_WAIT_METRIC = "executor_wait_seconds"
+EXECUTOR_RUN_METRIC = "executor_run_seconds"
+
+# Buckets covering both sub-millisecond I/O hand-offs and long model calls
+EXECUTOR_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+
+
+class InstrumentedExecutor:
+    """A named thread pool that reports its queue depth, wait time and run time."""
+
+    def __init__(self, name: str, max_workers: int):
+        """
+        Initialize the executor.
+
+        Args:
+            name: Executor name used in thread names and metric labels
+            max_workers: Maximum number of worker threads
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking function in this executor from the running event loop.
+
+        Args:
+            func: The blocking function
+            *args: Positional arguments for the function
+
+        Returns:
+            T: The function's return value
+        """
+        submitted = time.monotonic()
+        self._update(queued=1)
+        future = self._pool.submit(self._call, func, args, submitted)
+        future.add_done_callback(self._release_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _release_if_cancelled(self, future: Future[Any]) -> None:
+        """Release the queued slot of a call cancelled before it started."""
+        if future.cancelled():
+            self._update(queued=-1)
+
+    def _call(self, func: Callable[..., T], args: Any, submitted: float) -> T:
+        """Run the function on a worker thread, recording wait and run time."""
+        started = time.monotonic()
+        self._update(queued=-1, active=1)
+        metrics.observe(EXECUTOR_WAIT_METRIC, started - submitted, buckets=EXECUTOR_BUCKETS, executor=self.name)
+        try:
+            return func(*args)
+        finally:
+            metrics.observe(
+                EXECUTOR_RUN_METRIC, time.monotonic() - started, buckets=EXECUTOR_BUCKETS, executor=self.name
+            )
+            self._update(active=-1)
+
+    def _update(self, queued: int = 0, active: int = 0) -> None:
+        """Adjust and publish the queued and active counts."""
+        with self._lock:
+            self._queued += queued
+            self._active += active
+            metrics.set_gauge(EXECUTOR_QUEUE_DEPTH_METRIC, self._queued, executor=self.name)
+            metrics.set_gauge(EXECUTOR_ACTIVE_METRIC, self._active, executor=self.name)
+
+    def shutdown(self) -> None:
+        """Stop accepting work and let running calls finish in the background."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ExecutorRegistry:
+    """Creates executors on first use from configured sizes."""
+
+    def __init__(self, sizes: Mapping[str, int]):
+        """
+        Initialize the registry.
+
+        Args:
+            sizes: Maximum worker threads per executor name
+        """
+        self.sizes = dict(sizes)
+        self._executors: Dict[str, InstrumentedExecutor] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> InstrumentedExecutor:
+        """
+        Get an executor by name, creating it on first use.
+
+        Args:
+            name: The executor name
+
+        Returns:
+            InstrumentedExecutor: The executor
+        """
+        with self._lock:
+            executor = self._executors.get(name)
+            if executor is None:
+                if name not in self.sizes:
+                    raise KeyError(f"Unknown executor: {name}")
+                executor = self._executors[name] = InstrumentedExecutor(name, self.sizes[name])
+                logger.info("Created %s executor with %s worker(s)", name, self.sizes[name])
+            return executor
+
+    async def run(self, name: str, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking function in the named executor."""
+        return await self.get(name).run(func, *args)
+
+    def shutdown(self) -> None:
+        """Shut down all created executors."""
+        with self._lock:
+            for executor in self._executors.values():
+                executor.shutdown()
+            self._executors.clear()
+
+
+executors = ExecutorRegistry(
+    {
+        WEBSOCKET_RECEIVE_EXECUTOR: config["executor_websocket_io_workers"],
+        WEBSOCKET_SEND_EXECUTOR: config["executor_websocket_send_workers"],
+        SPEECH_EXECUTOR: config["executor_speech_workers"],
+        STATE_STORE_EXECUTOR: config["executor_state_store_workers"],
+    }
+)
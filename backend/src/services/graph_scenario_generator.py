@@ -8,9 +8,8 @@
 import logging
 from typing import Dict, Any, Optional, List
 
-from openai import AzureOpenAI
-
 from src.config import config
+from src.services.openai_client import SharedOpenAIClient, shared_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +21,7 @@ class GraphScenarioGenerator:
         """Initialize the Graph scenario generator."""
         self.openai_client = self._initialize_openai_client()
 
-    def _initialize_openai_client(self) -> Optional[AzureOpenAI]:
+    def _initialize_openai_client(self) -> Optional[SharedOpenAIClient]:
         """Initialize the Azure OpenAI client for scenario generation."""
         try:
             endpoint = config["azure_openai_endpoint"]
@@ -32,16 +31,12 @@ class GraphScenarioGenerator:
                 logger.warning("Azure OpenAI not configured for scenario generation")
                 return None
 
-            return AzureOpenAI(
-                api_version=config["api_version"],
-                azure_endpoint=endpoint,
-                api_key=api_key,
-            )
+            return shared_openai_client
         except Exception as e:
             logger.error("Failed to initialize OpenAI client for scenarios: %s", e)
             return None
 
-    def generate_scenario_from_graph(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_scenario_from_graph(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate a scenario based on Microsoft Graph API data.
 
@@ -58,7 +53,7 @@ class GraphScenarioGenerator:
                 attendees = [attendee["emailAddress"]["name"] for attendee in event.get("attendees", [])[:3]]
                 meetings.append({"subject": subject, "attendees": attendees})
 
-        scenario_content = self._create_graph_scenario_content(meetings)
+        scenario_content = await self._create_graph_scenario_content(meetings)
 
         first_sentence = scenario_content.split(".")[0] + "."
         if len(first_sentence) > 100:
@@ -78,7 +73,7 @@ class GraphScenarioGenerator:
         """Format the list of meetings for display."""
         return "\n".join(f"- {meeting['subject']} with {', '.join(meeting['attendees'][:3])}" for meeting in meetings)
 
-    def _create_graph_scenario_content(self, meetings: List[Dict[str, Any]]) -> str:
+    async def _create_graph_scenario_content(self, meetings: List[Dict[str, Any]]) -> str:
         """Create scenario content based on meetings using OpenAI."""
         if not meetings:
             return self._get_fallback_scenario_content()
@@ -89,7 +84,7 @@ class GraphScenarioGenerator:
 
         prompt = self._build_scenario_generation_prompt(meetings)
 
-        response = self.openai_client.chat.completions.create(
+        response = await self.openai_client.get().chat.completions.create(
             model=config["model_deployment_name"],
             messages=[
                 {
@@ -0,0 +1,158 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Per-session timing of voice proxy events and turn latency histograms."""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.services.backpressure import RESPONSE_AUDIO_DELTA_TYPE
+from src.services.event_classifier import classify_event_type
+from src.services.metrics import metrics
+from src.services.transports import Frame
+
+logger = logging.getLogger(__name__)
+
+# Event types
+SPEECH_STOPPED_TYPE = "input_audio_buffer.speech_stopped"
+RESPONSE_DONE_TYPE = "response.done"
+
+# Metric names
+UPSTREAM_CONNECT_METRIC = "voice_proxy_upstream_connect_seconds"
+TIME_TO_FIRST_AUDIO_METRIC = "voice_proxy_time_to_first_audio_seconds"
+TURN_DURATION_METRIC = "voice_proxy_turn_duration_seconds"
+FIRST_AUDIO_PROXY_DELAY_METRIC = "voice_proxy_first_audio_proxy_delay_seconds"
+
+# Finer buckets for the time a frame spends inside the proxy
+PROXY_DELAY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class SessionTimeline:
+    """
+    Timestamps the key events of one voice session.
+
+    A turn starts when Azure reports ``input_audio_buffer.speech_stopped``. Its time to
+    first audio ends at the first ``response.audio.delta`` received from Azure, and its
+    duration at ``response.done``. The time that first delta then spends in the proxy
+    before reaching the client is measured separately, so slow turns can be attributed
+    to the proxy, the network to Azure, or the model.
+    """
+
+    def __init__(self, session_id: str, clock: Callable[[], float] = time.monotonic):
+        """
+        Start the timeline at client connect.
+
+        Args:
+            session_id: The proxy session id
+            clock: Monotonic clock returning seconds
+        """
+        self.session_id = session_id
+        self.clock = clock
+        self.connected_at = clock()
+        self.agent_id: Optional[str] = None
+        self.upstream_connect_seconds: Optional[float] = None
+        self._upstream_connecting_at: Optional[float] = None
+        self.responses = 0
+        self.time_to_first_audio: List[float] = []
+        self.turn_durations: List[float] = []
+        self._speech_stopped_at: Optional[float] = None
+        self._first_audio_at: Optional[float] = None
+        self._awaiting_delivery = False
+
+    def mark_upstream_connecting(self) -> None:
+        """Record that the upstream Azure connection is being opened."""
+        self._upstream_connecting_at = self.clock()
+
+    def mark_upstream_connected(self) -> None:
+        """Record that the upstream Azure connection is ready."""
+        started = self._upstream_connecting_at if self._upstream_connecting_at is not None else self.connected_at
+        self.upstream_connect_seconds = self.clock() - started
+        metrics.observe(UPSTREAM_CONNECT_METRIC, self.upstream_connect_seconds)
+
+    def observe_upstream_event(self, event_type: Optional[str]) -> None:
+        """
+        Record an event received from Azure.
+
+        Args:
+            event_type: The event type of the received frame
+        """
+        if event_type == RESPONSE_AUDIO_DELTA_TYPE:
+            if self._speech_stopped_at is not None and self._first_audio_at is None:
+                self._first_audio_at = self.clock()
+                self._awaiting_delivery = True
+                latency = self._first_audio_at - self._speech_stopped_at
+                self.time_to_first_audio.append(latency)
+                metrics.observe(TIME_TO_FIRST_AUDIO_METRIC, latency)
+        elif event_type == SPEECH_STOPPED_TYPE:
+            self._speech_stopped_at = self.clock()
+            self._first_audio_at = None
+        elif event_type == RESPONSE_DONE_TYPE:
+            self.responses += 1
+            if self._speech_stopped_at is not None:
+                duration = self.clock() - self._speech_stopped_at
+                self.turn_durations.append(duration)
+                metrics.observe(TURN_DURATION_METRIC, duration)
+            self._speech_stopped_at = None
+            self._first_audio_at = None
+
+    def track_client_send(self, send: Callable[[Frame], Awaitable[None]]) -> Callable[[Frame], Awaitable[None]]:
+        """
+        Wrap the client send function to time delivery of each turn's first audio.
+
+        Frames are only classified while a first audio delta is awaiting delivery.
+
+        Args:
+            send: Sends a frame to the client
+
+        Returns:
+            Callable: A send function with the same signature
+        """
+
+        async def timed_send(frame: Frame) -> None:
+            await send(frame)
+            if self._awaiting_delivery and classify_event_type(frame) == RESPONSE_AUDIO_DELTA_TYPE:
+                self._awaiting_delivery = False
+                if self._first_audio_at is not None:
+                    metrics.observe(
+                        FIRST_AUDIO_PROXY_DELAY_METRIC, self.clock() - self._first_audio_at, buckets=PROXY_DELAY_BUCKETS
+                    )
+
+        return timed_send
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the session.
+
+        Returns:
+            Dict[str, Any]: Session duration, turn count and latency figures in seconds
+        """
+        return {
+            "session_id": self.session_id,
+            "agent_id": self.agent_id,
+            "duration_s": round(self.clock() - self.connected_at, 3),
+            "upstream_connect_s": _round(self.upstream_connect_seconds),
+            "responses": self.responses,
+            "turns": len(self.turn_durations),
+            "ttfa_mean_s": _round(_mean(self.time_to_first_audio)),
+            "ttfa_max_s": _round(max(self.time_to_first_audio, default=None)),
+            "turn_mean_s": _round(_mean(self.turn_durations)),
+            "turn_max_s": _round(max(self.turn_durations, default=None)),
+        }
+
+    def log_summary(self) -> None:
+        """Log the session summary."""
+        summary = self.summary()
+        logger.info("Voice session summary: %s", " ".join(f"{key}={value}" for key, value in summary.items()))
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    """Mean of a list, or None when empty."""
+    return sum(values) / len(values) if values else None
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    """Round a duration for logging."""
+    return round(value, 3) if value is not None else None
@@ -9,7 +9,7 @@ import logging
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, MutableMapping, Optional
 
 import yaml
 from azure.ai.projects import AIProjectClient
@@ -18,6 +18,7 @@ from azure.identity import DefaultAzureCredential
 from src.config import config
 from src.services.graph_scenario_generator import GraphScenarioGenerator
 from src.services.scenario_utils import determine_scenario_directory
+from src.services.state_store import MemoryStateStore, StateStore, StoredMapping
 
 # Constants
 ROLE_PLAY_FILE_SUFFIX = "-role-play.prompt.yml"
@@ -27,25 +28,33 @@ AZURE_AGENT_NAME_PREFIX = "agent"
 UUID_SHORT_LENGTH = 8
 MAX_RESPONSE_LENGTH_SENTENCES = 3
 SCENARIO_DATA_DIR = "data/scenarios"
+AGENTS_NAMESPACE = "agents"
+GENERATED_SCENARIOS_NAMESPACE = "scenarios"
 DOCKER_APP_PATH = "/app"
 
 logger = logging.getLogger(__name__)
 
+# Called with an agent id and its new configuration, or None once the agent is deleted
+AgentListener = Callable[[str, Optional[Dict[str, Any]]], None]
+
 
 class ScenarioManager:
     """Manages training scenarios loaded from YAML files."""
 
-    def __init__(self, scenario_dir: Optional[Path] = None):
+    def __init__(self, scenario_dir: Optional[Path] = None, store: Optional[StateStore] = None):
         """
         Initialize the scenario manager.
 
         Args:
             scenario_dir: Directory containing scenario YAML files
+            store: Shared store for generated scenarios (per-process memory if None)
         """
         self.scenario_dir = determine_scenario_directory(scenario_dir)
         self.scenarios = self._load_scenarios()
         self.graph_generator = GraphScenarioGenerator()
-        self.generated_scenarios: Dict[str, Any] = {}
+        self.generated_scenarios: MutableMapping[str, Dict[str, Any]] = StoredMapping(
+            store or MemoryStateStore(), GENERATED_SCENARIOS_NAMESPACE
+        )
 
     def _load_scenarios(self) -> Dict[str, Any]:
         """
@@ -126,7 +135,7 @@ class ScenarioManager:
 
         return scenarios
 
-    def generate_scenario_from_graph(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_scenario_from_graph(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate a scenario based on Microsoft Graph API data.
 
@@ -136,7 +145,7 @@ class ScenarioManager:
         Returns:
             Dict[str, Any]: Generated scenario
         """
-        scenario = self.graph_generator.generate_scenario_from_graph(graph_data)
+        scenario = await self.graph_generator.generate_scenario_from_graph(graph_data)
 
         self.generated_scenarios[scenario["id"]] = scenario
 
@@ -160,9 +169,15 @@ CRITICAL INTERACTION GUIDELINES:
 - Avoid overly formal or robotic language - speak like a real business professional would
     """
 
-    def __init__(self):
-        """Initialize the agent manager."""
-        self.agents: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, store: Optional[StateStore] = None):
+        """
+        Initialize the agent manager.
+
+        Args:
+            store: Shared store for agent configurations (per-process memory if None)
+        """
+        self.agents: MutableMapping[str, Dict[str, Any]] = StoredMapping(store or MemoryStateStore(), AGENTS_NAMESPACE)
+        self.listeners: List[AgentListener] = []
         self.credential = DefaultAzureCredential()
         self.use_azure_ai_agents = config["use_azure_ai_agents"]
         self.project_client = self._initialize_project_client()
@@ -221,11 +236,32 @@ CRITICAL INTERACTION GUIDELINES:
 
         # Handle foundry agent scenarios
         if is_foundry_agent and foundry_config.get("requiresCustomAgent", False):
-            return self._create_foundry_agent(scenario_id, combined_instructions, model_name, temperature, max_tokens, foundry_config)
+            agent_id = self._create_foundry_agent(scenario_id, combined_instructions, model_name, temperature, max_tokens, foundry_config)
+        elif self.use_azure_ai_agents and self.project_client:
+            agent_id = self._create_azure_agent(scenario_id, combined_instructions, model_name, temperature, max_tokens)
+        else:
+            agent_id = self._create_local_agent(scenario_id, combined_instructions, model_name, temperature, max_tokens)
+
+        self._notify_listeners(agent_id)
+        return agent_id
+
+    def add_listener(self, listener: AgentListener) -> None:
+        """
+        Register a callback for agent creation, updates and deletion.
 
-        if self.use_azure_ai_agents and self.project_client:
-            return self._create_azure_agent(scenario_id, combined_instructions, model_name, temperature, max_tokens)
-        return self._create_local_agent(scenario_id, combined_instructions, model_name, temperature, max_tokens)
+        Args:
+            listener: Called with the agent id and its configuration, or None once deleted
+        """
+        self.listeners.append(listener)
+
+    def _notify_listeners(self, agent_id: str) -> None:
+        """Tell the listeners about the current configuration of an agent."""
+        agent_config = self.agents.get(agent_id)
+        for listener in self.listeners:
+            try:
+                listener(agent_id, agent_config)
+            except Exception as e:
+                logger.error("Agent listener failed for %s: %s", agent_id, e)
 
     def _create_azure_agent(
         self,
@@ -424,6 +460,27 @@ CRITICAL INTERACTION GUIDELINES:
         """
         return self.agents.get(agent_id)
 
+    def update_agent(self, agent_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Update an agent's configuration.
+
+        The stored configuration is replaced rather than modified in place, so sessions
+        already using the previous configuration are unaffected.
+
+        Args:
+            agent_id: The agent identifier
+            changes: Configuration fields to change
+
+        Returns:
+            Optional[Dict[str, Any]]: The new configuration or None if the agent was not found
+        """
+        agent_config = self.agents.get(agent_id)
+        if agent_config is None:
+            return None
+        self.agents[agent_id] = {**agent_config, **changes}
+        self._notify_listeners(agent_id)
+        return self.agents[agent_id]
+
     def delete_agent(self, agent_id: str) -> None:
         """
         Delete an agent.
@@ -445,5 +502,6 @@ CRITICAL INTERACTION GUIDELINES:
 
                 del self.agents[agent_id]
                 logger.info("Deleted agent from local storage: %s", agent_id)
+                self._notify_listeners(agent_id)
         except Exception as e:
             logger.error("Error deleting agent %s: %s", agent_id, e)
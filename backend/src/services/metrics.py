@@ -0,0 +1,200 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""In-process metrics registry with JSON and Prometheus text export."""
+
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
+MetricKey = Tuple[str, LabelSet]
+
+# Default histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _make_key(name: str, labels: Dict[str, Any]) -> MetricKey:
+    """Build a hashable metric key from a name and label values."""
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _format_labels(labels: LabelSet) -> str:
+    """Format labels in Prometheus exposition syntax."""
+    if not labels:
+        return ""
+    escaped = (
+        '{}="{}"'.format(label, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for label, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class _Histogram:
+    """Bucketed observations of one histogram series."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * len(self.bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Cumulative counts per upper bound, ending with +Inf."""
+        result: List[Tuple[str, int]] = []
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            result.append((_format_bound(bound), total))
+        result.append(("+Inf", self.count))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "buckets": dict(self.cumulative())}
+
+
+def _format_bound(bound: float) -> str:
+    """Format a bucket bound the way Prometheus clients do."""
+    return repr(float(bound))
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and histograms."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._counters: Dict[MetricKey, float] = {}
+        self._gauges: Dict[MetricKey, float] = {}
+        self._histograms: Dict[MetricKey, _Histogram] = {}
+
+    def increment(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name: Metric name
+            value: Amount to add
+            **labels: Label values identifying the series
+        """
+        key = _make_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Set a gauge to a value.
+
+        Args:
+            name: Metric name
+            value: Current value
+            **labels: Label values identifying the series
+        """
+        key = _make_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def remove_gauge(self, name: str, **labels: Any) -> None:
+        """Remove a gauge series, e.g. when the session it describes ends."""
+        key = _make_key(name, labels)
+        with self._lock:
+            self._gauges.pop(key, None)
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = DEFAULT_BUCKETS, **labels: Any) -> None:
+        """
+        Record an observation in a histogram.
+
+        Args:
+            name: Metric name
+            value: Observed value
+            buckets: Bucket upper bounds, used when the series is first created
+            **labels: Label values identifying the series
+        """
+        key = _make_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def get_histogram(self, name: str, **labels: Any) -> Optional[Dict[str, Any]]:
+        """Get the count, sum and cumulative buckets of a histogram series, or None if unset."""
+        key = _make_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            return histogram.to_dict() if histogram else None
+
+    def get(self, name: str, **labels: Any) -> float:
+        """Get the current value of a counter or gauge series (0 if unset)."""
+        key = _make_key(name, labels)
+        with self._lock:
+            return self._counters.get(key, self._gauges.get(key, 0.0))
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get a JSON-serializable snapshot of all metrics.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Series grouped by metric name
+        """
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            series: List[Tuple[MetricKey, Any]] = list(self._counters.items()) + list(self._gauges.items())
+            series += [(key, histogram.to_dict()) for key, histogram in self._histograms.items()]
+        for (name, labels), value in sorted(series, key=lambda item: item[0]):
+            result.setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return result
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines: List[str] = []
+        with self._lock:
+            groups = (("counter", sorted(self._counters.items())), ("gauge", sorted(self._gauges.items())))
+            histograms = sorted(
+                ((key, histogram.cumulative(), histogram.sum) for key, histogram in self._histograms.items()),
+                key=lambda item: item[0],
+            )
+        for metric_type, series in groups:
+            declared = set()
+            for (name, labels), value in series:
+                if name not in declared:
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    declared.add(name)
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        declared = set()
+        for (name, labels), buckets, total in histograms:
+            if name not in declared:
+                lines.append(f"# TYPE {name} histogram")
+                declared.add(name)
+            for bound, count in buckets:
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{name}_count{_format_labels(labels)} {buckets[-1][1]}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Remove all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,100 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Shared asynchronous Azure OpenAI client for every model call the application makes."""
+
+import asyncio
+import logging
+import threading
+import weakref
+
+import httpx
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class SharedOpenAIClient:
+    """
+    Provides one ``AsyncAzureOpenAI`` client, and so one keep-alive connection pool, per event loop.
+
+    Pooled connections belong to the event loop that opened them, so a loop gets its own
+    client on first use. Request handlers run their model calls on the shared background
+    loop, so in practice every call reuses the same pool.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry_seconds: float,
+        timeout_seconds: float,
+    ):
+        """
+        Initialize the provider; clients are created on first use.
+
+        Args:
+            max_connections: Maximum concurrent connections to the Azure OpenAI endpoint
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry_seconds: How long an idle connection is kept
+            timeout_seconds: Timeout of a model call
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self.timeout_seconds = timeout_seconds
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncAzureOpenAI]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self) -> AsyncAzureOpenAI:
+        """
+        Get the client of the running event loop, creating it on first use.
+
+        Returns:
+            AsyncAzureOpenAI: The client
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = self._clients[loop] = self._create_client()
+            return client
+
+    def _create_client(self) -> AsyncAzureOpenAI:
+        """Create a client with the tuned connection pool."""
+        logger.info(
+            "Creating Azure OpenAI client with up to %s connection(s), %s kept alive",
+            self.limits.max_connections,
+            self.limits.max_keepalive_connections,
+        )
+        return AsyncAzureOpenAI(
+            api_version=config["api_version"],
+            azure_endpoint=config["azure_openai_endpoint"],
+            api_key=config["azure_openai_api_key"],
+            timeout=self.timeout_seconds,
+            http_client=DefaultAsyncHttpxClient(limits=self.limits, timeout=self.timeout_seconds),
+        )
+
+    async def aclose(self) -> None:
+        """Close the client of the running event loop and its connections."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+
+shared_openai_client = SharedOpenAIClient(
+    max_connections=config["openai_max_connections"],
+    max_keepalive_connections=config["openai_max_keepalive_connections"],
+    keepalive_expiry_seconds=config["openai_keepalive_expiry_seconds"],
+    timeout_seconds=config["openai_timeout_seconds"],
+)
@@ -0,0 +1,197 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Rolling evaluation of voice sessions, updated in the background after each completed turn."""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from src.services.analyzers import ConversationAnalyzer
+from src.services.background_loop import BackgroundLoop, background_loop
+from src.services.metrics import metrics
+from src.services.session_capture import SessionCapture
+
+logger = logging.getLogger(__name__)
+
+# Metric names
+ROLLING_EVALUATION_UPDATES_METRIC = "rolling_evaluation_updates_total"
+ROLLING_EVALUATION_UPDATE_SECONDS_METRIC = "rolling_evaluation_update_seconds"
+ROLLING_EVALUATION_FINAL_METRIC = "rolling_evaluation_final_total"
+ROLLING_EVALUATION_SESSIONS_METRIC = "rolling_evaluation_sessions"
+
+# Buckets covering model calls on a few turns
+ROLLING_EVALUATION_BUCKETS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _format_turns(messages: List[Dict[str, str]]) -> str:
+    return "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+
+
+class RollingEvaluation:
+    """The running evaluation of one session."""
+
+    def __init__(self, capture: SessionCapture):
+        """
+        Initialize the evaluation before any turn is evaluated.
+
+        Args:
+            capture: The capture of the session being evaluated
+        """
+        self.capture = capture
+        self.state: Optional[Dict[str, Any]] = None
+        self.evaluated = 0
+        self.updating = False
+        self.future: Optional["Future[None]"] = None
+        self.lock = threading.Lock()
+
+
+class RollingEvaluator:
+    """
+    Keeps a compact running evaluation (scores plus evidence notes) of each captured session.
+
+    After every completed assistant turn, the turns not yet evaluated are sent to the model
+    together with the running evaluation on the background event loop. At most one update
+    per session runs at a time; turns completed meanwhile are picked up by the same update.
+    The analysis at the end of the session then only waits for the last update and merges
+    the running evaluation locally.
+    """
+
+    def __init__(self, analyzer: ConversationAnalyzer, ttl_seconds: float, loop: BackgroundLoop = background_loop):
+        """
+        Initialize the evaluator.
+
+        Args:
+            analyzer: Analyzer providing the evaluation scenarios and the model client
+            ttl_seconds: How long a running evaluation is kept after its session ends
+            loop: Event loop running the updates
+        """
+        self.analyzer = analyzer
+        self.ttl_seconds = ttl_seconds
+        self.loop = loop
+        self._sessions: Dict[str, RollingEvaluation] = {}
+        self._lock = threading.Lock()
+
+    def on_turn(self, capture: SessionCapture) -> None:
+        """
+        Schedule an update of a session's running evaluation after a completed turn.
+
+        Args:
+            capture: The capture of the session
+        """
+        if not capture.scenario_id or capture.scenario_id not in self.analyzer.evaluation_scenarios:
+            return
+        evaluation = self._get_or_create(capture)
+        with evaluation.lock:
+            if evaluation.updating:
+                return
+            evaluation.updating = True
+            evaluation.future = self.loop.submit(self._update(evaluation))
+
+    async def final_evaluation(self, session_id: str, scenario_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the evaluation of a whole session from its running evaluation.
+
+        Waits for a running update and evaluates turns completed after it.
+
+        Args:
+            session_id: The proxy session id
+            scenario_id: The scenario the session is analyzed against
+
+        Returns:
+            Optional[Dict[str, Any]]: The merged evaluation, or None if no running evaluation
+            covers the session and a full analysis is needed
+        """
+        with self._lock:
+            evaluation = self._sessions.get(session_id)
+        if evaluation is None or evaluation.capture.scenario_id != scenario_id:
+            metrics.increment(ROLLING_EVALUATION_FINAL_METRIC, result="unavailable")
+            return None
+
+        await self._wait_for_update(evaluation)
+        with evaluation.lock:
+            catch_up = not evaluation.updating
+            evaluation.updating = True
+        if catch_up:
+            await self._update(evaluation)
+        else:
+            # A turn completed while waiting, and its update is already running
+            await self._wait_for_update(evaluation)
+
+        with evaluation.lock:
+            state = evaluation.state
+            complete = state is not None and not evaluation.capture.messages_since(evaluation.evaluated)
+        if not complete or state is None:
+            metrics.increment(ROLLING_EVALUATION_FINAL_METRIC, result="incomplete")
+            return None
+
+        metrics.increment(ROLLING_EVALUATION_FINAL_METRIC, result="merged")
+        return self.analyzer.merge_rolling_evaluation(state)
+
+    async def _wait_for_update(self, evaluation: RollingEvaluation) -> None:
+        """Wait for the last scheduled update of a session, ignoring its failure."""
+        future = evaluation.future
+        if future is None:
+            return
+        try:
+            await asyncio.wrap_future(future)
+        except Exception as e:
+            logger.error("Rolling evaluation update of session %s failed: %s", evaluation.capture.session_id, e)
+
+    async def _update(self, evaluation: RollingEvaluation) -> None:
+        """Evaluate new turns until the running evaluation has caught up or an update fails."""
+        capture = evaluation.capture
+        try:
+            while True:
+                with evaluation.lock:
+                    new_messages = capture.messages_since(evaluation.evaluated)
+                    if not new_messages:
+                        evaluation.updating = False
+                        return
+                started = time.monotonic()
+                state = await self.analyzer.evaluate_turns(
+                    capture.scenario_id or "", evaluation.state, _format_turns(new_messages)
+                )
+                metrics.observe(
+                    ROLLING_EVALUATION_UPDATE_SECONDS_METRIC,
+                    time.monotonic() - started,
+                    buckets=ROLLING_EVALUATION_BUCKETS,
+                )
+                if state is None:
+                    metrics.increment(ROLLING_EVALUATION_UPDATES_METRIC, result="failed")
+                    with evaluation.lock:
+                        evaluation.updating = False
+                    return
+                metrics.increment(ROLLING_EVALUATION_UPDATES_METRIC, result="updated")
+                with evaluation.lock:
+                    evaluation.state = state
+                    evaluation.evaluated += len(new_messages)
+                logger.debug(
+                    "Session %s running evaluation covers %s message(s)", capture.session_id, evaluation.evaluated
+                )
+        except BaseException:
+            with evaluation.lock:
+                evaluation.updating = False
+            raise
+
+    def _get_or_create(self, capture: SessionCapture) -> RollingEvaluation:
+        """Get the running evaluation of a session, dropping those of long-ended sessions."""
+        with self._lock:
+            now = time.monotonic()
+            expired = [
+                session_id
+                for session_id, evaluation in self._sessions.items()
+                if evaluation.capture.ended_at is not None and now - evaluation.capture.ended_at > self.ttl_seconds
+            ]
+            for session_id in expired:
+                del self._sessions[session_id]
+            evaluation = self._sessions.get(capture.session_id)
+            if evaluation is None or evaluation.capture is not capture:
+                evaluation = self._sessions[capture.session_id] = RollingEvaluation(capture)
+            metrics.set_gauge(ROLLING_EVALUATION_SESSIONS_METRIC, len(self._sessions))
+            return evaluation
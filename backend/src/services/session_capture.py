@@ -0,0 +1,308 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Server-side capture of user audio and transcripts for each voice session."""
+
+import base64
+import binascii
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, cast
+
+from src.services.metrics import metrics
+from src.services.transports import Frame
+
+logger = logging.getLogger(__name__)
+
+# Event types
+USER_TRANSCRIPT_TYPE = "conversation.item.input_audio_transcription.completed"
+ASSISTANT_TRANSCRIPT_TYPE = "response.audio_transcript.done"
+TRANSCRIPT_TYPES = frozenset({USER_TRANSCRIPT_TYPE, ASSISTANT_TRANSCRIPT_TYPE})
+
+# Base64 payloads contain no escapes, so the audio field can be read without a full decode
+_AUDIO_FIELD_PATTERN = re.compile(r'"audio"\s*:\s*"([A-Za-z0-9+/=]*)"')
+
+# Bytes per second of 24 kHz PCM16 audio
+PCM_BYTES_PER_SECOND = 48000
+
+# Metric names
+CAPTURED_SESSIONS_METRIC = "voice_proxy_captured_sessions"
+CAPTURE_TRUNCATED_METRIC = "voice_proxy_capture_truncated_total"
+CAPTURE_BYTES_METRIC = "voice_proxy_capture_bytes"
+CAPTURE_EVICTED_METRIC = "voice_proxy_capture_evicted_total"
+
+
+def extract_audio(frame: Frame) -> Optional[bytes]:
+    """
+    Get the PCM audio of an ``input_audio_buffer.append`` frame.
+
+    Args:
+        frame: A raw append frame
+
+    Returns:
+        Optional[bytes]: The decoded audio, or None if the frame has no valid audio
+    """
+    if not isinstance(frame, str):
+        return None
+    match = _AUDIO_FIELD_PATTERN.search(frame)
+    if match is not None:
+        audio: Any = match.group(1)
+    else:
+        try:
+            audio = json.loads(frame).get("audio")
+        except (ValueError, AttributeError):
+            return None
+    if not isinstance(audio, str):
+        return None
+    try:
+        return base64.b64decode(audio)
+    except (binascii.Error, ValueError):
+        return None
+
+
+def transcript_message(event: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Convert a completed transcript event into a conversation message.
+
+    Args:
+        event: A decoded user or assistant transcript event
+
+    Returns:
+        Optional[Dict[str, str]]: A ``{"role", "content"}`` message, or None if the transcript is empty
+    """
+    transcript = event.get("transcript")
+    if not transcript:
+        return None
+    role = "user" if event.get("type") == USER_TRANSCRIPT_TYPE else "assistant"
+    return {"role": role, "content": transcript}
+
+
+class SessionCapture:
+    """User audio and conversation transcript captured for one session."""
+
+    def __init__(
+        self,
+        session_id: str,
+        max_audio_bytes: int,
+        scenario_id: Optional[str] = None,
+        turn_listeners: Optional[List["TurnListener"]] = None,
+        reserve_audio: Optional[Callable[[int], bool]] = None,
+    ):
+        """
+        Initialize an empty capture.
+
+        Args:
+            session_id: The proxy session id
+            max_audio_bytes: Maximum PCM audio bytes kept
+            scenario_id: The scenario being practiced, if known
+            turn_listeners: Called with the capture after each completed assistant turn
+            reserve_audio: Claims room for more audio in a shared budget, returning False if there is none
+        """
+        self.session_id = session_id
+        self.max_audio_bytes = max_audio_bytes
+        self.scenario_id = scenario_id
+        self.turn_listeners = turn_listeners if turn_listeners is not None else []
+        self.reserve_audio = reserve_audio
+        self.audio_chunks: List[bytes] = []
+        self.audio_bytes = 0
+        self.truncated = False
+        self.messages: List[Dict[str, str]] = []
+        self.ended_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add_audio(self, audio: bytes) -> None:
+        """Append a PCM user audio chunk, up to the session and shared size limits."""
+        with self._lock:
+            if self.truncated:
+                return
+            if self.audio_bytes + len(audio) > self.max_audio_bytes or (
+                self.reserve_audio is not None and not self.reserve_audio(len(audio))
+            ):
+                self.truncated = True
+                metrics.increment(CAPTURE_TRUNCATED_METRIC)
+                logger.warning("Session %s audio capture reached its size limit", self.session_id)
+                return
+            self.audio_chunks.append(audio)
+            self.audio_bytes += len(audio)
+
+    def add_transcript(self, event: Dict[str, Any]) -> None:
+        """Record a completed user or assistant transcript event."""
+        message = transcript_message(event)
+        if message is None:
+            return
+        with self._lock:
+            self.messages.append(message)
+        if message["role"] == "assistant":
+            for listener in self.turn_listeners:
+                try:
+                    listener(self)
+                except Exception as e:
+                    logger.error("Turn listener failed for session %s: %s", self.session_id, e)
+
+    def messages_since(self, start: int) -> List[Dict[str, str]]:
+        """
+        Get the messages recorded after the first ``start`` ones.
+
+        Args:
+            start: Number of messages already seen
+
+        Returns:
+            List[Dict[str, str]]: The newer ``{"role", "content"}`` messages
+        """
+        with self._lock:
+            return list(self.messages[start:])
+
+    def audio_data(self) -> List[Dict[str, Any]]:
+        """
+        Get the captured audio in the chunk format accepted by the pronunciation assessor.
+
+        Returns:
+            List[Dict[str, Any]]: The user audio as a single base64 chunk, or no chunk if none was captured
+        """
+        with self._lock:
+            if not self.audio_chunks:
+                return []
+            return [{"type": "user", "data": base64.b64encode(b"".join(self.audio_chunks)).decode("ascii")}]
+
+    def transcript(self) -> str:
+        """Get the conversation transcript as ``role: content`` lines."""
+        with self._lock:
+            return "\n".join(f"{m['role']}: {m['content']}" for m in self.messages)
+
+    def reference_text(self) -> str:
+        """Get everything the user said, for pronunciation assessment."""
+        with self._lock:
+            return " ".join(m["content"] for m in self.messages if m["role"] == "user").strip()
+
+
+# Receives a capture each time one of its assistant turns completes
+TurnListener = Callable[[SessionCapture], None]
+
+
+class SessionCaptureStore:
+    """
+    Thread-safe store of session captures keyed by session id.
+
+    Captures are kept for a limited time after their session ends so that the analysis
+    request that follows can use them. The audio of all captures shares a byte budget;
+    when it is used up, the captures of the sessions that ended first are dropped, and if
+    only running sessions are left, their audio stops being captured.
+    """
+
+    def __init__(self, ttl_seconds: float, max_audio_seconds: float, max_total_bytes: int = 0):
+        """
+        Initialize the store.
+
+        Args:
+            ttl_seconds: How long a capture is kept after its session ends
+            max_audio_seconds: Maximum user audio captured per session
+            max_total_bytes: Maximum audio bytes held by all captures together, 0 for no limit
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_audio_bytes = int(max_audio_seconds * PCM_BYTES_PER_SECOND)
+        self.max_total_bytes = max_total_bytes
+        self.total_bytes = 0
+        self._captures: Dict[str, SessionCapture] = {}
+        self.turn_listeners: List[TurnListener] = []
+        self._lock = threading.Lock()
+
+    def add_turn_listener(self, listener: TurnListener) -> None:
+        """
+        Register a callback for completed turns of every captured session.
+
+        Args:
+            listener: Called with the capture after each completed assistant turn
+        """
+        self.turn_listeners.append(listener)
+
+    def start(self, session_id: str, scenario_id: Optional[str] = None) -> SessionCapture:
+        """
+        Start capturing a session.
+
+        Args:
+            session_id: The proxy session id
+            scenario_id: The scenario being practiced, if known
+
+        Returns:
+            SessionCapture: The new capture
+        """
+        capture = SessionCapture(
+            session_id, self.max_audio_bytes, scenario_id, self.turn_listeners, self._reserve_audio
+        )
+        with self._lock:
+            self._expire()
+            previous = self._captures.get(session_id)
+            if previous is not None:
+                self._drop(session_id, previous)
+            self._captures[session_id] = capture
+            metrics.set_gauge(CAPTURED_SESSIONS_METRIC, len(self._captures))
+        return capture
+
+    def end(self, session_id: str) -> None:
+        """Mark a session as ended so that its capture starts to expire."""
+        with self._lock:
+            capture = self._captures.get(session_id)
+            if capture:
+                capture.ended_at = time.monotonic()
+
+    def get(self, session_id: str) -> Optional[SessionCapture]:
+        """
+        Get the capture of a session.
+
+        Args:
+            session_id: The proxy session id
+
+        Returns:
+            Optional[SessionCapture]: The capture, or None if unknown or expired
+        """
+        with self._lock:
+            self._expire()
+            return self._captures.get(session_id)
+
+    def _reserve_audio(self, size: int) -> bool:
+        """Claim room for audio in the shared budget, evicting the oldest ended captures if needed."""
+        with self._lock:
+            if self.max_total_bytes > 0 and self.total_bytes + size > self.max_total_bytes:
+                self._expire()
+                ended = sorted(
+                    (capture for capture in self._captures.values() if capture.ended_at is not None),
+                    key=lambda capture: cast(float, capture.ended_at),
+                )
+                for capture in ended:
+                    if self.total_bytes + size <= self.max_total_bytes:
+                        break
+                    self._drop(capture.session_id, capture)
+                    metrics.increment(CAPTURE_EVICTED_METRIC)
+                    logger.info("Evicted capture of session %s to stay within the audio budget", capture.session_id)
+                metrics.set_gauge(CAPTURED_SESSIONS_METRIC, len(self._captures))
+                if self.total_bytes + size > self.max_total_bytes:
+                    return False
+            self.total_bytes += size
+            metrics.set_gauge(CAPTURE_BYTES_METRIC, self.total_bytes)
+            return True
+
+    def _drop(self, session_id: str, capture: SessionCapture) -> None:
+        """Remove a capture and return its audio to the shared budget."""
+        del self._captures[session_id]
+        # A dropped capture is no longer accounted for, so it must not grow any further
+        capture.reserve_audio = lambda _size: False
+        self.total_bytes -= capture.audio_bytes
+        metrics.set_gauge(CAPTURE_BYTES_METRIC, self.total_bytes)
+
+    def _expire(self) -> None:
+        """Drop captures of sessions that ended more than the TTL ago."""
+        now = time.monotonic()
+        expired = [
+            (session_id, capture)
+            for session_id, capture in self._captures.items()
+            if capture.ended_at is not None and now - capture.ended_at > self.ttl_seconds
+        ]
+        for session_id, capture in expired:
+            self._drop(session_id, capture)
+        if expired:
+            metrics.set_gauge(CAPTURED_SESSIONS_METRIC, len(self._captures))
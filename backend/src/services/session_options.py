@@ -0,0 +1,63 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Proxy options the client negotiates in its first ``session.update``."""
+
+import json
+import logging
+from typing import NamedTuple, Optional
+
+from src.services.audio_resampler import SOURCE_SAMPLE_RATE, SUPPORTED_OUTPUT_SAMPLE_RATES
+from src.services.transports import Frame
+
+logger = logging.getLogger(__name__)
+
+SESSION_UPDATE_TYPE = "session.update"
+
+
+class SessionOptions(NamedTuple):
+    """
+    Per-session options read from the client's first message.
+
+    Attributes:
+        agent_id: The agent to talk to, or None for the default configuration
+        binary_audio: Whether the client sends microphone audio as binary PCM16 frames
+        output_sample_rate: Sample rate of the response audio forwarded to the client
+    """
+
+    agent_id: Optional[str] = None
+    binary_audio: bool = False
+    output_sample_rate: int = SOURCE_SAMPLE_RATE
+
+
+def parse_session_options(message: Optional[Frame]) -> SessionOptions:
+    """
+    Read the session options from the client's first message.
+
+    Args:
+        message: The first frame received from the client
+
+    Returns:
+        SessionOptions: The requested options, or the defaults if the frame is not a session update
+    """
+    if not isinstance(message, str):
+        return SessionOptions()
+    try:
+        msg = json.loads(message)
+    except ValueError as e:
+        logger.error("Error parsing session options: %s", e)
+        return SessionOptions()
+    if not isinstance(msg, dict) or msg.get("type") != SESSION_UPDATE_TYPE:
+        return SessionOptions()
+    session = msg.get("session") or {}
+    output_sample_rate = session.get("output_sample_rate", SOURCE_SAMPLE_RATE)
+    if output_sample_rate not in SUPPORTED_OUTPUT_SAMPLE_RATES:
+        logger.warning("Unsupported output sample rate %s, using %s Hz", output_sample_rate, SOURCE_SAMPLE_RATE)
+        output_sample_rate = SOURCE_SAMPLE_RATE
+    return SessionOptions(
+        agent_id=session.get("agent_id"),
+        binary_audio=session.get("binary_audio") is True,
+        output_sample_rate=output_sample_rate,
+    )
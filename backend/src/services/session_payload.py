@@ -0,0 +1,115 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Per-agent upstream session payloads, serialized once and reused for every connection."""
+
+import logging
+import threading
+import uuid
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from src.services.connection_pool import UpstreamKey
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Metric names
+SESSION_PAYLOAD_CACHE_METRIC = "voice_proxy_session_payload_cache_total"
+
+
+class CompiledSession(NamedTuple):
+    """
+    Everything needed to open an upstream session for one agent.
+
+    Attributes:
+        source: The agent configuration the payloads were built from (None for the default)
+        url_prefix: The upstream URL up to the per-request client request id
+        url_suffix: The query parameters following the client request id
+        session_update: Serialized ``session.update`` for a fresh connection
+        agent_update: Serialized agent-only ``session.update`` for a warm pooled connection
+        upstream_key: The pool key of connections that can serve the agent
+    """
+
+    source: Optional[Dict[str, Any]]
+    url_prefix: str
+    url_suffix: str
+    session_update: str
+    agent_update: str
+    upstream_key: UpstreamKey
+
+    def url(self) -> str:
+        """Build the upstream URL with a fresh client request id."""
+        return f"{self.url_prefix}{uuid.uuid4()}{self.url_suffix}"
+
+
+SessionCompiler = Callable[[Optional[str], Optional[Dict[str, Any]]], CompiledSession]
+
+
+class SessionPayloadCache:
+    """
+    Compiled sessions keyed by agent id.
+
+    An entry is only reused for the configuration it was built from, so an agent that is
+    updated, or deleted and created again under the same id, is recompiled. Configurations
+    read from a shared state store are new objects on every read and are compared by value.
+    """
+
+    def __init__(self, compile_session: SessionCompiler):
+        """
+        Initialize the cache.
+
+        Args:
+            compile_session: Builds the compiled session of an agent id and configuration
+        """
+        self._compile = compile_session
+        self._entries: Dict[Optional[str], CompiledSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, agent_id: Optional[str], agent_config: Optional[Dict[str, Any]]) -> CompiledSession:
+        """
+        Get the compiled session of an agent, compiling it on first use.
+
+        Args:
+            agent_id: The agent identifier, or None for the default configuration
+            agent_config: The agent's current configuration
+
+        Returns:
+            CompiledSession: The compiled session
+        """
+        entry = self._entries.get(agent_id)
+        if entry is not None and (entry.source is agent_config or entry.source == agent_config):
+            metrics.increment(SESSION_PAYLOAD_CACHE_METRIC, result="hit")
+            return entry
+        metrics.increment(SESSION_PAYLOAD_CACHE_METRIC, result="miss")
+        return self.compile(agent_id, agent_config)
+
+    def compile(self, agent_id: Optional[str], agent_config: Optional[Dict[str, Any]]) -> CompiledSession:
+        """
+        Compile and store the session of an agent.
+
+        Args:
+            agent_id: The agent identifier, or None for the default configuration
+            agent_config: The agent's current configuration
+
+        Returns:
+            CompiledSession: The compiled session
+        """
+        entry = self._compile(agent_id, agent_config)
+        with self._lock:
+            self._entries[agent_id] = entry
+        return entry
+
+    def invalidate(self, agent_id: Optional[str]) -> None:
+        """
+        Drop the compiled session of an agent.
+
+        Args:
+            agent_id: The agent identifier
+        """
+        with self._lock:
+            self._entries.pop(agent_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
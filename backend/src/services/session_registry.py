@@ -0,0 +1,149 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Admission control and graceful draining of voice sessions."""
+
+import logging
+import os
+import signal
+import threading
+import time
+from typing import Any, Optional, Set
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Rejection reasons
+REJECTED_AT_CAPACITY = "capacity"
+REJECTED_DRAINING = "draining"
+
+# Metric names
+ACTIVE_SESSIONS_METRIC = "voice_proxy_active_sessions"
+SESSIONS_REJECTED_METRIC = "voice_proxy_sessions_rejected_total"
+DRAINING_METRIC = "voice_proxy_draining"
+
+
+class SessionRegistry:
+    """
+    Tracks active voice sessions of this process.
+
+    Sessions are admitted up to a concurrency limit. Once draining has started, no new
+    sessions are admitted and callers can wait for the active ones to finish. The registry
+    is shared by sessions running on different threads and event loops.
+    """
+
+    def __init__(self, max_sessions: int = 0, retry_after_seconds: float = 5.0):
+        """
+        Initialize the registry.
+
+        Args:
+            max_sessions: Maximum concurrent sessions (0 for no limit)
+            retry_after_seconds: Retry hint given to rejected clients
+        """
+        self.max_sessions = max_sessions
+        self.retry_after_seconds = retry_after_seconds
+        self.draining = False
+        self._sessions: Set[str] = set()
+        self._condition = threading.Condition()
+
+    @property
+    def active_count(self) -> int:
+        """Number of active sessions."""
+        with self._condition:
+            return len(self._sessions)
+
+    def try_admit(self, session_id: str) -> Optional[str]:
+        """
+        Admit a session if there is room.
+
+        Args:
+            session_id: The new session's id
+
+        Returns:
+            Optional[str]: None if admitted, otherwise the rejection reason
+        """
+        with self._condition:
+            if self.draining:
+                reason: Optional[str] = REJECTED_DRAINING
+            elif self.max_sessions and len(self._sessions) >= self.max_sessions:
+                reason = REJECTED_AT_CAPACITY
+            else:
+                self._sessions.add(session_id)
+                metrics.set_gauge(ACTIVE_SESSIONS_METRIC, len(self._sessions))
+                return None
+        metrics.increment(SESSIONS_REJECTED_METRIC, reason=reason)
+        return reason
+
+    def release(self, session_id: str) -> None:
+        """Remove a finished session."""
+        with self._condition:
+            self._sessions.discard(session_id)
+            metrics.set_gauge(ACTIVE_SESSIONS_METRIC, len(self._sessions))
+            self._condition.notify_all()
+
+    def start_draining(self) -> None:
+        """Stop admitting new sessions."""
+        with self._condition:
+            if not self.draining:
+                logger.info("Draining: no longer accepting voice sessions, %s active", len(self._sessions))
+            self.draining = True
+            metrics.set_gauge(DRAINING_METRIC, 1)
+
+    def wait_idle(self, timeout: float) -> bool:
+        """
+        Block until no sessions are active or the timeout expires.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if all sessions finished in time
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._sessions:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+
+def install_drain_on_sigterm(registry: SessionRegistry, timeout: float) -> None:
+    """
+    Drain voice sessions before the server handles SIGTERM.
+
+    The current SIGTERM handler, such as the server's own graceful shutdown, is called once
+    active sessions have finished or the timeout has expired. Waiting happens on a
+    background thread so the event loop keeps serving the remaining sessions.
+
+    Args:
+        registry: The session registry to drain
+        timeout: Maximum seconds to wait for active sessions
+    """
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def finish(signum: int, frame: Any) -> None:
+        if registry.wait_idle(timeout):
+            logger.info("Drained all voice sessions")
+        else:
+            logger.warning("Drain deadline reached with %s voice session(s) active", registry.active_count)
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    def on_sigterm(signum: int, frame: Any) -> None:
+        if registry.draining:
+            return
+        registry.start_draining()
+        threading.Thread(target=finish, args=(signum, frame), name="session-drain", daemon=True).start()
+
+    try:
+        signal.signal(signal.SIGTERM, on_sigterm)
+    except ValueError:
+        logger.warning("SIGTERM draining is only available when started from the main thread")
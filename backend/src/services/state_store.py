@@ -0,0 +1,338 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Shared storage for agents and generated scenarios, so every worker sees the same state."""
+
+import json
+import logging
+import socket
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Protocol
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+MEMORY_SCHEME = "memory"
+SQLITE_SCHEME = "sqlite"
+REDIS_SCHEME = "redis"
+
+DEFAULT_REDIS_PORT = 6379
+DEFAULT_REDIS_PREFIX = "voicelive"
+DEFAULT_TIMEOUT_SECONDS = 5.0
+
+
+class StateStoreError(Exception):
+    """Raised when a state store backend rejects a command."""
+
+
+class StateStore(Protocol):
+    """Key-value storage of JSON-serializable dicts, grouped by namespace."""
+
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """Get a value, or None if it does not exist."""
+
+    def set(self, namespace: str, key: str, value: Dict[str, Any]) -> None:
+        """Store a value."""
+
+    def delete(self, namespace: str, key: str) -> bool:
+        """Delete a value, returning whether it existed."""
+
+    def keys(self, namespace: str) -> List[str]:
+        """List the keys of a namespace."""
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize the non-JSON types found in agent configurations."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Dict[str, Any]) -> str:
+    return json.dumps(value, default=_json_default)
+
+
+class MemoryStateStore:
+    """Per-process store; values are kept as the objects that were stored."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        return self._data.get(namespace, {}).get(key)
+
+    def set(self, namespace: str, key: str, value: Dict[str, Any]) -> None:
+        self._data.setdefault(namespace, {})[key] = value
+
+    def delete(self, namespace: str, key: str) -> bool:
+        return self._data.get(namespace, {}).pop(key, None) is not None
+
+    def keys(self, namespace: str) -> List[str]:
+        return list(self._data.get(namespace, {}))
+
+
+class SqliteStateStore:
+    """Store in a SQLite database file shared by the workers of one host."""
+
+    def __init__(self, path: str, timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            path: Path of the database file
+            timeout: Seconds to wait for a lock held by another worker
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM state WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value: Dict[str, Any]) -> None:
+        data = _dumps(value)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO state (namespace, key, value) VALUES (?, ?, ?)", (namespace, key, data)
+            )
+
+    def delete(self, namespace: str, key: str) -> bool:
+        with self._lock:
+            cursor = self._connection.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+        return cursor.rowcount > 0
+
+    def keys(self, namespace: str) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute("SELECT key FROM state WHERE namespace = ?", (namespace,)).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+class RedisStateStore:
+    """
+    Store in a server speaking the Redis protocol (RESP), shared by workers on any host.
+
+    Each namespace is one hash. The client keeps a single connection, serialized by a
+    lock, and reconnects once if it finds the connection broken.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_REDIS_PORT,
+        db: int = 0,
+        password: Optional[str] = None,
+        prefix: str = DEFAULT_REDIS_PREFIX,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ):
+        """
+        Initialize the store; the connection is opened on first use.
+
+        Args:
+            host: Server host
+            port: Server port
+            db: Database index to select
+            password: Password for ``AUTH``, if the server requires one
+            prefix: Prefix of the hash names
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._reader: Any = None
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisStateStore":
+        """
+        Create a store from a ``redis://[:password@]host[:port][/db]`` URL.
+
+        Args:
+            url: The server URL
+
+        Returns:
+            RedisStateStore: The store
+        """
+        parsed = urlparse(url)
+        path = parsed.path.strip("/")
+        return cls(
+            host=parsed.hostname or "127.0.0.1",
+            port=parsed.port or DEFAULT_REDIS_PORT,
+            db=int(path) if path else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+        )
+
+    def _hash(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        data = self._command("HGET", self._hash(namespace), key)
+        return json.loads(data) if data is not None else None
+
+    def set(self, namespace: str, key: str, value: Dict[str, Any]) -> None:
+        self._command("HSET", self._hash(namespace), key, _dumps(value))
+
+    def delete(self, namespace: str, key: str) -> bool:
+        return bool(self._command("HDEL", self._hash(namespace), key))
+
+    def keys(self, namespace: str) -> List[str]:
+        return [key.decode("utf-8") for key in self._command("HKEYS", self._hash(namespace))]
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            self._disconnect()
+
+    def _command(self, *args: str) -> Any:
+        """Send a command and return its reply, reconnecting once on a broken connection."""
+        with self._lock:
+            try:
+                return self._execute(args)
+            except (OSError, EOFError):
+                self._disconnect()
+                return self._execute(args)
+
+    def _execute(self, args: tuple) -> Any:
+        if self._socket is None:
+            self._connect()
+        self._send(args)
+        return self._read_reply()
+
+    def _connect(self) -> None:
+        self._socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._socket.makefile("rb")
+        if self.password:
+            self._send(("AUTH", self.password))
+            self._read_reply()
+        if self.db:
+            self._send(("SELECT", str(self.db)))
+            self._read_reply()
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            try:
+                self._reader.close()
+                self._socket.close()
+            except OSError:
+                pass
+        self._socket = None
+        self._reader = None
+
+    def _send(self, args: tuple) -> None:
+        parts = [f"*{len(args)}\r\n".encode("ascii")]
+        for arg in args:
+            data = arg.encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        assert self._socket is not None
+        self._socket.sendall(b"".join(parts))
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise EOFError("Connection closed by state store")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            raise StateStoreError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise EOFError("Connection closed by state store")
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise StateStoreError(f"Unexpected reply from state store: {line!r}")
+
+
+class StoredMapping(MutableMapping[str, Dict[str, Any]]):
+    """A dict-like view of one namespace of a state store."""
+
+    def __init__(self, store: StateStore, namespace: str):
+        """
+        Initialize the view.
+
+        Args:
+            store: The backing store
+            namespace: The namespace the view covers
+        """
+        self.store = store
+        self.namespace = namespace
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        value = self.store.get(self.namespace, key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Dict[str, Any]) -> None:
+        self.store.set(self.namespace, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.store.delete(self.namespace, key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.store.get(self.namespace, key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.keys(self.namespace))
+
+    def __len__(self) -> int:
+        return len(self.store.keys(self.namespace))
+
+
+def create_state_store(url: str) -> StateStore:
+    """
+    Create the state store configured by a URL.
+
+    Args:
+        url: ``memory://`` (or empty) for per-process state, ``sqlite:///path/to/state.db``
+            for workers on one host, or ``redis://host:port/db`` for workers on any host
+
+    Returns:
+        StateStore: The store
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    scheme, _, location = url.partition("://")
+    if not url or scheme == MEMORY_SCHEME:
+        return MemoryStateStore()
+    if scheme == SQLITE_SCHEME:
+        path = location[1:] if location.startswith("/") else location
+        logger.info("Using SQLite state store at %s", path)
+        return SqliteStateStore(path)
+    if scheme == REDIS_SCHEME:
+        store = RedisStateStore.from_url(url)
+        logger.info("Using Redis state store at %s:%s/%s", store.host, store.port, store.db)
+        return store
+    raise ValueError(f"Unsupported state store URL scheme: {scheme}")
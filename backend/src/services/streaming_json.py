@@ -0,0 +1,110 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Incremental parsing of a JSON object that arrives in chunks, such as a streamed model response."""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalObjectParser:
+    """
+    Yields the top-level members of a JSON object as soon as each one is complete.
+
+    Only structure is tracked while scanning (nesting depth and string state), and a
+    member's text is decoded once, when it ends, so feeding a response chunk by chunk
+    costs about as much as decoding it once at the end.
+    """
+
+    def __init__(self):
+        """Initialize the parser before the opening brace."""
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._after_colon = False
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add text and collect the members it completes.
+
+        Args:
+            chunk: The next piece of the JSON text
+
+        Returns:
+            List[Tuple[str, Any]]: The completed (key, value) pairs, in order
+
+        Raises:
+            ValueError: If a completed member is not valid JSON
+        """
+        self.text += chunk
+        members: List[Tuple[str, Any]] = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            if self.done:
+                break
+            char = text[i]
+            if self._in_string:
+                self._scan_string(char, i, members)
+            elif char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._after_colon and self._value_start is None:
+                        self._value_start = i
+                    elif not self._after_colon:
+                        self._key_start = i
+            elif char in "{[":
+                if self._depth == 1 and self._after_colon and self._value_start is None:
+                    self._value_start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    self._emit(i + 1, members)
+                elif self._depth == 0:
+                    if self._value_start is not None:
+                        self._emit(i, members)
+                    self.done = True
+            elif self._depth == 1 and char == ":":
+                self._after_colon = True
+            elif self._depth == 1 and char == ",":
+                if self._value_start is not None:
+                    self._emit(i, members)
+            elif self._depth == 1 and self._after_colon and self._value_start is None and char not in _WHITESPACE:
+                # Start of a number, true, false or null
+                self._value_start = i
+        self._pos = len(text)
+        return members
+
+    def _scan_string(self, char: str, index: int, members: List[Tuple[str, Any]]) -> None:
+        """Advance through a string, ending a key or a string member at its closing quote."""
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._depth != 1:
+                return
+            if self._value_start is not None:
+                self._emit(index + 1, members)
+            elif self._key_start is not None:
+                self._key = json.loads(self.text[self._key_start : index + 1])
+                self._key_start = None
+
+    def _emit(self, end: int, members: List[Tuple[str, Any]]) -> None:
+        """Decode the member ending before ``end`` and reset for the next key."""
+        assert self._key is not None and self._value_start is not None
+        members.append((self._key, json.loads(self.text[self._value_start : end])))
+        self._key = None
+        self._value_start = None
+        self._after_colon = False
@@ -0,0 +1,230 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Compaction of conversation transcripts to a token budget before evaluation."""
+
+import logging
+import re
+from typing import List, NamedTuple, Tuple
+
+from src.config import config
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Metric names
+TRANSCRIPT_TOKENS_SAVED_METRIC = "evaluation_transcript_tokens_saved_total"
+TRANSCRIPT_TOKENS_METRIC = "evaluation_transcript_tokens"
+
+# Buckets from a short exchange to an hour-long role-play
+TRANSCRIPT_TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+# Roughly one token per word or punctuation mark, plus one per further six characters of long words
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+CHARS_PER_TOKEN = 6
+
+# Standalone hesitations (uh, um, erm, hmm) transcribed by speech recognition that carry no meaning
+_FILLER_PATTERN = re.compile(r"(?<![\w'])(?:u+h+m*|u+m+|e+r+m+|h+m+)(?![\w'])[,.]?\s*", re.IGNORECASE)
+# Words that are never doubled in real speech, so a repeat is a stutter, as in "I I think"
+_STUTTER_WORDS = ("i", "a", "an", "the", "to", "we", "he", "she", "it", "they")
+# A stutter: one of those words repeated, or any word said three or more times in a row; emphatic
+# or grammatical pairs such as "no no", "had had" or "very very" are kept
+_STUTTER_PATTERN = re.compile(rf"\b({'|'.join(_STUTTER_WORDS)})\b(?:\s+\1\b)+|\b(\w+)(?:\s+\2\b){{2,}}", re.IGNORECASE)
+_SPACES_PATTERN = re.compile(r"\s+")
+_SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s")
+
+ELLIPSIS = "…"
+OMITTED_TURNS_MARKER = "[{count} earlier turn(s) omitted]"
+
+# Words kept of an assistant turn when the transcript is over budget
+MIN_ASSISTANT_TURN_WORDS = 8
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens of a text without a tokenizer.
+
+    Args:
+        text: The text to measure
+
+    Returns:
+        int: The estimated token count
+    """
+    return sum(1 + (len(token) - 1) // CHARS_PER_TOKEN for token in _TOKEN_PATTERN.findall(text))
+
+
+class CompactedTranscript(NamedTuple):
+    """A compacted transcript and its size before and after compaction."""
+
+    text: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens removed by compaction."""
+        return self.original_tokens - self.tokens
+
+
+class TranscriptCompactor:
+    """
+    Shrinks ``role: content`` transcripts before they are sent for evaluation.
+
+    Assistant turns are context only and are not rated, so they are always cut to their
+    leading sentences. If the transcript is still over the token budget, user turns, which
+    are what gets evaluated, lose speech recognition noise: filler words, stutters and
+    fragments repeated by a fuller transcript of the same utterance. Past that, assistant
+    turns are cut further and, as a last resort, the oldest turns are left out.
+    """
+
+    def __init__(self, token_budget: int, assistant_turn_max_words: int):
+        """
+        Initialize the compactor.
+
+        Args:
+            token_budget: Size in tokens above which user turns are cleaned and old turns left out, 0 for no limit
+            assistant_turn_max_words: Words kept of an assistant turn, 0 to keep assistant turns whole
+        """
+        self.token_budget = token_budget
+        self.assistant_turn_max_words = assistant_turn_max_words
+
+    def compact(self, transcript: str) -> CompactedTranscript:
+        """
+        Compact a transcript and record the tokens saved.
+
+        Args:
+            transcript: The transcript as ``role: content`` lines
+
+        Returns:
+            CompactedTranscript: The compacted transcript with its token counts
+        """
+        original_tokens = count_tokens(transcript)
+        turns = [
+            (role, self._trim_assistant(role, content, self.assistant_turn_max_words))
+            for role, content in _parse_turns(transcript)
+        ]
+        text = _format_turns(turns)
+
+        if self._over_budget(text):
+            turns = self._clean_turns(turns)
+            text = _format_turns(turns)
+
+        if self._over_budget(text):
+            turns = [(role, self._trim_assistant(role, content, MIN_ASSISTANT_TURN_WORDS)) for role, content in turns]
+            text = self._fit_budget(turns)
+
+        result = CompactedTranscript(text, original_tokens, count_tokens(text))
+        metrics.increment(TRANSCRIPT_TOKENS_SAVED_METRIC, result.tokens_saved)
+        metrics.observe(
+            TRANSCRIPT_TOKENS_METRIC, result.original_tokens, buckets=TRANSCRIPT_TOKEN_BUCKETS, stage="original"
+        )
+        metrics.observe(TRANSCRIPT_TOKENS_METRIC, result.tokens, buckets=TRANSCRIPT_TOKEN_BUCKETS, stage="compacted")
+        logger.info(
+            "Transcript compacted from %s to %s tokens (%s saved)",
+            result.original_tokens,
+            result.tokens,
+            result.tokens_saved,
+        )
+        return result
+
+    def _over_budget(self, text: str) -> bool:
+        return self.token_budget > 0 and count_tokens(text) > self.token_budget
+
+    def _clean_turns(self, turns: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Remove filler and repetitions, and merge consecutive turns of the same speaker."""
+        cleaned: List[Tuple[str, str]] = []
+        for role, content in turns:
+            content = _clean_text(content)
+            if not content:
+                continue
+            if cleaned and cleaned[-1][0] == role:
+                previous = cleaned[-1][1]
+                cleaned[-1] = (role, _merge_fragments(previous, content))
+            else:
+                cleaned.append((role, content))
+        return cleaned
+
+    def _trim_assistant(self, role: str, content: str, max_words: int) -> str:
+        """Cut an assistant turn to its leading whole sentences within ``max_words`` words."""
+        if role != "assistant" or max_words <= 0:
+            return content
+        kept: List[str] = []
+        for sentence in _SENTENCE_END_PATTERN.split(content):
+            words = sentence.split()
+            if len(kept) + len(words) > max_words:
+                # Always keep the start of the first sentence
+                if not kept:
+                    kept = words[:max_words]
+                break
+            kept.extend(words)
+        trimmed = " ".join(kept)
+        if trimmed == content:
+            return content
+        return f"{trimmed} {ELLIPSIS}" if trimmed.endswith((".", "!", "?")) else f"{trimmed}{ELLIPSIS}"
+
+    def _fit_budget(self, turns: List[Tuple[str, str]]) -> str:
+        """Leave out the oldest turns after the first one until the transcript fits the budget."""
+        tokens = count_tokens(_format_turns(turns))
+        marker_tokens = count_tokens(OMITTED_TURNS_MARKER.format(count=len(turns)))
+        omitted = 0
+        # The opening turn sets the scene, so turns are removed from just after it
+        while tokens + (marker_tokens if omitted else 0) > self.token_budget and len(turns) > 2:
+            role, content = turns.pop(1)
+            tokens -= count_tokens(f"{role}: {content}")
+            omitted += 1
+        if omitted:
+            logger.warning("Transcript over the %s token budget, omitted %s turn(s)", self.token_budget, omitted)
+            turns.insert(1, ("", OMITTED_TURNS_MARKER.format(count=omitted)))
+        return _format_turns(turns)
+
+
+def _parse_turns(transcript: str) -> List[Tuple[str, str]]:
+    """Split a transcript into (role, content) turns; lines without a role continue the previous turn."""
+    turns: List[Tuple[str, str]] = []
+    for line in transcript.splitlines():
+        role, separator, content = line.partition(":")
+        if separator and role.strip() in ("user", "assistant"):
+            turns.append((role.strip(), content.strip()))
+        elif turns and line.strip():
+            turns[-1] = (turns[-1][0], f"{turns[-1][1]} {line.strip()}")
+        elif line.strip():
+            turns.append(("user", line.strip()))
+    return turns
+
+
+def _format_turns(turns: List[Tuple[str, str]]) -> str:
+    return "\n".join(f"{role}: {content}" if role else content for role, content in turns)
+
+
+def _clean_text(text: str) -> str:
+    """Remove filler words and stuttered repetitions."""
+    text = _FILLER_PATTERN.sub("", text)
+    text = _STUTTER_PATTERN.sub(lambda match: match.group(1) or match.group(2), text)
+    return _SPACES_PATTERN.sub(" ", text).strip(" ,")
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def _is_fragment(fragment: List[str], words: List[str]) -> bool:
+    """Whether ``fragment`` is a whole-word prefix or suffix of ``words``."""
+    return len(fragment) <= len(words) and fragment in (words[: len(fragment)], words[len(words) - len(fragment) :])
+
+
+def _merge_fragments(previous: str, current: str) -> str:
+    """Join two consecutive turns of one speaker, dropping a fragment the other one starts or ends with."""
+    previous_words, current_words = _words(previous), _words(current)
+    if _is_fragment(current_words, previous_words):
+        return previous
+    if _is_fragment(previous_words, current_words):
+        return current
+    return f"{previous} {current}"
+
+
+transcript_compactor = TranscriptCompactor(
+    token_budget=config["evaluation_token_budget"],
+    assistant_turn_max_words=config["evaluation_assistant_turn_max_words"],
+)
@@ -0,0 +1,174 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Client-side WebSocket transports for the voice proxy."""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol, Union
+
+import simple_websocket.ws  # pyright: ignore[reportMissingTypeStubs]
+import websockets
+import websockets.asyncio.server
+
+from src.services.executors import WEBSOCKET_RECEIVE_EXECUTOR, WEBSOCKET_SEND_EXECUTOR, executors
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[str, bytes]
+
+WS_CLOSE_NORMAL = 1000
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class ClientTransport(Protocol):
+    """Async interface the voice proxy uses to talk to the browser."""
+
+    async def receive(self) -> Optional[Frame]:
+        """Receive the next frame, or None once the client has disconnected."""
+
+    async def send(self, message: Frame) -> None:
+        """Send a frame to the client."""
+
+    async def close(self, code: int = WS_CLOSE_NORMAL) -> None:
+        """Close the client connection with a WebSocket close code."""
+
+
+class WebSocketsClientTransport:
+    """Native asyncio transport backed by a ``websockets`` server connection."""
+
+    def __init__(self, connection: websockets.asyncio.server.ServerConnection):
+        """
+        Initialize the transport.
+
+        Args:
+            connection: The accepted ``websockets`` server connection
+        """
+        self.connection = connection
+
+    async def receive(self) -> Optional[Frame]:
+        """Receive the next frame, or None once the client has disconnected."""
+        try:
+            return await self.connection.recv()
+        except websockets.ConnectionClosed:
+            return None
+
+    async def send(self, message: Frame) -> None:
+        """Send a frame to the client."""
+        await self.connection.send(message)
+
+    async def close(self, code: int = WS_CLOSE_NORMAL) -> None:
+        """Close the client connection."""
+        await self.connection.close(code)
+
+
+class BlockingClientTransport:
+    """
+    Adapter for blocking WebSocket servers such as ``simple_websocket``.
+
+    Receives run in the ``websocket_receive`` executor and sends and closes in the
+    ``websocket_send`` executor, so this transport is only meant for the threaded Flask
+    serving mode. A pending receive occupies a receive worker for the whole session, so
+    the receive pool size is also the session limit; sends never wait behind receives.
+    """
+
+    def __init__(self, ws: simple_websocket.ws.Server):
+        """
+        Initialize the transport.
+
+        Args:
+            ws: The blocking WebSocket connection
+        """
+        self.ws = ws
+
+    async def receive(self) -> Optional[Frame]:
+        """Receive the next frame, or None once the client has disconnected."""
+        try:
+            return await executors.run(
+                WEBSOCKET_RECEIVE_EXECUTOR,
+                self.ws.receive,  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
+            )
+        except simple_websocket.ws.ConnectionClosed:  # pyright: ignore[reportUnknownMemberType]
+            return None
+
+    async def send(self, message: Frame) -> None:
+        """Send a frame to the client."""
+        await executors.run(
+            WEBSOCKET_SEND_EXECUTOR,
+            self.ws.send,  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
+            message,
+        )
+
+    async def close(self, code: int = WS_CLOSE_NORMAL) -> None:
+        """Close the client connection."""
+        try:
+            await executors.run(
+                WEBSOCKET_SEND_EXECUTOR,
+                self.ws.close,  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
+                code,
+            )
+        except Exception:
+            logger.debug("Client connection already closed")
+
+
+class AsgiClientTransport:
+    """Native asyncio transport backed by an ASGI ``websocket`` scope."""
+
+    def __init__(
+        self,
+        receive: Callable[[], Awaitable[Dict[str, Any]]],
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            receive: The ASGI receive callable
+            send: The ASGI send callable
+        """
+        self._receive = receive
+        self._send = send
+        self.closed = False
+
+    async def accept(self) -> bool:
+        """
+        Complete the WebSocket handshake.
+
+        Returns:
+            bool: False if the client went away before the handshake
+        """
+        event = await self._receive()
+        if event["type"] != "websocket.connect":
+            self.closed = True
+            return False
+        await self._send({"type": "websocket.accept"})
+        return True
+
+    async def receive(self) -> Optional[Frame]:
+        """Receive the next frame, or None once the client has disconnected."""
+        while not self.closed:
+            event = await self._receive()
+            if event["type"] == "websocket.disconnect":
+                self.closed = True
+            elif event["type"] == "websocket.receive":
+                text = event.get("text")
+                return text if text is not None else event.get("bytes")
+        return None
+
+    async def send(self, message: Frame) -> None:
+        """Send a frame to the client."""
+        if isinstance(message, str):
+            await self._send({"type": "websocket.send", "text": message})
+        else:
+            await self._send({"type": "websocket.send", "bytes": message})
+
+    async def close(self, code: int = WS_CLOSE_NORMAL) -> None:
+        """Close the client connection."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self._send({"type": "websocket.close", "code": code})
+        except Exception:
+            logger.debug("Client connection already closed")
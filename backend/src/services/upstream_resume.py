@@ -0,0 +1,64 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Conversation history used to resume a voice session on a new upstream connection."""
+
+import json
+from typing import Any, Dict, List
+
+from src.services.session_capture import transcript_message
+
+# Event types
+CONVERSATION_ITEM_CREATE_TYPE = "conversation.item.create"
+UPSTREAM_RECONNECTING_TYPE = "proxy.upstream.reconnecting"
+UPSTREAM_RECONNECTED_TYPE = "proxy.upstream.reconnected"
+
+# Metric names
+UPSTREAM_RECONNECTS_METRIC = "voice_proxy_upstream_reconnects_total"
+UPSTREAM_RECONNECT_SECONDS_METRIC = "voice_proxy_upstream_reconnect_seconds"
+
+# Content part type per role in a replayed conversation item
+_CONTENT_TYPES = {"user": "input_text", "assistant": "text"}
+
+
+class ConversationHistory:
+    """
+    The completed turns of one voice session.
+
+    A new upstream connection knows nothing about the conversation so far. Replaying the
+    user and assistant transcripts as text conversation items lets the model continue the
+    role-play where the dropped connection left off.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self.messages: List[Dict[str, str]] = []
+
+    def add_transcript(self, event: Dict[str, Any]) -> None:
+        """Record a completed user or assistant transcript event."""
+        message = transcript_message(event)
+        if message is not None:
+            self.messages.append(message)
+
+    def replay_events(self) -> List[str]:
+        """
+        Build the events that recreate the conversation on a new upstream connection.
+
+        Returns:
+            List[str]: Serialized ``conversation.item.create`` events in conversation order
+        """
+        return [
+            json.dumps(
+                {
+                    "type": CONVERSATION_ITEM_CREATE_TYPE,
+                    "item": {
+                        "type": "message",
+                        "role": message["role"],
+                        "content": [{"type": _CONTENT_TYPES[message["role"]], "text": message["content"]}],
+                    },
+                }
+            )
+            for message in self.messages
+        ]
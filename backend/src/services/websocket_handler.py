@@ -6,17 +6,46 @@
 """WebSocket handling for voice proxy connections."""
 
 import asyncio
+import base64
 import json
 import logging
+import time
 import uuid
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-import simple_websocket.ws  # pyright: ignore[reportMissingTypeStubs]
 import websockets
 import websockets.asyncio.client
 
-from src.config import config
+from src.config import DEFAULT_UPSTREAM_RECONNECT_ATTEMPTS, DEFAULT_UPSTREAM_RECONNECT_BACKOFF_SECONDS, config
+from src.services.audio_coalescer import AudioCoalescer
+from src.services.audio_resampler import SOURCE_SAMPLE_RATE, ResponseAudioDownsampler
+from src.services.backpressure import (
+    INBOUND,
+    INPUT_AUDIO_APPEND_TYPE,
+    OUTBOUND,
+    RESPONSE_AUDIO_DELTA_TYPE,
+    ForwardingQueue,
+    audio_append_frame,
+)
+from src.services.connection_pool import UpstreamConnectionPool, UpstreamKey
+from src.services.event_classifier import EventClassifier, classify_event_type
+from src.services.event_filter import EventFilter
+from src.services.executors import STATE_STORE_EXECUTOR, executors
+from src.services.latency import SessionTimeline
 from src.services.managers import AgentManager
+from src.services.metrics import metrics
+from src.services.session_capture import TRANSCRIPT_TYPES, SessionCapture, SessionCaptureStore, extract_audio
+from src.services.session_options import SessionOptions, parse_session_options
+from src.services.session_payload import CompiledSession, SessionPayloadCache
+from src.services.session_registry import SessionRegistry
+from src.services.transports import WS_CLOSE_TRY_AGAIN_LATER, ClientTransport, Frame
+from src.services.upstream_resume import (
+    UPSTREAM_RECONNECT_SECONDS_METRIC,
+    UPSTREAM_RECONNECTED_TYPE,
+    UPSTREAM_RECONNECTING_TYPE,
+    UPSTREAM_RECONNECTS_METRIC,
+    ConversationHistory,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -37,93 +66,198 @@ DEFAULT_VOICE_TYPE = "azure-standard"
 
 # Message types
 SESSION_UPDATE_TYPE = "session.update"
+SESSION_UPDATED_TYPE = "session.updated"
 PROXY_CONNECTED_TYPE = "proxy.connected"
 ERROR_TYPE = "error"
 
 # Log message truncation length
 LOG_MESSAGE_MAX_LENGTH = 100
 
+# Default bounded queue depths per forwarding direction
+DEFAULT_INBOUND_QUEUE_DEPTH = 50
+DEFAULT_OUTBOUND_QUEUE_DEPTH = 100
+
+# Input audio coalescing (0 ms disables it); 19200 bytes is 400 ms of 24 kHz PCM16
+DEFAULT_AUDIO_COALESCE_MS = 0
+DEFAULT_AUDIO_COALESCE_MAX_BYTES = 19200
+
+# Seconds to wait for Azure to acknowledge the base session config of a pooled connection
+POOL_WARMUP_TIMEOUT_SECONDS = 10.0
+
 
 class VoiceProxyHandler:
     """Handles WebSocket proxy connections between client and Azure Voice API."""
 
-    def __init__(self, agent_manager: AgentManager):
+    def __init__(
+        self,
+        agent_manager: AgentManager,
+        upstream_pool_size: int = 0,
+        upstream_pool_max_idle_seconds: float = 60.0,
+        inbound_queue_depth: int = DEFAULT_INBOUND_QUEUE_DEPTH,
+        outbound_queue_depth: int = DEFAULT_OUTBOUND_QUEUE_DEPTH,
+        audio_coalesce_ms: int = DEFAULT_AUDIO_COALESCE_MS,
+        audio_coalesce_max_bytes: int = DEFAULT_AUDIO_COALESCE_MAX_BYTES,
+        event_filter: Optional[EventFilter] = None,
+        capture_store: Optional[SessionCaptureStore] = None,
+        session_registry: Optional[SessionRegistry] = None,
+        upstream_reconnect_attempts: int = DEFAULT_UPSTREAM_RECONNECT_ATTEMPTS,
+        upstream_reconnect_backoff_seconds: float = DEFAULT_UPSTREAM_RECONNECT_BACKOFF_SECONDS,
+    ):
         """
         Initialize the voice proxy handler.
 
         Args:
             agent_manager: Agent manager instance
+            upstream_pool_size: Warm upstream connections to keep per key (0 disables pooling)
+            upstream_pool_max_idle_seconds: Maximum idle time of a pooled connection
+            inbound_queue_depth: Maximum queued client-to-Azure messages per session
+            outbound_queue_depth: Maximum queued Azure-to-client messages per session
+            audio_coalesce_ms: Window for merging consecutive input audio appends (0 disables)
+            audio_coalesce_max_bytes: Audio size at which a coalesced append is sent immediately
+            event_filter: Filter for upstream events forwarded to the client (forwards all if None)
+            capture_store: Store for captured user audio and transcripts (no capture if None)
+            session_registry: Admission control for concurrent sessions (no limit if None)
+            upstream_reconnect_attempts: Reconnect attempts after the Azure connection fails mid-session
+            upstream_reconnect_backoff_seconds: Delay before the second attempt, doubled for each further one
         """
         self.agent_manager = agent_manager
+        self.inbound_queue_depth = inbound_queue_depth
+        self.outbound_queue_depth = outbound_queue_depth
+        self.audio_coalesce_ms = audio_coalesce_ms
+        self.audio_coalesce_max_bytes = audio_coalesce_max_bytes
+        self.event_filter = event_filter or EventFilter()
+        self.capture_store = capture_store
+        self.session_registry = session_registry or SessionRegistry()
+        self.upstream_reconnect_attempts = upstream_reconnect_attempts
+        self.upstream_reconnect_backoff_seconds = upstream_reconnect_backoff_seconds
+        self.event_classifier = EventClassifier(TRANSCRIPT_TYPES)
+        self.session_payloads = SessionPayloadCache(self._compile_session)
+        agent_manager.add_listener(self._on_agent_changed)
+        self.connection_pool: Optional[UpstreamConnectionPool] = None
+        if upstream_pool_size > 0:
+            self.connection_pool = UpstreamConnectionPool(
+                self._open_warm_connection,
+                size_per_key=upstream_pool_size,
+                max_idle_seconds=upstream_pool_max_idle_seconds,
+            )
+
+    async def start(self) -> None:
+        """Start background services that need the long-lived server event loop."""
+        if self.connection_pool:
+            await self.connection_pool.start([self._build_upstream_key(None, None)])
+
+    async def stop(self) -> None:
+        """Stop background services."""
+        if self.connection_pool:
+            await self.connection_pool.stop()
 
-    async def handle_connection(self, client_ws: simple_websocket.ws.Server) -> None:
+    async def handle_connection(self, client_ws: ClientTransport) -> None:
         """
         Handle a WebSocket connection from a client.
 
         Args:
-            client_ws: The client WebSocket connection
+            client_ws: The async transport for the client WebSocket connection
         """
 
         azure_ws = None
-        current_agent_id = None
+        session_id = uuid.uuid4().hex
+
+        rejection = self.session_registry.try_admit(session_id)
+        if rejection:
+            await self._reject_connection(client_ws, rejection)
+            return
+
+        timeline = SessionTimeline(session_id)
 
         try:
-            current_agent_id = await self._get_agent_id_from_client(client_ws)
+            options = await self._get_session_options(client_ws)
+            timeline.agent_id = options.agent_id
 
-            azure_ws = await self._connect_to_azure(current_agent_id)
+            timeline.mark_upstream_connecting()
+            azure_ws = await self._connect_to_azure(options.agent_id)
             if not azure_ws:
                 await self._send_error(client_ws, "Failed to connect to Azure Voice API")
                 return
-
-            await self._send_message(
-                client_ws,
-                {"type": "proxy.connected", "message": "Connected to Azure Voice API"},
-            )
-
-            await self._handle_message_forwarding(client_ws, azure_ws)
+            timeline.mark_upstream_connected()
+
+            capture = await self._start_capture(session_id, options.agent_id)
+            connected: Dict[str, Any] = {
+                "type": "proxy.connected",
+                "message": "Connected to Azure Voice API",
+                "binary_audio": options.binary_audio,
+                "output_sample_rate": options.output_sample_rate,
+            }
+            if capture:
+                # Only a captured session can be analyzed by its id
+                connected["session_id"] = session_id
+            await self._send_message(client_ws, connected)
+
+            await self._handle_message_forwarding(client_ws, azure_ws, session_id, timeline, options, capture)
 
         except Exception as e:
             logger.error("Proxy error: %s", e)
             await self._send_error(client_ws, str(e))
 
         finally:
+            self.session_registry.release(session_id)
+            timeline.log_summary()
+            if self.capture_store:
+                self.capture_store.end(session_id)
             if azure_ws:
                 await azure_ws.close()
 
-    async def _get_agent_id_from_client(self, client_ws: simple_websocket.ws.Server) -> Optional[str]:
-        """Get agent ID from initial client message."""
+    async def _reject_connection(self, client_ws: ClientTransport, reason: str) -> None:
+        """Tell the client to retry later and close the connection."""
+        logger.warning("Rejecting voice session: %s", reason)
+        await self._send_message(
+            client_ws,
+            {
+                "type": "error",
+                "error": {
+                    "message": "Server is busy, please try again shortly",
+                    "code": f"session_rejected_{reason}",
+                    "retry_after_ms": int(self.session_registry.retry_after_seconds * 1000),
+                },
+            },
+        )
+        try:
+            await client_ws.close(WS_CLOSE_TRY_AGAIN_LATER)
+        except Exception:
+            logger.debug("Client connection already closed")
+
+    async def _get_session_options(self, client_ws: ClientTransport) -> SessionOptions:
+        """Get the agent ID and proxy options from the initial client message."""
 
         try:
-            first_message: str | None = await asyncio.get_event_loop().run_in_executor(
-                None,
-                client_ws.receive,  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
-            )
-            if first_message:
-                msg = json.loads(first_message)
-                if msg.get("type") == "session.update":
-                    return msg.get("session", {}).get("agent_id")
+            return parse_session_options(await client_ws.receive())
         except Exception as e:
-            logger.error("Error getting agent ID: %s", e)
-            return None
+            logger.error("Error getting session options: %s", e)
+            return SessionOptions()
 
     async def _connect_to_azure(self, agent_id: Optional[str]) -> Optional[websockets.asyncio.client.ClientConnection]:
         """Connect to Azure Voice API with appropriate configuration."""
         try:
-            agent_config = self.agent_manager.get_agent(agent_id) if agent_id else None
+            agent_config = await self._get_agent(agent_id)
 
-            azure_url = self._build_azure_url(agent_id, agent_config)
+            session = self.session_payloads.get(agent_id, agent_config)
 
-            api_key = config.get("azure_openai_api_key")
-            if not api_key:
-                logger.error("No API key found in configuration (azure_openai_api_key)")
-                return None
+            if self.connection_pool:
+                azure_ws = await self.connection_pool.acquire(session.upstream_key)
+                if azure_ws:
+                    logger.info("Using warm Azure Voice API connection with agent: %s", agent_id or "default")
+                    await azure_ws.send(session.agent_update)
+                    return azure_ws
+
+            azure_url = session.url()
 
-            headers = {"api-key": api_key}
+            headers = self._build_upstream_headers()
+            if headers is None:
+                return None
 
             azure_ws = await websockets.connect(azure_url, additional_headers=headers)
             logger.info("Connected to Azure Voice API with agent: %s", agent_id or "default")
 
-            await self._send_initial_config(azure_ws, agent_config)
+            await azure_ws.send(session.session_update)
 
             return azure_ws
 
@@ -131,49 +265,100 @@ class VoiceProxyHandler:
             logger.error("Failed to connect to Azure: %s", e)
             return None
 
-    def _build_azure_url(self, agent_id: Optional[str], agent_config: Optional[Dict[str, Any]]) -> str:
-        """Build the Azure WebSocket URL."""
-        base_url = self._build_base_azure_url()
+    async def _open_warm_connection(self, key: UpstreamKey) -> Optional[websockets.asyncio.client.ClientConnection]:
+        """Open a pooled connection and apply the shared voice and avatar session config."""
+        headers = self._build_upstream_headers()
+        if headers is None:
+            return None
+
+        azure_url = f"{self._build_base_azure_url()}&{key.target}"
+        azure_ws = await websockets.connect(azure_url, additional_headers=headers)
+        try:
+            await azure_ws.send(json.dumps(self._build_session_config()))
+            await asyncio.wait_for(self._wait_for_session_updated(azure_ws), POOL_WARMUP_TIMEOUT_SECONDS)
+            return azure_ws
+        except Exception:
+            await azure_ws.close()
+            raise
+
+    async def _wait_for_session_updated(self, azure_ws: websockets.asyncio.client.ClientConnection) -> None:
+        """Consume events until Azure acknowledges a session update."""
+        async for message in azure_ws:
+            if json.loads(message).get("type") == SESSION_UPDATED_TYPE:
+                return
 
+    def _on_agent_changed(self, agent_id: str, agent_config: Optional[Dict[str, Any]]) -> None:
+        """Compile the session of a created or updated agent, or drop that of a deleted one."""
+        if agent_config is None:
+            self.session_payloads.invalidate(agent_id)
+        else:
+            self.session_payloads.compile(agent_id, agent_config)
+
+    def _compile_session(self, agent_id: Optional[str], agent_config: Optional[Dict[str, Any]]) -> CompiledSession:
+        """Build and serialize everything about an upstream session that is the same for every connection."""
+        session_update = self._build_session_config()
+        if agent_config and not agent_config.get("is_azure_agent"):
+            self._add_local_agent_config(session_update, agent_config)
+        url_prefix, _, url_suffix = self._build_azure_url_template(agent_id, agent_config).partition("{}")
+        return CompiledSession(
+            source=agent_config,
+            url_prefix=url_prefix,
+            url_suffix=url_suffix,
+            session_update=json.dumps(session_update),
+            agent_update=json.dumps(self._build_agent_session_update(agent_config)),
+            upstream_key=self._build_upstream_key(agent_id, agent_config),
+        )
+
+    def _build_upstream_headers(self) -> Optional[Dict[str, str]]:
+        """Build the authentication headers for the Azure connection."""
+        api_key = config.get("azure_openai_api_key")
+        if not api_key and config["voice_live_url"]:
+            return {}
+        if not api_key:
+            logger.error("No API key found in configuration (azure_openai_api_key)")
+            return None
+        return {"api-key": api_key}
+
+    def _build_upstream_key(self, agent_id: Optional[str], agent_config: Optional[Dict[str, Any]]) -> UpstreamKey:
+        """Build the pool key of connections that can serve this agent."""
+        return UpstreamKey(
+            target=self._build_url_target(agent_id, agent_config),
+            voice=f"{config['azure_voice_name']}|{config['azure_voice_type']}",
+            avatar=f"{DEFAULT_AVATAR_CHARACTER}|{DEFAULT_AVATAR_STYLE}",
+        )
+
+    def _build_azure_url_template(self, agent_id: Optional[str], agent_config: Optional[Dict[str, Any]]) -> str:
+        """Build the Azure WebSocket URL with a ``{}`` placeholder for the client request id."""
+        return f"{self._build_base_azure_url('{}')}&{self._build_url_target(agent_id, agent_config)}"
+
+    def _build_url_target(self, agent_id: Optional[str], agent_config: Optional[Dict[str, Any]]) -> str:
+        """Build the query parameters selecting the model or agent."""
         if agent_config:
-            return self._build_agent_specific_url(base_url, agent_id, agent_config)
+            return self._build_agent_specific_target(agent_id, agent_config)
         if config["agent_id"]:
-            return f"{base_url}&agent-id={config['agent_id']}"
+            return f"agent-id={config['agent_id']}"
         model_name = config["model_deployment_name"]
-        return f"{base_url}&model={model_name}"
+        return f"model={model_name}"
 
-    def _build_base_azure_url(self) -> str:
-        """Build the base Azure WebSocket URL."""
+    def _build_base_azure_url(self, client_request_id: Optional[str] = None) -> str:
+        """Build the base Azure WebSocket URL, or the configured override such as a local stand-in."""
         resource_name = config["azure_ai_resource_name"]
+        endpoint = (
+            config["voice_live_url"]
+            or f"wss://{resource_name}.{AZURE_COGNITIVE_SERVICES_DOMAIN}/{VOICE_AGENT_ENDPOINT}"
+        )
 
-        client_request_id = uuid.uuid4()
+        client_request_id = client_request_id or str(uuid.uuid4())
 
-        return (
-            f"wss://{resource_name}.{AZURE_COGNITIVE_SERVICES_DOMAIN}/"
-            f"{VOICE_AGENT_ENDPOINT}?api-version={AZURE_VOICE_API_VERSION}"
-            f"&x-ms-client-request-id={client_request_id}"
-        )
+        return f"{endpoint}?api-version={AZURE_VOICE_API_VERSION}&x-ms-client-request-id={client_request_id}"
 
-    def _build_agent_specific_url(self, base_url: str, agent_id: Optional[str], agent_config: Dict[str, Any]) -> str:
-        """Build URL for specific agent configuration."""
+    def _build_agent_specific_target(self, agent_id: Optional[str], agent_config: Dict[str, Any]) -> str:
+        """Build URL query parameters for specific agent configuration."""
         project_name = config["azure_ai_project_name"]
         if agent_config.get("is_azure_agent"):
-            return f"{base_url}&agent-id={agent_id}" f"&agent-project-name={project_name}"
+            return f"agent-id={agent_id}&agent-project-name={project_name}"
         model_name = agent_config.get("model", config["model_deployment_name"])
-        return f"{base_url}&model={model_name}"
-
-    async def _send_initial_config(
-        self,
-        azure_ws: websockets.asyncio.client.ClientConnection,
-        agent_config: Optional[Dict[str, Any]],
-    ) -> None:
-        """Send initial configuration to Azure."""
-        config_message = self._build_session_config()
-
-        if agent_config and not agent_config.get("is_azure_agent"):
-            self._add_local_agent_config(config_message, agent_config)
-
-        await azure_ws.send(json.dumps(config_message))
+        return f"model={model_name}"
 
     def _build_session_config(self) -> Dict[str, Any]:
         """Build the base session configuration."""
@@ -195,6 +380,15 @@ class VoiceProxyHandler:
             },
         }
 
+    def _build_agent_session_update(self, agent_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the agent-specific session update sent on a warm connection."""
+        config_message: Dict[str, Any] = {"type": SESSION_UPDATE_TYPE, "session": {}}
+
+        if agent_config and not agent_config.get("is_azure_agent"):
+            self._add_local_agent_config(config_message, agent_config)
+
+        return config_message
+
     def _add_local_agent_config(self, config_message: Dict[str, Any], agent_config: Dict[str, Any]) -> None:
         """Add local agent configuration to session config."""
         session = config_message["session"]
@@ -203,69 +397,262 @@ class VoiceProxyHandler:
         session["temperature"] = agent_config["temperature"]
         session["max_response_output_tokens"] = agent_config["max_tokens"]
 
+    async def _get_agent(self, agent_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Look up an agent off the event loop, since a shared state store does blocking I/O."""
+        if not agent_id:
+            return None
+        return await executors.run(STATE_STORE_EXECUTOR, self.agent_manager.get_agent, agent_id)
+
+    async def _start_capture(self, session_id: str, agent_id: Optional[str]) -> Optional[SessionCapture]:
+        """Start capturing a session, tagged with the scenario of its agent."""
+        if not self.capture_store:
+            return None
+        agent_config = await self._get_agent(agent_id)
+        scenario_id = agent_config.get("scenario_id") if agent_config else None
+        return self.capture_store.start(session_id, scenario_id)
+
     async def _handle_message_forwarding(
         self,
-        client_ws: simple_websocket.ws.Server,
+        client_ws: ClientTransport,
         azure_ws: websockets.asyncio.client.ClientConnection,
+        session_id: str,
+        timeline: Optional[SessionTimeline] = None,
+        options: Optional[SessionOptions] = None,
+        capture: Optional[SessionCapture] = None,
     ) -> None:
-        """Handle bidirectional message forwarding."""
-        tasks = [
-            asyncio.create_task(self._forward_client_to_azure(client_ws, azure_ws)),
-            asyncio.create_task(self._forward_azure_to_client(azure_ws, client_ws)),
+        """
+        Handle bidirectional message forwarding through bounded per-direction queues.
+
+        The client side of the session lives for the whole conversation. If the Azure side
+        fails while the client is still connected and reconnects are enabled, a new upstream
+        connection is opened, the conversation so far is replayed, and forwarding resumes.
+        Client audio received in the meantime, and frames whose send to the failed connection
+        was interrupted, wait in the inbound queue.
+        """
+        options = options or SessionOptions()
+        history = ConversationHistory() if self.upstream_reconnect_attempts > 0 else None
+        inbound = ForwardingQueue(
+            self.inbound_queue_depth,
+            INBOUND,
+            session_id,
+            merge_types=frozenset({INPUT_AUDIO_APPEND_TYPE}),
+            redeliver=history is not None,
+        )
+        outbound = ForwardingQueue(
+            self.outbound_queue_depth, OUTBOUND, session_id, drop_types=frozenset({RESPONSE_AUDIO_DELTA_TYPE})
+        )
+        downsampler = None
+        if options.output_sample_rate != SOURCE_SAMPLE_RATE:
+            downsampler = ResponseAudioDownsampler(session_id, options.output_sample_rate)
+        coalescer = None
+        if self.audio_coalesce_ms > 0:
+            coalescer = AudioCoalescer(self.audio_coalesce_ms / 1000, self.audio_coalesce_max_bytes, session_id)
+        client_tasks = [
+            asyncio.create_task(self._forward_client_to_azure(client_ws, inbound, capture, options.binary_audio)),
+            asyncio.create_task(
+                self._drain_queue(outbound, timeline.track_client_send(client_ws.send) if timeline else client_ws.send)
+            ),
         ]
+        upstream_tasks: List[asyncio.Task[None]] = []
+        reconnected = False
+
+        try:
+            while True:
+                upstream_tasks = [
+                    asyncio.create_task(self._drain_queue(inbound, azure_ws.send, coalescer)),
+                    asyncio.create_task(
+                        self._forward_azure_to_client(azure_ws, outbound, capture, timeline, history, downsampler)
+                    ),
+                ]
+                done, _ = await asyncio.wait(client_tasks + upstream_tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in upstream_tasks:
+                    task.cancel()
+                if history is None or self.session_registry.draining or any(task in done for task in client_tasks):
+                    break
+                await asyncio.gather(*upstream_tasks, return_exceptions=True)
+                # Frames taken for the failed connection but not sent go to the new one first
+                restored = inbound.restore()
+                if restored:
+                    logger.info("Session %s kept %d unsent frame(s) for the new connection", session_id, restored)
+
+                logger.warning("Azure connection of session %s failed, reconnecting", session_id)
+                await self._close_upstream(azure_ws)
+                new_ws = await self._reconnect_upstream(client_ws, options.agent_id, history, session_id)
+                if new_ws is None:
+                    await self._send_error(client_ws, "Lost connection to Azure Voice API")
+                    break
+                azure_ws = new_ws
+                reconnected = True
+        finally:
+            for task in client_tasks + upstream_tasks:
+                task.cancel()
+            inbound.close()
+            outbound.close()
+            if coalescer:
+                coalescer.close()
+            if downsampler:
+                downsampler.log_summary()
+            if reconnected:
+                await self._close_upstream(azure_ws)
+
+    async def _reconnect_upstream(
+        self,
+        client_ws: ClientTransport,
+        agent_id: Optional[str],
+        history: ConversationHistory,
+        session_id: str,
+    ) -> Optional[websockets.asyncio.client.ClientConnection]:
+        """
+        Open a new Azure connection for a session and replay its conversation.
+
+        Args:
+            client_ws: The client transport, told about the reconnect
+            agent_id: The session's agent ID
+            history: The conversation so far
+            session_id: The proxy session id
+
+        Returns:
+            Optional[ClientConnection]: The resumed connection, or None if every attempt failed
+        """
+        await self._send_message(client_ws, {"type": UPSTREAM_RECONNECTING_TYPE, "session_id": session_id})
+        started = time.monotonic()
+        replay = history.replay_events()
+
+        for attempt in range(self.upstream_reconnect_attempts):
+            if attempt:
+                await asyncio.sleep(self.upstream_reconnect_backoff_seconds * 2 ** (attempt - 1))
+            azure_ws = await self._connect_to_azure(agent_id)
+            if not azure_ws:
+                continue
+            try:
+                for event in replay:
+                    await azure_ws.send(event)
+            except Exception as e:
+                logger.warning("Replaying conversation of session %s failed: %s", session_id, e)
+                await self._close_upstream(azure_ws)
+                continue
+
+            elapsed = time.monotonic() - started
+            metrics.increment(UPSTREAM_RECONNECTS_METRIC, result="success")
+            metrics.observe(UPSTREAM_RECONNECT_SECONDS_METRIC, elapsed)
+            logger.info("Session %s resumed after %.2fs with %d replayed item(s)", session_id, elapsed, len(replay))
+            await self._send_message(
+                client_ws,
+                {"type": UPSTREAM_RECONNECTED_TYPE, "session_id": session_id, "replayed_items": len(replay)},
+            )
+            return azure_ws
 
-        _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        metrics.increment(UPSTREAM_RECONNECTS_METRIC, result="failure")
+        logger.error(
+            "Session %s could not reconnect to Azure after %d attempt(s)", session_id, self.upstream_reconnect_attempts
+        )
+        return None
 
-        for task in pending:
-            task.cancel()
+    async def _close_upstream(self, azure_ws: websockets.asyncio.client.ClientConnection) -> None:
+        """Close an upstream connection, ignoring errors from one that already failed."""
+        try:
+            await azure_ws.close()
+        except Exception:
+            logger.debug("Azure connection already closed")
 
     async def _forward_client_to_azure(
         self,
-        client_ws: simple_websocket.ws.Server,
-        azure_ws: websockets.asyncio.client.ClientConnection,
+        client_ws: ClientTransport,
+        inbound: ForwardingQueue,
+        capture: Optional[SessionCapture] = None,
+        binary_audio: bool = False,
     ) -> None:
-        """Forward messages from client to Azure."""
+        """Read messages from the client into the inbound queue."""
         try:
             while True:
-                message: Optional[Any] = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    client_ws.receive,  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
-                )
+                message = await client_ws.receive()
                 if message is None:
                     break
                 logger.debug("Client->Azure: %s", message[:LOG_MESSAGE_MAX_LENGTH])
-                await azure_ws.send(message)
+                await inbound.put(self._prepare_client_frame(message, capture, binary_audio))
         except Exception:
             logger.debug("Client connection closed during forwarding")
 
+    def _prepare_client_frame(
+        self, message: Frame, capture: Optional[SessionCapture] = None, binary_audio: bool = False
+    ) -> Frame:
+        """
+        Turn a client frame into the frame sent upstream, capturing its audio.
+
+        In binary audio mode a binary frame is raw PCM16 microphone audio, which is wrapped
+        into an ``input_audio_buffer.append`` event here instead of in the browser.
+
+        Args:
+            message: The frame received from the client
+            capture: The session capture, if enabled
+            binary_audio: Whether the client negotiated binary audio frames
+
+        Returns:
+            Frame: The frame to queue for Azure
+        """
+        if binary_audio and isinstance(message, bytes):
+            if capture:
+                capture.add_audio(message)
+            return audio_append_frame(base64.b64encode(message).decode("ascii"))
+        if capture and classify_event_type(message) == INPUT_AUDIO_APPEND_TYPE:
+            audio = extract_audio(message)
+            if audio:
+                capture.add_audio(audio)
+        return message
+
     async def _forward_azure_to_client(
         self,
         azure_ws: websockets.asyncio.client.ClientConnection,
-        client_ws: simple_websocket.ws.Server,
+        outbound: ForwardingQueue,
+        capture: Optional[SessionCapture] = None,
+        timeline: Optional[SessionTimeline] = None,
+        history: Optional[ConversationHistory] = None,
+        downsampler: Optional[ResponseAudioDownsampler] = None,
     ) -> None:
-        """Forward messages from Azure to client."""
+        """Read messages from Azure into the outbound queue."""
         try:
             async for message in azure_ws:
                 logger.debug("Azure->Client: %s", message[:LOG_MESSAGE_MAX_LENGTH])
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    client_ws.send,  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
-                    message,
-                )
+                classified = self.event_classifier.classify(message)
+                if timeline:
+                    timeline.observe_upstream_event(classified.type)
+                if classified.event is not None:
+                    if capture:
+                        capture.add_transcript(classified.event)
+                    if history is not None:
+                        history.add_transcript(classified.event)
+                if not self.event_filter.should_forward(message, classified.type):
+                    continue
+                if downsampler and classified.type == RESPONSE_AUDIO_DELTA_TYPE:
+                    message = downsampler.convert(message)
+                await outbound.put(message)
         except Exception:
-            logger.debug("Client connection closed during forwarding")
+            logger.debug("Azure connection closed during forwarding")
+
+    async def _drain_queue(
+        self,
+        queue: ForwardingQueue,
+        send: Callable[[Frame], Awaitable[None]],
+        coalescer: Optional[AudioCoalescer] = None,
+    ) -> None:
+        """Send queued messages to their destination in order."""
+        try:
+            if coalescer:
+                await coalescer.drain(queue, send)
+            while True:
+                await send(await queue.get())
+                queue.ack()
+        except Exception:
+            logger.debug("Connection closed while draining %s queue", queue.direction)
 
-    async def _send_message(self, ws: simple_websocket.ws.Server, message: Dict[str, str | Dict[str, str]]) -> None:
+    async def _send_message(self, ws: ClientTransport, message: Dict[str, Any]) -> None:
         """Send a JSON message to a WebSocket."""
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                ws.send,  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
-                json.dumps(message),
-            )
+            await ws.send(json.dumps(message))
         except Exception:
             pass
 
-    async def _send_error(self, ws: simple_websocket.ws.Server, error_message: str) -> None:
+    async def _send_error(self, ws: ClientTransport, error_message: str) -> None:
         """Send an error message to a WebSocket."""
         await self._send_message(ws, {"type": "error", "error": {"message": error_message}})
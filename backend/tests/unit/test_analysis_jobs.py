@@ -0,0 +1,202 @@
+"""Tests for the analysis_jobs module."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src.services.analysis_jobs import (
+    ANALYSIS_JOBS_METRIC,
+    ANALYSIS_JOBS_QUEUED_METRIC,
+    CANCELLED,
+    COMPLETED,
+    DONE_EVENT,
+    AnalysisJob,
+    AnalysisJobManager,
+    format_sse,
+)
+from src.services.metrics import metrics
+
+
+def _wait_done(job, timeout=5.0):
+    """Collect a job's events until it is done."""
+    events = []
+    while not events or events[-1][0] != DONE_EVENT:
+        new_events = job.wait_for_events(len(events), timeout)
+        assert new_events, "job did not finish"
+        events.extend(new_events)
+    return events
+
+
+class TestAnalysisJobManager:
+    """Test cases for AnalysisJobManager."""
+
+    def setup_method(self):
+        """Reset metrics between tests."""
+        metrics.reset()
+
+    def test_results_are_published_as_each_part_finishes(self):
+        """Test the faster part's result is available before the slower one finishes."""
+        slow_release = threading.Event()
+
+        async def fast(_report):
+            return {"score": 80}
+
+        async def slow(_report):
+            while not slow_release.is_set():
+                await asyncio.sleep(0.01)
+            return {"accuracy": 90}
+
+        manager = AnalysisJobManager(max_workers=1, max_queued=5, ttl_seconds=60)
+        job = manager.submit({"ai_assessment": fast, "pronunciation_assessment": slow})
+        assert job is not None
+
+        events = []
+        while not any(name == "ai_assessment" for name, _ in events):
+            events.extend(job.wait_for_events(len(events), 5.0))
+        snapshot = job.snapshot()
+        assert snapshot["status"] == "running"
+        assert snapshot["ai_assessment"] == {"score": 80}
+        assert snapshot["pending"] == ["pronunciation_assessment"]
+
+        slow_release.set()
+        events = _wait_done(job)
+        names = [name for name, _ in events]
+        assert names == ["status", "ai_assessment", "pronunciation_assessment", DONE_EVENT]
+        assert events[-1][1]["status"] == COMPLETED
+        assert events[-1][1]["pronunciation_assessment"] == {"accuracy": 90}
+        assert manager.get(job.id) is job
+        assert metrics.get(ANALYSIS_JOBS_METRIC, status=COMPLETED) == 1
+        manager.shutdown()
+
+    def test_failed_part_yields_none(self):
+        """Test a failing part is reported as a None result, like the synchronous endpoint."""
+
+        async def failing(_report):
+            raise RuntimeError("model unavailable")
+
+        async def working(_report):
+            return {"accuracy": 90}
+
+        manager = AnalysisJobManager(max_workers=1, max_queued=5, ttl_seconds=60)
+        job = manager.submit({"ai_assessment": failing, "pronunciation_assessment": working})
+
+        result = _wait_done(job)[-1][1]
+
+        assert result["ai_assessment"] is None
+        assert result["pronunciation_assessment"] == {"accuracy": 90}
+        assert result["pending"] == []
+        manager.shutdown()
+
+    def test_parts_report_sections_before_finishing(self):
+        """Test sections reported by a part are published and shown while it runs."""
+        release = threading.Event()
+
+        async def streaming(report):
+            report("speaking_tone_style", {"total": 24})
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+            return {"speaking_tone_style": {"total": 24}, "overall_score": 84}
+
+        manager = AnalysisJobManager(max_workers=1, max_queued=5, ttl_seconds=60)
+        job = manager.submit({"ai_assessment": streaming})
+
+        events = []
+        while not any(name == "ai_assessment.partial" for name, _ in events):
+            events.extend(job.wait_for_events(len(events), 5.0))
+        assert events[-1][1] == {"section": "speaking_tone_style", "value": {"total": 24}}
+        assert job.snapshot()["partial"] == {"ai_assessment": {"speaking_tone_style": {"total": 24}}}
+
+        release.set()
+        result = _wait_done(job)[-1][1]
+        assert result["partial"] == {}
+        assert result["ai_assessment"]["overall_score"] == 84
+        manager.shutdown()
+
+    def test_queue_is_bounded(self):
+        """Test submissions beyond the queue depth are rejected."""
+        blocker = threading.Event()
+
+        async def blocked(_report):
+            while not blocker.is_set():
+                await asyncio.sleep(0.01)
+
+        manager = AnalysisJobManager(max_workers=1, max_queued=1, ttl_seconds=60)
+        running = manager.submit({"part": blocked})
+        running.wait_for_events(0, 5.0)
+        queued = manager.submit({"part": blocked})
+
+        assert queued is not None
+        assert metrics.get(ANALYSIS_JOBS_QUEUED_METRIC) == 1
+        assert manager.submit({"part": blocked}) is None
+        assert metrics.get(ANALYSIS_JOBS_METRIC, status="rejected") == 1
+
+        blocker.set()
+        _wait_done(queued)
+        manager.shutdown()
+
+    def test_shutdown_cancels_running_and_queued_jobs(self):
+        """Test shutdown finishes every unfinished job, so its event streams end."""
+        never = threading.Event()
+
+        async def blocked(_report):
+            while not never.is_set():
+                await asyncio.sleep(0.01)
+
+        manager = AnalysisJobManager(max_workers=1, max_queued=5, ttl_seconds=60)
+        running = manager.submit({"part": blocked})
+        running.wait_for_events(0, 5.0)
+        queued = manager.submit({"part": blocked})
+
+        manager.shutdown()
+
+        for job in (running, queued):
+            result = _wait_done(job)[-1][1]
+            assert result["status"] == CANCELLED
+            assert result["part"] is None
+        assert metrics.get(ANALYSIS_JOBS_METRIC, status=CANCELLED) == 2
+        assert metrics.get(ANALYSIS_JOBS_QUEUED_METRIC) == 0
+
+    def test_finished_jobs_expire(self):
+        """Test finished jobs are dropped after the TTL."""
+
+        async def part(_report):
+            return 1
+
+        manager = AnalysisJobManager(max_workers=1, max_queued=5, ttl_seconds=0)
+        job = manager.submit({"part": part})
+        _wait_done(job)
+
+        assert manager.get(job.id) is None
+        manager.shutdown()
+
+
+class TestAnalysisJobEvents:
+    """Test cases for waiting on a job's events from an event loop."""
+
+    @pytest.mark.asyncio
+    async def test_next_events_wakes_on_publish_from_another_thread(self):
+        """Test an awaiting stream is woken by events published on a worker thread."""
+        job = AnalysisJob({})
+        waiting = asyncio.ensure_future(job.next_events(0, 5.0))
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        threading.Thread(target=job.start).start()
+
+        assert [name for name, _ in await asyncio.wait_for(waiting, 1)] == ["status"]
+        assert await job.next_events(1, 0.01) == []
+        assert not job._waiters  # pylint: disable=protected-access
+
+
+class TestFormatSse:
+    """Test cases for format_sse."""
+
+    def test_format(self):
+        """Test events are framed for text/event-stream."""
+        message = format_sse("ai_assessment", {"score": 80})
+
+        assert message.startswith("event: ai_assessment\ndata: ")
+        assert message.endswith("\n\n")
+        assert json.loads(message.split("data: ", 1)[1]) == {"score": 80}
@@ -4,12 +4,14 @@ import base64
 import json
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 import yaml
 
 from src.services.analyzers import ConversationAnalyzer, PronunciationAssessor
+from src.services.evaluation_cache import EvaluationCache
+from src.services.openai_client import shared_openai_client
 
 
 class TestConversationAnalyzer:
@@ -52,9 +54,8 @@ class TestConversationAnalyzer:
         analyzer = ConversationAnalyzer()
         assert analyzer.openai_client is None
 
-    @patch("src.services.analyzers.AzureOpenAI")
     @patch("src.services.analyzers.config")
-    def test_initialize_openai_client_success(self, mock_config, mock_azure_openai):
+    def test_initialize_openai_client_success(self, mock_config):
         """Test successful OpenAI client initialization."""
         mock_config.__getitem__.side_effect = lambda key: {
             "azure_openai_endpoint": "https://test.openai.azure.com",
@@ -62,8 +63,7 @@ class TestConversationAnalyzer:
         }.get(key, "")
 
         analyzer = ConversationAnalyzer()
-        assert analyzer.openai_client is not None
-        mock_azure_openai.assert_called_once()
+        assert analyzer.openai_client is shared_openai_client
 
     @pytest.mark.asyncio
     async def test_analyze_conversation_missing_scenario(self):
@@ -183,6 +183,114 @@ class TestConversationAnalyzer:
             # Due to complexity of async mocking, we just verify the client is set
             assert analyzer.openai_client is not None
 
+    @pytest.mark.asyncio
+    async def test_call_evaluation_model_awaits_shared_client(self):
+        """Test the evaluation is requested natively on the shared async client."""
+        evaluation = {
+            "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9, "total": 0},
+            "conversation_content": {
+                "needs_assessment": 20,
+                "value_proposition": 22,
+                "objection_handling": 18,
+                "total": 0,
+            },
+            "overall_score": 84,
+            "strengths": [],
+            "improvements": [],
+            "specific_feedback": "",
+        }
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(evaluation)
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        analyzer = ConversationAnalyzer()
+        analyzer.openai_client = Mock(get=Mock(return_value=mock_client))
+
+        result = await analyzer._call_evaluation_model({"messages": [{"content": "Evaluate"}]}, "user: Hello")
+
+        assert result["speaking_tone_style"]["total"] == 24
+        assert result["conversation_content"]["total"] == 60
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_conversation_analysis_reports_sections(self):
+        """Test sections are reported with their totals while the response streams."""
+        evaluation = {
+            "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9, "total": 0},
+            "conversation_content": {
+                "needs_assessment": 20,
+                "value_proposition": 22,
+                "objection_handling": 18,
+                "total": 0,
+            },
+            "overall_score": 84,
+            "strengths": ["Good rapport"],
+            "improvements": [],
+            "specific_feedback": "",
+        }
+        text = json.dumps(evaluation)
+        reported = []
+        received = []
+
+        def chunk(content):
+            return Mock(choices=[Mock(delta=Mock(content=content))])
+
+        async def stream():
+            # Azure sends content filter results first, in a chunk without choices
+            yield Mock(choices=[])
+            for i in range(0, len(text), 7):
+                received.append(i + 7)
+                yield chunk(text[i : i + 7])
+
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=stream())
+        analyzer = ConversationAnalyzer(cache=EvaluationCache(max_entries=10, ttl_seconds=60))
+        analyzer.openai_client = Mock(get=Mock(return_value=mock_client))
+        analyzer.evaluation_scenarios = {"test": {"messages": [{"content": "Evaluate"}]}}
+
+        reported_at = []
+
+        def on_section(name, _value):
+            reported.append(name)
+            reported_at.append(received[-1])
+
+        result = await analyzer.stream_conversation_analysis("test", "user: Hello", on_section)
+
+        assert reported == list(evaluation)
+        # The first section is reported as soon as it completes, long before the response ends
+        assert reported_at[0] < text.index('"conversation_content"') + 7 < len(text)
+        assert result["speaking_tone_style"]["total"] == 24
+        assert result["conversation_content"]["total"] == 60
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+        # A cached evaluation reports every section at once without calling the model again
+        reported_again = []
+        cached = await analyzer.stream_conversation_analysis(
+            "test", "user: Hello", lambda name, value: reported_again.append((name, value))
+        )
+        assert cached == result
+        assert dict(reported_again) == result
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_conversation_analysis_incomplete_response(self):
+        """Test a truncated stream yields None and is not cached."""
+
+        async def stream():
+            yield Mock(choices=[Mock(delta=Mock(content='{"overall_score": 84, '))])
+
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=lambda **_: stream())
+        analyzer = ConversationAnalyzer(cache=EvaluationCache(max_entries=10, ttl_seconds=60))
+        analyzer.openai_client = Mock(get=Mock(return_value=mock_client))
+        analyzer.evaluation_scenarios = {"test": {"messages": [{"content": "Evaluate"}]}}
+
+        assert await analyzer.stream_conversation_analysis("test", "user: Hello", Mock()) is None
+        assert await analyzer.stream_conversation_analysis("test", "user: Hello", Mock()) is None
+        assert mock_client.chat.completions.create.await_count == 2
+
 
 # pylint: enable=R0801
 
@@ -1,12 +1,15 @@
 """Tests for the Flask application endpoints."""
 
+import asyncio
 import json
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from flask.testing import FlaskClient
 
-from src.app import app
+from src.app import app, limit_sessions_to_receive_workers
+from src.services.session_capture import USER_TRANSCRIPT_TYPE, SessionCaptureStore
+from src.services.session_registry import SessionRegistry
 
 
 class TestFlaskApp:
@@ -212,6 +215,78 @@ class TestFlaskApp:
         data = json.loads(response.data)
         assert data["error"] == "scenario_id and transcript are required"
 
+    def test_analyze_conversation_with_session_id(self):
+        """Test analysis uses the server-side capture of a session."""
+        store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60)
+        capture = store.start("session-1")
+        capture.add_audio(b"ABC")
+        capture.add_transcript({"type": USER_TRANSCRIPT_TYPE, "transcript": "Hello"})
+
+        with (
+            patch("src.app.session_capture_store", store),
+            patch("src.app._perform_conversation_analysis") as mock_analysis,
+        ):
+            mock_analysis.return_value = {"ai_assessment": None}
+            response = self.client.post("/api/analyze", json={"scenario_id": "test", "session_id": "session-1"})
+
+            assert response.status_code == 200
+            mock_analysis.assert_called_once_with(
+                "test", "user: Hello", [{"type": "user", "data": "QUJD"}], "Hello", "session-1"
+            )
+
+            response = self.client.post("/api/analyze", json={"scenario_id": "test", "session_id": "unknown"})
+            assert response.status_code == 404
+
+    def test_analyze_conversation_with_session_id_when_capture_disabled(self):
+        """Test a session id without a capture falls back to the audio posted by the client."""
+        audio_data = [{"type": "user", "data": "QUJD"}]
+
+        with (
+            patch("src.app.session_capture_store", None),
+            patch("src.app._perform_conversation_analysis") as mock_analysis,
+        ):
+            mock_analysis.return_value = {"ai_assessment": None}
+            response = self.client.post("/api/analyze", json={"scenario_id": "test", "session_id": "session-1"})
+            assert response.status_code == 404
+
+            response = self.client.post(
+                "/api/analyze",
+                json={
+                    "scenario_id": "test",
+                    "session_id": "session-1",
+                    "transcript": "user: Hello",
+                    "reference_text": "Hello",
+                    "audio_data": audio_data,
+                },
+            )
+
+            assert response.status_code == 200
+            mock_analysis.assert_called_once_with("test", "user: Hello", audio_data, "Hello", "session-1")
+
+    def test_flask_sessions_limited_to_receive_workers(self):
+        """Test the threaded server admits no more sessions than it has receive threads."""
+        unlimited, low, high = SessionRegistry(0), SessionRegistry(5), SessionRegistry(500)
+
+        for registry in (unlimited, low, high):
+            limit_sessions_to_receive_workers(registry, 200)
+
+        assert (unlimited.max_sessions, low.max_sessions, high.max_sessions) == (200, 5, 200)
+
+    def test_get_metrics_route(self):
+        """Test the /api/metrics endpoint in JSON and Prometheus formats."""
+        with patch("src.app.metrics") as mock_metrics:
+            mock_metrics.snapshot.return_value = {"hits_total": [{"labels": {}, "value": 1.0}]}
+            mock_metrics.render_prometheus.return_value = "hits_total 1.0\n"
+
+            response = self.client.get("/api/metrics")
+            assert response.status_code == 200
+            assert json.loads(response.data) == {"hits_total": [{"labels": {}, "value": 1.0}]}
+
+            response = self.client.get("/api/metrics?format=prometheus")
+            assert response.status_code == 200
+            assert response.data == b"hits_total 1.0\n"
+            assert response.mimetype == "text/plain"
+
     def test_audio_processor_route(self):
         """Test the audio processor route."""
         with patch("src.app.send_from_directory") as mock_send:
@@ -243,11 +318,8 @@ class TestFlaskApp:
         mock_foundry_scenario = {
             "name": "Custom Foundry Agent Connection",
             "isFoundryAgent": True,
-            "foundryConfig": {
-                "requiresCustomAgent": True,
-                "agentConnectionType": "foundry"
-            },
-            "messages": [{"content": "Foundry agent instructions"}]
+            "foundryConfig": {"requiresCustomAgent": True, "agentConnectionType": "foundry"},
+            "messages": [{"content": "Foundry agent instructions"}],
         }
         mock_scenario_manager.get_scenario.return_value = mock_foundry_scenario
         mock_agent_manager.create_agent.return_value = "foundry-agent-123"
@@ -262,3 +334,78 @@ class TestFlaskApp:
         assert data["agent_id"] == "foundry-agent-123"
         assert data["scenario_id"] == "foundry-agent"
         mock_agent_manager.create_agent.assert_called_once_with("foundry-agent", mock_foundry_scenario)
+
+    def test_analysis_job_routes(self):
+        """Test an analysis job is queued, polled and streamed."""
+
+        async def analyze(_scenario_id, _transcript, report):
+            report("speaking_tone_style", {"total": 24})
+            return {"overall_score": 80}
+
+        async def assess(*_args):
+            return {"accuracy_score": 90}
+
+        with (
+            patch("src.app.conversation_analyzer") as mock_analyzer,
+            patch("src.app.pronunciation_assessor") as mock_assessor,
+        ):
+            mock_analyzer.stream_conversation_analysis.side_effect = analyze
+            mock_assessor.assess_pronunciation.side_effect = assess
+
+            response = self.client.post("/api/analyze/jobs", json={"scenario_id": "test", "transcript": "user: Hello"})
+            assert response.status_code == 202
+            job = json.loads(response.data)
+            assert job["status_url"] == f"/api/analyze/jobs/{job['job_id']}"
+
+            stream = self.client.get(job["events_url"])
+            assert stream.mimetype == "text/event-stream"
+            body = stream.get_data(as_text=True)
+            assert "event: ai_assessment.partial" in body
+            assert 'data: {"section": "speaking_tone_style", "value": {"total": 24}}' in body
+            assert "event: ai_assessment\n" in body
+            assert "event: pronunciation_assessment" in body
+            assert body.rstrip().splitlines()[-2] == "event: done"
+
+            result = json.loads(self.client.get(job["status_url"]).data)
+            assert result["status"] == "completed"
+            assert result["ai_assessment"] == {"overall_score": 80}
+            assert result["pronunciation_assessment"] == {"accuracy_score": 90}
+            assert mock_analyzer.stream_conversation_analysis.call_args.args[:2] == ("test", "user: Hello")
+
+    def test_assess_conversation_merges_rolling_evaluation(self):
+        """Test a captured session's running evaluation replaces the full analysis."""
+        from src.app import _assess_conversation  # pylint: disable=C0415
+
+        merged = {"overall_score": 70, "strengths": ["Good questions"]}
+        reported = []
+        with (
+            patch("src.app.conversation_analyzer") as mock_analyzer,
+            patch("src.app.rolling_evaluator") as mock_rolling,
+        ):
+            mock_rolling.final_evaluation = AsyncMock(return_value=merged)
+            result = asyncio.run(
+                _assess_conversation("test", "user: Hi", "session-1", lambda *section: reported.append(section))
+            )
+
+            assert result == merged
+            assert reported == list(merged.items())
+            mock_rolling.final_evaluation.assert_awaited_once_with("session-1", "test")
+            mock_analyzer.stream_conversation_analysis.assert_not_called()
+
+            mock_rolling.final_evaluation = AsyncMock(return_value=None)
+            mock_analyzer.analyze_conversation = AsyncMock(return_value={"overall_score": 60})
+            assert asyncio.run(_assess_conversation("test", "user: Hi", "session-1")) == {"overall_score": 60}
+
+    def test_analysis_job_errors(self):
+        """Test invalid, rejected and unknown analysis jobs."""
+        response = self.client.post("/api/analyze/jobs", json={"transcript": "Hello"})
+        assert response.status_code == 400
+
+        with patch("src.app.analysis_jobs") as mock_jobs:
+            mock_jobs.submit.return_value = None
+            response = self.client.post("/api/analyze/jobs", json={"scenario_id": "test", "transcript": "Hello"})
+            assert response.status_code == 503
+
+            mock_jobs.get.return_value = None
+            assert self.client.get("/api/analyze/jobs/unknown").status_code == 404
+            assert self.client.get("/api/analyze/jobs/unknown/events").status_code == 404
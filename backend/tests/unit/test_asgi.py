@@ -0,0 +1,162 @@
+"""Tests for the ASGI entry point."""
+
+import asyncio
+import json
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.app import app
+from src.asgi import VoiceLiveASGIApp, _shutdown_analysis_jobs, _shutdown_executors, application
+from src.services.analysis_jobs import AnalysisJobManager
+
+
+def _receiver(events: List[Dict[str, Any]]):
+    """Build an ASGI receive callable that replays the given events."""
+    queue = list(events)
+
+    async def receive() -> Dict[str, Any]:
+        return queue.pop(0)
+
+    return receive
+
+
+class TestVoiceLiveASGIApp:
+    """Test cases for VoiceLiveASGIApp."""
+
+    @pytest.mark.asyncio
+    async def test_websocket_is_served_by_voice_handler(self):
+        """Test the voice endpoint is accepted and handed to the proxy handler."""
+        handler = Mock()
+        handler.handle_connection = AsyncMock()
+        sent: List[Dict[str, Any]] = []
+
+        async def send(event: Dict[str, Any]) -> None:
+            sent.append(event)
+
+        asgi_app = VoiceLiveASGIApp(app, handler, wsgi_workers=1)
+        await asgi_app({"type": "websocket", "path": "/ws/voice"}, _receiver([{"type": "websocket.connect"}]), send)
+
+        handler.handle_connection.assert_awaited_once()
+        assert sent[0] == {"type": "websocket.accept"}
+        assert sent[-1]["type"] == "websocket.close"
+
+    @pytest.mark.asyncio
+    async def test_websocket_unknown_path_rejected(self):
+        """Test WebSocket connections to other paths are rejected."""
+        handler = Mock()
+        handler.handle_connection = AsyncMock()
+        sent: List[Dict[str, Any]] = []
+
+        async def send(event: Dict[str, Any]) -> None:
+            sent.append(event)
+
+        asgi_app = VoiceLiveASGIApp(app, handler, wsgi_workers=1)
+        await asgi_app({"type": "websocket", "path": "/other"}, _receiver([{"type": "websocket.connect"}]), send)
+
+        handler.handle_connection.assert_not_called()
+        assert sent == [{"type": "websocket.close", "code": 1008}]
+
+    @pytest.mark.asyncio
+    async def test_lifespan_runs_hooks(self):
+        """Test lifespan startup and shutdown hooks are awaited."""
+        asgi_app = VoiceLiveASGIApp(app, Mock(), wsgi_workers=1)
+        startup = AsyncMock()
+        shutdown = AsyncMock()
+        asgi_app.startup_hooks.append(startup)
+        asgi_app.shutdown_hooks.append(shutdown)
+        sent: List[Dict[str, Any]] = []
+
+        async def send(event: Dict[str, Any]) -> None:
+            sent.append(event)
+
+        events = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        await asgi_app({"type": "lifespan"}, _receiver(events), send)
+
+        startup.assert_awaited_once()
+        shutdown.assert_awaited_once()
+        assert [event["type"] for event in sent] == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+    def test_analysis_jobs_are_cancelled_before_the_background_loop_stops(self):
+        """Test the application's shutdown hooks end analysis jobs while their loop still runs."""
+        hooks = application.shutdown_hooks
+
+        assert hooks.index(_shutdown_analysis_jobs) < hooks.index(_shutdown_executors)
+
+    @pytest.mark.asyncio
+    async def test_http_is_served_by_flask(self):
+        """Test HTTP requests are routed to the Flask application."""
+        asgi_app = VoiceLiveASGIApp(app, Mock(), wsgi_workers=1)
+        sent: List[Dict[str, Any]] = []
+
+        async def send(event: Dict[str, Any]) -> None:
+            sent.append(event)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/config",
+            "raw_path": b"/api/config",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [],
+            "server": ("testserver", 80),
+            "client": ("127.0.0.1", 12345),
+        }
+        await asgi_app(scope, _receiver([{"type": "http.request", "body": b"", "more_body": False}]), send)
+
+        assert sent[0]["status"] == 200
+        body = b"".join(event.get("body", b"") for event in sent[1:])
+        assert json.loads(body)["ws_endpoint"] == "/ws/voice"
+
+    @pytest.mark.asyncio
+    async def test_job_events_are_streamed_without_the_wsgi_pool(self):
+        """Test a job's server-sent events are served on the event loop, not by Flask."""
+
+        async def part(_report):
+            return {"score": 80}
+
+        jobs = AnalysisJobManager(max_workers=1, max_queued=5, ttl_seconds=60)
+        asgi_app = VoiceLiveASGIApp(app, Mock(), wsgi_workers=1, jobs=jobs)
+        asgi_app.http_app = AsyncMock(side_effect=AssertionError("served by the WSGI pool"))
+        job = jobs.submit({"ai_assessment": part})
+        assert job is not None
+        sent: List[Dict[str, Any]] = []
+
+        async def send(event: Dict[str, Any]) -> None:
+            sent.append(event)
+
+        async def receive() -> Dict[str, Any]:
+            # The client stays connected until the stream ends
+            await asyncio.Event().wait()
+            return {"type": "http.disconnect"}
+
+        scope = {"type": "http", "method": "GET", "path": f"/api/analyze/jobs/{job.id}/events"}
+        await asyncio.wait_for(asgi_app(scope, receive, send), 5)
+
+        assert sent[0]["status"] == 200
+        assert (b"content-type", b"text/event-stream") in sent[0]["headers"]
+        body = b"".join(event["body"] for event in sent[1:]).decode()
+        assert "event: ai_assessment" in body
+        assert body.rstrip().splitlines()[-2] == "event: done"
+        assert sent[-1]["more_body"] is False
+        jobs.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_events_not_found(self):
+        """Test the event stream of an unknown job answers 404."""
+        asgi_app = VoiceLiveASGIApp(app, Mock(), wsgi_workers=1, jobs=AnalysisJobManager(1, 5, 60))
+        sent: List[Dict[str, Any]] = []
+
+        async def send(event: Dict[str, Any]) -> None:
+            sent.append(event)
+
+        scope = {"type": "http", "method": "GET", "path": "/api/analyze/jobs/unknown/events"}
+        await asgi_app(scope, _receiver([{"type": "http.disconnect"}]), send)
+
+        assert sent[0]["status"] == 404
+        assert json.loads(sent[1]["body"]) == {"error": "Analysis job not found or expired"}
@@ -0,0 +1,102 @@
+"""Tests for the audio_coalescer module."""
+
+import asyncio
+import base64
+import json
+
+import pytest
+
+from src.services.audio_coalescer import (
+    COALESCE_FLUSHES_METRIC,
+    COALESCE_FRAMES_METRIC,
+    COALESCE_MAX_DELAY_METRIC,
+    AudioCoalescer,
+)
+from src.services.backpressure import INBOUND, INPUT_AUDIO_APPEND_TYPE, ForwardingQueue, join_base64_audio
+from src.services.metrics import metrics
+
+
+def _append(audio: bytes) -> str:
+    return json.dumps({"type": INPUT_AUDIO_APPEND_TYPE, "audio": base64.b64encode(audio).decode("ascii")})
+
+
+def _audio(frame: str) -> bytes:
+    return base64.b64decode(json.loads(frame)["audio"])
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+async def _run(coalescer: AudioCoalescer, frames, expected: int):
+    """Queue frames, drain them through the coalescer and return what was sent."""
+    queue = ForwardingQueue(50, INBOUND, "s1")
+    sent = []
+
+    async def send(frame):
+        sent.append(frame)
+
+    for frame in frames:
+        await queue.put(frame)
+    task = asyncio.create_task(coalescer.drain(queue, send))
+    for _ in range(100):
+        if len(sent) >= expected:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return sent
+
+
+class TestJoinBase64Audio:
+    """Test cases for join_base64_audio."""
+
+    def test_joins_unpadded_and_padded_chunks(self):
+        """Test both the text fast path and the re-encoding path."""
+        unpadded = [base64.b64encode(b"abc").decode(), base64.b64encode(b"def").decode()]
+        padded = [base64.b64encode(b"ab").decode(), base64.b64encode(b"cd").decode()]
+
+        assert base64.b64decode(join_base64_audio(unpadded)) == b"abcdef"
+        assert base64.b64decode(join_base64_audio(padded)) == b"abcd"
+
+
+class TestAudioCoalescer:
+    """Test cases for AudioCoalescer."""
+
+    @pytest.mark.asyncio
+    async def test_merges_consecutive_appends_within_window(self):
+        """Test queued appends are sent upstream as one frame."""
+        sent = await _run(AudioCoalescer(0.05, 10_000, "s1"), [_append(b"abc"), _append(b"def"), _append(b"g")], 1)
+
+        assert len(sent) == 1
+        assert _audio(sent[0]) == b"abcdefg"
+        assert metrics.get(COALESCE_FLUSHES_METRIC) == 1
+        assert metrics.get(COALESCE_FRAMES_METRIC) == 3
+        assert 0 < metrics.get(COALESCE_MAX_DELAY_METRIC, session="s1") < 1
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_size_limit(self):
+        """Test a batch is flushed once it reaches the size limit."""
+        sent = await _run(AudioCoalescer(5, 6, "s1"), [_append(b"abc"), _append(b"def"), _append(b"ghi")], 1)
+
+        assert _audio(sent[0]) == b"abcdef"
+
+    @pytest.mark.asyncio
+    async def test_other_events_flush_and_keep_order(self):
+        """Test a non-audio event ends the batch and is sent right after it."""
+        commit = json.dumps({"type": "input_audio_buffer.commit"})
+        sent = await _run(AudioCoalescer(5, 10_000, "s1"), [_append(b"abc"), _append(b"def"), commit], 2)
+
+        assert _audio(sent[0]) == b"abcdef"
+        assert sent[1] == commit
+
+    @pytest.mark.asyncio
+    async def test_single_append_is_sent_unchanged(self):
+        """Test a lone append is forwarded as-is after the window."""
+        frame = _append(b"abc")
+        sent = await _run(AudioCoalescer(0.01, 10_000, "s1"), [frame], 1)
+
+        assert sent == [frame]
@@ -0,0 +1,81 @@
+"""Tests for the audio_resampler module."""
+
+import base64
+import json
+
+import numpy as np
+import pytest
+
+from src.services.audio_resampler import PcmResampler, ResponseAudioDownsampler
+from src.services.metrics import metrics
+
+
+def _tone(frequency: float, seconds: float = 0.5, rate: int = 24000) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    return (np.sin(2 * np.pi * frequency * t) * 10000).astype("<i2").tobytes()
+
+
+def _rms(pcm: bytes) -> float:
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float64)
+    return float(np.sqrt(np.mean(samples[100:-100] ** 2)))
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestPcmResampler:
+    """Test cases for PcmResampler."""
+
+    @pytest.mark.parametrize("to_rate", [16000, 8000])
+    def test_output_length_follows_ratio(self, to_rate):
+        """Test the output has the expected number of samples."""
+        output = PcmResampler(24000, to_rate).process(_tone(440))
+
+        assert len(output) // 2 == pytest.approx(12000 * to_rate / 24000, abs=1)
+
+    def test_chunked_stream_matches_single_pass(self):
+        """Test filter state carries over so chunking does not change the output."""
+        tone = _tone(440)
+        whole = PcmResampler(24000, 16000).process(tone)
+
+        resampler = PcmResampler(24000, 16000)
+        chunks = b"".join(resampler.process(tone[i : i + 2402]) for i in range(0, len(tone), 2402))
+
+        assert chunks == whole
+
+    def test_keeps_speech_band_and_removes_aliasing(self):
+        """Test tones below the new Nyquist pass and tones above it are filtered out."""
+        kept = PcmResampler(24000, 8000).process(_tone(1000))
+        removed = PcmResampler(24000, 8000).process(_tone(6000))
+
+        assert _rms(kept) == pytest.approx(_rms(_tone(1000)), rel=0.05)
+        assert _rms(removed) < 0.05 * _rms(_tone(6000))
+
+
+class TestResponseAudioDownsampler:
+    """Test cases for ResponseAudioDownsampler."""
+
+    def test_rewrites_delta_and_records_savings(self):
+        """Test the delta payload is resampled and the rest of the event is kept."""
+        downsampler = ResponseAudioDownsampler("s1", 16000)
+        frame = json.dumps(
+            {"type": "response.audio.delta", "delta": base64.b64encode(_tone(440, 0.1)).decode(), "item_id": "i1"}
+        )
+
+        event = json.loads(downsampler.convert(frame))
+
+        assert event["item_id"] == "i1"
+        assert len(base64.b64decode(event["delta"])) == 3200
+        assert downsampler.bytes_out < downsampler.bytes_in
+        assert metrics.get("voice_proxy_downsample_bytes_saved_total", rate=16000) == len(frame) - downsampler.bytes_out
+
+    def test_frames_without_audio_are_unchanged(self):
+        """Test frames without a delta payload pass through."""
+        downsampler = ResponseAudioDownsampler("s1", 8000)
+
+        assert downsampler.convert('{"type": "response.audio.delta"}') == '{"type": "response.audio.delta"}'
+        assert downsampler.frames == 0
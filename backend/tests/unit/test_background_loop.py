@@ -0,0 +1,118 @@
+"""Tests for the background_loop module."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+
+from src.services.background_loop import (
+    BACKGROUND_LOOP_LAG_METRIC,
+    BACKGROUND_LOOP_PENDING_METRIC,
+    BACKGROUND_LOOP_SUBMITTED_METRIC,
+    BACKGROUND_LOOP_TASKS_METRIC,
+    BackgroundLoop,
+)
+from src.services.metrics import metrics
+
+
+@pytest.fixture
+def background():
+    """Provide a loop that is stopped after the test."""
+    metrics.reset()
+    loop = BackgroundLoop(name="test-loop", lag_interval_seconds=0.01)
+    yield loop
+    loop.stop()
+
+
+class TestBackgroundLoop:
+    """Test cases for BackgroundLoop."""
+
+    def test_run_returns_result(self, background):
+        """Test a coroutine's result is returned to the calling thread."""
+
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert background.run(add(2, 3)) == 5
+        assert metrics.get(BACKGROUND_LOOP_SUBMITTED_METRIC) == 1
+
+    def test_runs_share_one_loop_and_thread(self, background):
+        """Test every submission runs on the same loop, off the calling thread."""
+
+        async def current():
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        first_loop, first_thread = background.run(current())
+        second_loop, second_thread = background.run(current())
+
+        assert first_loop is second_loop
+        assert first_thread == second_thread == "test-loop"
+        assert not first_loop.is_closed()
+
+    def test_exceptions_propagate(self, background):
+        """Test a coroutine's exception is raised in the calling thread."""
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            background.run(fail())
+
+    def test_timeout_cancels_coroutine(self, background):
+        """Test a timed-out coroutine is cancelled."""
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(FutureTimeoutError):
+            background.run(slow(), timeout=0.05)
+        assert cancelled.wait(1)
+
+    def test_pending_submissions_gauge(self, background):
+        """Test the pending gauge counts submissions until they finish."""
+        release = threading.Event()
+
+        async def wait():
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+
+        future = background.submit(wait())
+        assert metrics.get(BACKGROUND_LOOP_PENDING_METRIC) == 1
+
+        release.set()
+        future.result(1)
+        assert metrics.get(BACKGROUND_LOOP_PENDING_METRIC) == 0
+
+    def test_lag_and_task_metrics(self, background):
+        """Test the monitor records loop lag and running tasks."""
+
+        async def idle():
+            await asyncio.sleep(0.2)
+
+        future = background.submit(idle())
+        time.sleep(0.1)
+
+        assert metrics.get(BACKGROUND_LOOP_TASKS_METRIC) == 1
+        assert metrics.snapshot()[BACKGROUND_LOOP_LAG_METRIC][0]["value"]["count"] > 0
+        future.result(1)
+
+    def test_stop_and_restart(self, background):
+        """Test stop ends the thread and a later submission starts a new loop."""
+
+        async def current():
+            return asyncio.get_running_loop()
+
+        first = background.run(current())
+        thread = background._thread
+        background.stop()
+
+        assert not thread.is_alive()
+        assert first.is_closed()
+        assert background.run(current()) is not first
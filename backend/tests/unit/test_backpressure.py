@@ -0,0 +1,133 @@
+"""Tests for the backpressure module."""
+
+import asyncio
+import base64
+import json
+
+import pytest
+
+from src.services.backpressure import (
+    FRAMES_DROPPED_METRIC,
+    FRAMES_MERGED_METRIC,
+    INBOUND,
+    INPUT_AUDIO_APPEND_TYPE,
+    OUTBOUND,
+    QUEUE_DEPTH_METRIC,
+    RESPONSE_AUDIO_DELTA_TYPE,
+    ForwardingQueue,
+    audio_append_frame,
+    merge_audio_appends,
+)
+from src.services.metrics import metrics
+
+
+def _append(audio: bytes) -> str:
+    return json.dumps({"type": INPUT_AUDIO_APPEND_TYPE, "audio": base64.b64encode(audio).decode("ascii")})
+
+
+def _delta(index: int) -> str:
+    return json.dumps({"type": RESPONSE_AUDIO_DELTA_TYPE, "delta": str(index)})
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestAudioAppendFrame:
+    """Test cases for audio_append_frame."""
+
+    def test_matches_serialized_event(self):
+        """Test the formatted frame is identical to a serialized append event."""
+        assert audio_append_frame("QUJD") == _append(b"ABC")
+
+
+class TestMergeAudioAppends:
+    """Test cases for merge_audio_appends."""
+
+    def test_concatenates_audio_in_order(self):
+        """Test audio payloads are concatenated in order."""
+        merged = json.loads(merge_audio_appends(_append(b"ab"), _append(b"cd")))
+
+        assert merged["type"] == INPUT_AUDIO_APPEND_TYPE
+        assert base64.b64decode(merged["audio"]) == b"abcd"
+
+
+class TestForwardingQueue:
+    """Test cases for ForwardingQueue."""
+
+    @pytest.mark.asyncio
+    async def test_fifo_order_and_depth_gauge(self):
+        """Test frames come out in order and the depth gauge tracks the queue."""
+        queue = ForwardingQueue(5, INBOUND, "s1")
+
+        await queue.put("a")
+        await queue.put("b")
+        assert metrics.get(QUEUE_DEPTH_METRIC, session="s1", direction=INBOUND) == 2
+
+        assert await queue.get() == "a"
+        assert await queue.get() == "b"
+        assert metrics.get(QUEUE_DEPTH_METRIC, session="s1", direction=INBOUND) == 0
+
+        queue.close()
+        assert QUEUE_DEPTH_METRIC not in metrics.snapshot()
+
+    @pytest.mark.asyncio
+    async def test_merges_audio_appends_when_full(self):
+        """Test input audio is merged into the tail instead of blocking."""
+        queue = ForwardingQueue(2, INBOUND, "s1", merge_types=frozenset({INPUT_AUDIO_APPEND_TYPE}))
+
+        await queue.put('{"type": "session.update"}')
+        await queue.put(_append(b"1"))
+        await asyncio.wait_for(queue.put(_append(b"2")), 1)
+
+        assert queue.qsize() == 2
+        await queue.get()
+        assert base64.b64decode(json.loads(await queue.get())["audio"]) == b"12"
+        assert metrics.get(FRAMES_MERGED_METRIC, direction=INBOUND, type=INPUT_AUDIO_APPEND_TYPE) == 1
+
+    @pytest.mark.asyncio
+    async def test_drops_oldest_audio_delta_when_full(self):
+        """Test the oldest queued audio delta is dropped for a new one."""
+        queue = ForwardingQueue(3, OUTBOUND, "s1", drop_types=frozenset({RESPONSE_AUDIO_DELTA_TYPE}))
+
+        await queue.put(_delta(0))
+        await queue.put('{"type": "response.done"}')
+        await queue.put(_delta(1))
+        await asyncio.wait_for(queue.put(_delta(2)), 1)
+
+        frames = [json.loads(await queue.get()) for _ in range(3)]
+        assert [frame.get("delta") for frame in frames] == [None, "1", "2"]
+        assert metrics.get(FRAMES_DROPPED_METRIC, direction=OUTBOUND, type=RESPONSE_AUDIO_DELTA_TYPE) == 1
+
+    @pytest.mark.asyncio
+    async def test_control_frames_wait_for_space(self):
+        """Test frames outside the congestion policy block until the writer catches up."""
+        queue = ForwardingQueue(1, OUTBOUND, "s1", drop_types=frozenset({RESPONSE_AUDIO_DELTA_TYPE}))
+        await queue.put('{"type": "response.created"}')
+
+        put_task = asyncio.create_task(queue.put('{"type": "response.done"}'))
+        await asyncio.sleep(0.01)
+        assert not put_task.done()
+
+        assert json.loads(await queue.get())["type"] == "response.created"
+        await asyncio.wait_for(put_task, 1)
+        assert json.loads(await queue.get())["type"] == "response.done"
+
+    @pytest.mark.asyncio
+    async def test_restore_puts_unacknowledged_frames_back_in_order(self):
+        """Test frames taken but not acknowledged are redelivered before newer ones."""
+        queue = ForwardingQueue(5, INBOUND, "s1", redeliver=True)
+        for frame in ("a", "b", "c", "d"):
+            await queue.put(frame)
+
+        assert await queue.get() == "a"
+        queue.ack()
+        assert [await queue.get(), await queue.get()] == ["b", "c"]
+
+        assert queue.restore() == 2
+        assert [await queue.get() for _ in range(3)] == ["b", "c", "d"]
+        queue.ack(3)
+        assert queue.restore() == 0
@@ -0,0 +1,46 @@
+"""Tests for the voice proxy forwarding benchmark."""
+
+import argparse
+from unittest.mock import Mock
+
+import pytest
+
+from tools import bench_forwarding
+from tools.bench_forwarding import MODES, _benchmark_mode, _receive_from_proxy
+
+
+class TestBenchmarkMode:
+    """Test cases for _benchmark_mode."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", MODES)
+    async def test_smoke_run_reports_every_message(self, mode):
+        """Test a short run through the proxy process completes and measures every frame."""
+        args = argparse.Namespace(sessions=1, messages=3, interval=0)
+
+        result = await _benchmark_mode(mode, args)
+
+        assert result["mode"] == mode
+        assert result["messages"] == 3
+        assert result["proxy_cpu_ms_per_session"] >= 0
+
+
+class TestReceiveFromProxy:
+    """Test cases for _receive_from_proxy."""
+
+    def test_raises_when_proxy_process_has_exited(self):
+        """Test a proxy that died before answering fails the run instead of hanging it."""
+        conn = Mock(poll=Mock(return_value=False))
+        process = Mock(is_alive=Mock(return_value=False), exitcode=1)
+
+        with pytest.raises(RuntimeError, match="exited with code 1"):
+            _receive_from_proxy(conn, process)
+
+    def test_raises_when_proxy_does_not_answer(self, monkeypatch):
+        """Test a proxy that stays silent fails the run after the timeout."""
+        monkeypatch.setattr(bench_forwarding, "PROXY_TIMEOUT", 0)
+        conn = Mock(poll=Mock(return_value=False))
+        process = Mock(is_alive=Mock(return_value=True))
+
+        with pytest.raises(TimeoutError):
+            _receive_from_proxy(conn, process)
@@ -0,0 +1,99 @@
+"""Tests for the connection_pool module."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from websockets.protocol import State
+
+from src.services.connection_pool import UpstreamConnectionPool, UpstreamKey
+
+KEY = UpstreamKey(target="model=gpt-4o", voice="voice", avatar="avatar")
+
+
+def _make_ws(state: State = State.OPEN) -> Mock:
+    """Create a mock upstream connection."""
+    ws = Mock()
+    ws.state = state
+    ws.close = AsyncMock()
+    return ws
+
+
+class TestUpstreamConnectionPool:
+    """Test cases for UpstreamConnectionPool."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_before_start_is_a_miss(self):
+        """Test the pool hands out nothing until started."""
+        pool = UpstreamConnectionPool(AsyncMock(), size_per_key=1, max_idle_seconds=60)
+
+        assert await pool.acquire(KEY) is None
+
+    @pytest.mark.asyncio
+    async def test_refills_and_hands_out_warm_connections(self):
+        """Test the pool warms startup keys and serves hits from them."""
+        ws = _make_ws()
+        connect = AsyncMock(return_value=ws)
+        pool = UpstreamConnectionPool(connect, size_per_key=1, max_idle_seconds=60, refill_interval=0.01)
+
+        await pool.start([KEY])
+        await asyncio.sleep(0.05)
+
+        assert await pool.acquire(KEY) is ws
+        connect.assert_awaited_with(KEY)
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_miss_registers_key_for_refill(self):
+        """Test a miss on a new key makes the pool start warming it."""
+        connect = AsyncMock(side_effect=lambda key: _make_ws())
+        pool = UpstreamConnectionPool(connect, size_per_key=2, max_idle_seconds=60, refill_interval=0.01)
+        other_key = UpstreamKey(target="agent-id=abc", voice="voice", avatar="avatar")
+
+        await pool.start()
+        assert await pool.acquire(other_key) is None
+        await asyncio.sleep(0.05)
+
+        assert pool.idle_count(other_key) == 2
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_closed_connections_are_skipped(self):
+        """Test connections closed by the server are not handed out."""
+        closed_ws = _make_ws(State.CLOSED)
+        pool = UpstreamConnectionPool(AsyncMock(return_value=closed_ws), size_per_key=1, max_idle_seconds=60)
+        pool.refill_interval = 60
+
+        await pool.start([KEY])
+        await asyncio.sleep(0.01)
+
+        assert await pool.acquire(KEY) is None
+        closed_ws.close.assert_awaited()
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_idle_connections_are_evicted(self):
+        """Test connections idle past the limit are closed."""
+        ws = _make_ws()
+        pool = UpstreamConnectionPool(AsyncMock(return_value=ws), size_per_key=1, max_idle_seconds=0)
+        pool.refill_interval = 60
+
+        await pool.start([KEY])
+        await asyncio.sleep(0.01)
+        await pool._evict_stale()
+
+        ws.close.assert_awaited()
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_connect_failures_do_not_stop_refill(self):
+        """Test failed connects are counted and retried on the next pass."""
+        ws = _make_ws()
+        connect = AsyncMock(side_effect=[Exception("boom"), ws])
+        pool = UpstreamConnectionPool(connect, size_per_key=1, max_idle_seconds=60, refill_interval=0.01)
+
+        await pool.start([KEY])
+        await asyncio.sleep(0.05)
+
+        assert await pool.acquire(KEY) is ws
+        await pool.stop()
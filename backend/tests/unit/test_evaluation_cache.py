@@ -0,0 +1,245 @@
+"""Tests for the evaluation_cache module."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.services.analyzers import ConversationAnalyzer
+from src.services.evaluation_cache import (
+    DISK_HIT,
+    EVALUATION_CACHE_ENTRIES_METRIC,
+    EVALUATION_CACHE_EVICTIONS_METRIC,
+    EVALUATION_CACHE_REQUESTS_METRIC,
+    MEMORY_HIT,
+    MISS,
+    SHARED,
+    EvaluationCache,
+    make_cache_key,
+)
+from src.services.metrics import metrics
+
+EVALUATION = {
+    "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9, "total": 0},
+    "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18, "total": 0},
+    "overall_score": 84,
+    "strengths": ["Good rapport"],
+    "improvements": [],
+    "specific_feedback": "",
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test with empty metrics."""
+    metrics.reset()
+
+
+class TestMakeCacheKey:
+    """Test cases for make_cache_key."""
+
+    def test_key_depends_on_every_part(self):
+        """Test keys are stable and change with any input."""
+        key = make_cache_key(1, "gpt-4o", "prompt")
+
+        assert key == make_cache_key(1, "gpt-4o", "prompt")
+        assert len(key) == 64
+        assert key != make_cache_key(2, "gpt-4o", "prompt")
+        assert key != make_cache_key(1, "gpt-4o-mini", "prompt")
+        assert key != make_cache_key(1, "gpt-4o", "prompt ")
+
+
+class TestEvaluationCache:
+    """Test cases for EvaluationCache."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self):
+        """Test a computed evaluation is served from memory afterwards."""
+        cache = EvaluationCache(max_entries=10, ttl_seconds=60)
+        compute = AsyncMock(return_value={"score": 1})
+
+        first = await cache.get_or_compute("k", compute)
+        second = await cache.get_or_compute("k", compute)
+
+        assert first == second == {"score": 1}
+        compute.assert_awaited_once()
+        assert metrics.get(EVALUATION_CACHE_REQUESTS_METRIC, result=MISS) == 1
+        assert metrics.get(EVALUATION_CACHE_REQUESTS_METRIC, result=MEMORY_HIT) == 1
+
+    @pytest.mark.asyncio
+    async def test_hits_return_copies(self):
+        """Test callers cannot change a cached entry."""
+        cache = EvaluationCache(max_entries=10, ttl_seconds=60)
+
+        first = await cache.get_or_compute("k", AsyncMock(return_value={"strengths": ["a"]}))
+        first["strengths"].append("b")
+        second = await cache.get_or_compute("k", AsyncMock())
+        second["strengths"].append("c")
+
+        assert cache.get("k")[0] == {"strengths": ["a"]}
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        """Test a failed evaluation is retried on the next call."""
+        cache = EvaluationCache(max_entries=10, ttl_seconds=60)
+        compute = AsyncMock(side_effect=[None, {"score": 1}])
+
+        assert await cache.get_or_compute("k", compute) is None
+        assert await cache.get_or_compute("k", compute) == {"score": 1}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_computation(self):
+        """Test identical concurrent requests wait for the first one."""
+        cache = EvaluationCache(max_entries=10, ttl_seconds=60)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"score": 1}
+
+        results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+
+        assert calls == 1
+        assert results == [{"score": 1}] * 5
+        assert metrics.get(EVALUATION_CACHE_REQUESTS_METRIC, result=SHARED) == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_receive_exception(self):
+        """Test a failing shared computation raises in every caller."""
+        cache = EvaluationCache(max_entries=10, ttl_seconds=60)
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            cache.get_or_compute("k", compute), cache.get_or_compute("k", compute), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert cache.get("k") == (None, MISS)
+
+    @pytest.mark.asyncio
+    async def test_waiter_computes_when_first_caller_is_cancelled(self):
+        """Test cancelling the computing caller does not cancel callers sharing its result."""
+        cache = EvaluationCache(max_entries=10, ttl_seconds=60)
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        owner = asyncio.ensure_future(cache.get_or_compute("k", slow))
+        await started.wait()
+        waiter = asyncio.ensure_future(cache.get_or_compute("k", AsyncMock(return_value={"score": 1})))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        assert await waiter == {"score": 1}
+        assert owner.cancelled()
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        cache = EvaluationCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", {"n": 1})
+        cache.set("b", {"n": 2})
+        cache.get("a")
+        cache.set("c", {"n": 3})
+
+        assert cache.get("a")[0] == {"n": 1}
+        assert cache.get("b") == (None, MISS)
+        assert metrics.get(EVALUATION_CACHE_EVICTIONS_METRIC, reason="lru") == 1
+        assert metrics.get(EVALUATION_CACHE_ENTRIES_METRIC) == 2
+
+    def test_ttl_expiry(self):
+        """Test entries older than the TTL are dropped."""
+        cache = EvaluationCache(max_entries=10, ttl_seconds=60)
+        with patch("src.services.evaluation_cache.time.time", return_value=1000.0):
+            cache.set("a", {"n": 1})
+        with patch("src.services.evaluation_cache.time.time", return_value=1061.0):
+            assert cache.get("a") == (None, MISS)
+        assert metrics.get(EVALUATION_CACHE_EVICTIONS_METRIC, reason="expired") == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Test a new cache on the same directory serves earlier entries."""
+        EvaluationCache(max_entries=10, ttl_seconds=60, directory=str(tmp_path)).set("a", {"n": 1})
+
+        restarted = EvaluationCache(max_entries=10, ttl_seconds=60, directory=str(tmp_path))
+
+        assert restarted.get("a") == ({"n": 1}, DISK_HIT)
+        assert restarted.get("a") == ({"n": 1}, MEMORY_HIT)
+        assert json.loads((tmp_path / "a.json").read_text())["value"] == {"n": 1}
+
+    def test_expired_disk_entries_are_deleted(self, tmp_path):
+        """Test expired files are removed on lookup."""
+        cache = EvaluationCache(max_entries=0, ttl_seconds=60, directory=str(tmp_path))
+        with patch("src.services.evaluation_cache.time.time", return_value=1000.0):
+            cache.set("a", {"n": 1})
+        with patch("src.services.evaluation_cache.time.time", return_value=1061.0):
+            assert cache.get("a") == (None, MISS)
+        assert not (tmp_path / "a.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_computes(self):
+        """Test a zero TTL disables caching."""
+        cache = EvaluationCache(max_entries=10, ttl_seconds=0)
+        compute = AsyncMock(return_value={"score": 1})
+
+        await cache.get_or_compute("k", compute)
+        await cache.get_or_compute("k", compute)
+
+        assert compute.await_count == 2
+
+
+class TestAnalyzerCaching:
+    """Test cases for evaluation caching in ConversationAnalyzer."""
+
+    def _analyzer(self, cache):
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = json.dumps(EVALUATION)
+        client = Mock()
+        client.chat.completions.create = AsyncMock(return_value=response)
+        analyzer = ConversationAnalyzer(cache=cache)
+        analyzer.openai_client = Mock(get=Mock(return_value=client))
+        return analyzer, client
+
+    @pytest.mark.asyncio
+    async def test_repeated_analysis_calls_model_once(self):
+        """Test re-analyzing the same transcript reuses the evaluation."""
+        analyzer, client = self._analyzer(EvaluationCache(max_entries=10, ttl_seconds=60))
+        scenario = {"messages": [{"content": "Evaluate"}]}
+
+        first = await analyzer._call_evaluation_model(scenario, "user: Hello")
+        second = await analyzer._call_evaluation_model(scenario, "user: Hello")
+
+        assert first == second
+        assert second["speaking_tone_style"]["total"] == 24
+        client.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_different_transcript_or_scenario_misses(self):
+        """Test the key covers the transcript and the scenario prompt."""
+        analyzer, client = self._analyzer(EvaluationCache(max_entries=10, ttl_seconds=60))
+
+        await analyzer._call_evaluation_model({"messages": [{"content": "Evaluate"}]}, "user: Hello")
+        await analyzer._call_evaluation_model({"messages": [{"content": "Evaluate"}]}, "user: Hi")
+        await analyzer._call_evaluation_model({"messages": [{"content": "Judge"}]}, "user: Hello")
+
+        assert client.chat.completions.create.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_model_is_part_of_the_key(self):
+        """Test changing the model deployment bypasses earlier entries."""
+        analyzer, client = self._analyzer(EvaluationCache(max_entries=10, ttl_seconds=60))
+        scenario = {"messages": [{"content": "Evaluate"}]}
+
+        with patch.dict("src.services.analyzers.config._config", {"model_deployment_name": "gpt-4o"}):
+            await analyzer._call_evaluation_model(scenario, "user: Hello")
+        with patch.dict("src.services.analyzers.config._config", {"model_deployment_name": "gpt-4o-mini"}):
+            await analyzer._call_evaluation_model(scenario, "user: Hello")
+
+        assert client.chat.completions.create.await_count == 2
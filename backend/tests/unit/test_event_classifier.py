@@ -0,0 +1,60 @@
+"""Tests for the event_classifier module."""
+
+import json
+from unittest.mock import patch
+
+from src.services.event_classifier import EventClassifier, classify_event_type
+
+
+class TestClassifyEventType:
+    """Test cases for classify_event_type."""
+
+    def test_type_first(self):
+        """Test the type is read from the frame prefix."""
+        frame = json.dumps({"type": "response.audio.delta", "delta": "A" * 10000})
+
+        with patch("src.services.event_classifier.json.loads") as mock_loads:
+            assert classify_event_type(frame) == "response.audio.delta"
+            mock_loads.assert_not_called()
+
+    def test_type_after_event_id(self):
+        """Test a short field before the type does not force a full parse."""
+        frame = '{"event_id": "event_123", "type": "response.done", "response": {}}'
+
+        assert classify_event_type(frame) == "response.done"
+
+    def test_nested_type_before_top_level_type(self):
+        """Test a nested type field is not mistaken for the event type."""
+        frame = json.dumps({"item": {"type": "message"}, "type": "conversation.item.created"})
+
+        assert classify_event_type(frame) == "conversation.item.created"
+
+    def test_type_after_long_payload(self):
+        """Test frames with the type beyond the scan window fall back to a full parse."""
+        frame = json.dumps({"delta": "A" * 1000, "type": "response.audio.delta"})
+
+        assert classify_event_type(frame) == "response.audio.delta"
+
+    def test_non_event_frames(self):
+        """Test binary, invalid and untyped frames have no type."""
+        assert classify_event_type(b"\x00\x01") is None
+        assert classify_event_type("not json") is None
+        assert classify_event_type("[1, 2]") is None
+        assert classify_event_type('{"delta": "x"}') is None
+
+
+class TestEventClassifier:
+    """Test cases for EventClassifier."""
+
+    def test_only_inspected_types_are_decoded(self):
+        """Test only registered types carry a decoded event."""
+        classifier = EventClassifier(["response.done"])
+        classifier.register("session.updated")
+
+        delta = classifier.classify('{"type": "response.audio.delta", "delta": "AAAA"}')
+        done = classifier.classify('{"type": "response.done", "response": {"id": "r1"}}')
+        updated = classifier.classify('{"type": "session.updated", "session": {}}')
+
+        assert delta.type == "response.audio.delta" and delta.event is None
+        assert done.event == {"type": "response.done", "response": {"id": "r1"}}
+        assert updated.event == {"type": "session.updated", "session": {}}
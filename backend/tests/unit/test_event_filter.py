@@ -0,0 +1,74 @@
+"""Tests for the event_filter module."""
+
+import json
+
+import pytest
+
+from src.services.event_filter import (
+    BYTES_SAVED_METRIC,
+    EVENTS_FILTERED_METRIC,
+    EventFilter,
+    parse_event_patterns,
+)
+from src.services.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestParseEventPatterns:
+    """Test cases for parse_event_patterns."""
+
+    def test_parse_event_patterns(self):
+        """Test comma-separated patterns are split and trimmed."""
+        assert parse_event_patterns(" response.text.*, rate_limits.updated ,") == [
+            "response.text.*",
+            "rate_limits.updated",
+        ]
+        assert parse_event_patterns("") == []
+        assert parse_event_patterns(None) == []
+
+
+class TestEventFilter:
+    """Test cases for EventFilter."""
+
+    def test_disabled_forwards_everything(self):
+        """Test an unconfigured filter forwards every frame."""
+        event_filter = EventFilter()
+
+        assert not event_filter.enabled
+        assert event_filter.should_forward('{"type": "rate_limits.updated"}', "rate_limits.updated")
+
+    def test_denylist_with_wildcards(self):
+        """Test denied types are dropped and others forwarded."""
+        event_filter = EventFilter(deny=["response.text.*", "rate_limits.updated"])
+
+        assert not event_filter.allows("response.text.delta")
+        assert not event_filter.allows("rate_limits.updated")
+        assert event_filter.allows("response.audio.delta")
+        assert event_filter.allows(None)
+
+    def test_allowlist_and_denylist(self):
+        """Test the allowlist restricts types and the denylist takes precedence."""
+        event_filter = EventFilter(allow=["response.*", "session.updated"], deny=["response.text.*"])
+
+        assert event_filter.allows("response.audio.delta")
+        assert event_filter.allows("session.updated")
+        assert not event_filter.allows("response.text.delta")
+        assert not event_filter.allows("input_audio_buffer.speech_started")
+
+    def test_dropped_frames_are_counted(self):
+        """Test drop counters record events and bytes per type."""
+        event_filter = EventFilter(deny=["rate_limits.updated"])
+        frame = json.dumps({"type": "rate_limits.updated", "rate_limits": []})
+
+        assert not event_filter.should_forward(frame, "rate_limits.updated")
+        assert not event_filter.should_forward(frame, "rate_limits.updated")
+        assert event_filter.should_forward(b"\x00\x01", None)
+
+        assert metrics.get(EVENTS_FILTERED_METRIC, type="rate_limits.updated") == 2
+        assert metrics.get(BYTES_SAVED_METRIC, type="rate_limits.updated") == 2 * len(frame)
@@ -0,0 +1,82 @@
+"""Tests for the executors module."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.services.executors import (
+    EXECUTOR_ACTIVE_METRIC,
+    EXECUTOR_QUEUE_DEPTH_METRIC,
+    EXECUTOR_RUN_METRIC,
+    EXECUTOR_WAIT_METRIC,
+    ExecutorRegistry,
+    InstrumentedExecutor,
+)
+from src.services.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestInstrumentedExecutor:
+    """Test cases for InstrumentedExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_run_records_wait_and_run_time(self):
+        """Test calls run on named threads and record metrics."""
+        executor = InstrumentedExecutor("test", 1)
+
+        name = await executor.run(lambda: threading.current_thread().name)
+
+        assert name.startswith("test-")
+        assert metrics.get_histogram(EXECUTOR_WAIT_METRIC, executor="test")["count"] == 1
+        assert metrics.get_histogram(EXECUTOR_RUN_METRIC, executor="test")["count"] == 1
+        assert metrics.get(EXECUTOR_QUEUE_DEPTH_METRIC, executor="test") == 0
+        assert metrics.get(EXECUTOR_ACTIVE_METRIC, executor="test") == 0
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_while_saturated(self):
+        """Test queued calls are reported while all workers are busy, and released on cancel."""
+        executor = InstrumentedExecutor("test", 1)
+        release = threading.Event()
+
+        blocking = asyncio.create_task(executor.run(release.wait))
+        queued = asyncio.create_task(executor.run(lambda: None))
+        await asyncio.sleep(0.05)
+
+        assert metrics.get(EXECUTOR_ACTIVE_METRIC, executor="test") == 1
+        assert metrics.get(EXECUTOR_QUEUE_DEPTH_METRIC, executor="test") == 1
+
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert metrics.get(EXECUTOR_QUEUE_DEPTH_METRIC, executor="test") == 0
+
+        release.set()
+        await blocking
+        executor.shutdown()
+
+
+class TestExecutorRegistry:
+    """Test cases for ExecutorRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_executors_are_separate(self):
+        """Test a saturated executor does not delay another one."""
+        registry = ExecutorRegistry({"slow": 1, "fast": 1})
+        release = threading.Event()
+
+        slow = asyncio.create_task(registry.run("slow", release.wait))
+        assert await asyncio.wait_for(registry.run("fast", lambda: 42), 1) == 42
+
+        release.set()
+        await slow
+        assert registry.get("slow") is registry.get("slow")
+        with pytest.raises(KeyError):
+            registry.get("unknown")
+        registry.shutdown()
@@ -1,8 +1,11 @@
 """Tests for the graph_scenario_generator module."""
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
 
 from src.services.graph_scenario_generator import GraphScenarioGenerator
+from src.services.openai_client import shared_openai_client
 
 
 class TestGraphScenarioGenerator:
@@ -19,9 +22,8 @@ class TestGraphScenarioGenerator:
         generator = GraphScenarioGenerator()
         assert generator.openai_client is None
 
-    @patch("src.services.graph_scenario_generator.AzureOpenAI")
     @patch("src.services.graph_scenario_generator.config")
-    def test_initialization_success(self, mock_config, mock_azure_openai):
+    def test_initialization_success(self, mock_config):
         """Test successful initialization with proper config."""
         mock_config.__getitem__.side_effect = lambda key: {
             "azure_openai_endpoint": "https://test.openai.azure.com",
@@ -30,8 +32,7 @@ class TestGraphScenarioGenerator:
         }.get(key, "test-value")
 
         generator = GraphScenarioGenerator()
-        assert generator.openai_client is not None
-        mock_azure_openai.assert_called_once()
+        assert generator.openai_client is shared_openai_client
 
     @patch("src.services.graph_scenario_generator.config")
     def test_initialization_exception(self, mock_config):
@@ -42,21 +43,23 @@ class TestGraphScenarioGenerator:
         assert generator.openai_client is None
 
     @patch("src.services.graph_scenario_generator.config")
-    def test_generate_scenario_from_graph_empty_data(self, mock_config):
+    @pytest.mark.asyncio
+    async def test_generate_scenario_from_graph_empty_data(self, mock_config):
         """Test scenario generation with empty graph data."""
         mock_config.__getitem__.side_effect = lambda key: {
             "model_deployment_name": "gpt-4",
         }.get(key, "test-value")
 
         generator = GraphScenarioGenerator()
-        result = generator.generate_scenario_from_graph({})
+        result = await generator.generate_scenario_from_graph({})
 
         assert result["id"] == "graph-generated"
         assert result["name"] == "Your Personalized Sales Scenario"
         assert "generated_from_graph" in result
         assert result["generated_from_graph"] is True
 
-    def test_generate_scenario_from_graph_with_meetings(self):
+    @pytest.mark.asyncio
+    async def test_generate_scenario_from_graph_with_meetings(self):
         """Test scenario generation with meeting data."""
         with patch("src.services.graph_scenario_generator.config") as mock_config:
             mock_config.__getitem__.side_effect = lambda key: {
@@ -83,7 +86,7 @@ class TestGraphScenarioGenerator:
 
             generator = GraphScenarioGenerator()
             generator.openai_client = None  # Force use of fallback
-            result = generator.generate_scenario_from_graph(graph_data)
+            result = await generator.generate_scenario_from_graph(graph_data)
 
             assert result["id"] == "graph-generated"
             assert result["name"] == "Your Personalized Sales Scenario"
@@ -111,22 +114,24 @@ class TestGraphScenarioGenerator:
         expected = "- Team Standup with Alice, Bob\n" + "- Client Call with Charlie, Diana, Eve"
         assert result == expected
 
-    def test_create_graph_scenario_content_no_meetings(self):
+    @pytest.mark.asyncio
+    async def test_create_graph_scenario_content_no_meetings(self):
         """Test scenario content creation with no meetings."""
         generator = GraphScenarioGenerator()
-        result = generator._create_graph_scenario_content([])
+        result = await generator._create_graph_scenario_content([])
 
         # Should return fallback content
         assert "Jordan Martinez" in result
         assert "TechCorp Solutions" in result
 
-    def test_create_graph_scenario_content_no_openai_client(self):
+    @pytest.mark.asyncio
+    async def test_create_graph_scenario_content_no_openai_client(self):
         """Test scenario content creation with no OpenAI client."""
         generator = GraphScenarioGenerator()
         generator.openai_client = None
 
         meetings = [{"subject": "Test Meeting", "attendees": ["John"]}]
-        result = generator._create_graph_scenario_content(meetings)
+        result = await generator._create_graph_scenario_content(meetings)
 
         # Should return fallback content
         assert "Jordan Martinez" in result
@@ -134,7 +139,8 @@ class TestGraphScenarioGenerator:
 
     # pylint: disable=R0801
     @patch("src.services.graph_scenario_generator.config")
-    def test_create_graph_scenario_content_with_openai(self, mock_config):
+    @pytest.mark.asyncio
+    async def test_create_graph_scenario_content_with_openai(self, mock_config):
         """Test scenario content creation with OpenAI client."""
         mock_config.__getitem__.side_effect = lambda key: {
             "model_deployment_name": "gpt-4",
@@ -145,13 +151,13 @@ class TestGraphScenarioGenerator:
         mock_response = Mock()
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Generated scenario content"
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
         generator = GraphScenarioGenerator()
-        generator.openai_client = mock_client
+        generator.openai_client = Mock(get=Mock(return_value=mock_client))
 
         meetings = [{"subject": "Sales Call", "attendees": ["Alice", "Bob"]}]
-        result = generator._create_graph_scenario_content(meetings)
+        result = await generator._create_graph_scenario_content(meetings)
 
         assert result == "Generated scenario content"
         mock_client.chat.completions.create.assert_called_once()
@@ -159,7 +165,8 @@ class TestGraphScenarioGenerator:
     # pylint: enable=R0801
 
     @patch("src.services.graph_scenario_generator.config")
-    def test_create_graph_scenario_content_openai_none_response(self, mock_config):
+    @pytest.mark.asyncio
+    async def test_create_graph_scenario_content_openai_none_response(self, mock_config):
         """Test scenario content creation when OpenAI returns None content."""
         mock_config.__getitem__.side_effect = lambda key: {
             "model_deployment_name": "gpt-4",
@@ -170,13 +177,13 @@ class TestGraphScenarioGenerator:
         mock_response = Mock()
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = None
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
         generator = GraphScenarioGenerator()
-        generator.openai_client = mock_client
+        generator.openai_client = Mock(get=Mock(return_value=mock_client))
 
         meetings = [{"subject": "Sales Call", "attendees": ["Alice"]}]
-        result = generator._create_graph_scenario_content(meetings)
+        result = await generator._create_graph_scenario_content(meetings)
 
         assert result == ""
 
@@ -207,7 +214,8 @@ class TestGraphScenarioGenerator:
         assert "YOUR CHARACTER PROFILE" in result
         assert "KEY CONCERNS TO RAISE" in result
 
-    def test_generate_scenario_truncated_description(self):
+    @pytest.mark.asyncio
+    async def test_generate_scenario_truncated_description(self):
         """Test scenario generation with long description that gets truncated."""
         with patch("src.services.graph_scenario_generator.config") as mock_config:
             mock_config.__getitem__.side_effect = lambda key: {
@@ -225,13 +233,14 @@ class TestGraphScenarioGenerator:
             )
             generator._get_fallback_scenario_content = lambda: long_content
 
-            result = generator.generate_scenario_from_graph({})
+            result = await generator.generate_scenario_from_graph({})
 
             # Description should be truncated to 100 characters + "..."
             assert len(result["description"]) <= 103
             assert result["description"].endswith("...")
 
-    def test_generate_scenario_multiple_meetings_limit(self):
+    @pytest.mark.asyncio
+    async def test_generate_scenario_multiple_meetings_limit(self):
         """Test scenario generation limits meetings to first 3."""
         with patch("src.services.graph_scenario_generator.config") as mock_config:
             mock_config.__getitem__.side_effect = lambda key: {
@@ -245,10 +254,10 @@ class TestGraphScenarioGenerator:
 
             # Test the generate_scenario_from_graph method which processes meetings
             # We can test this by mocking the _create_graph_scenario_content method
-            with patch.object(generator, "_create_graph_scenario_content") as mock_create:
+            with patch.object(generator, "_create_graph_scenario_content", new_callable=AsyncMock) as mock_create:
                 mock_create.return_value = "Test scenario content"
 
-                generator.generate_scenario_from_graph(graph_data)
+                await generator.generate_scenario_from_graph(graph_data)
 
                 # Verify the method was called with limited meetings
                 assert mock_create.called
@@ -258,7 +267,8 @@ class TestGraphScenarioGenerator:
                 assert called_meetings[1]["subject"] == "Meeting 1"
                 assert called_meetings[2]["subject"] == "Meeting 2"
 
-    def test_generate_scenario_attendees_limit(self):
+    @pytest.mark.asyncio
+    async def test_generate_scenario_attendees_limit(self):
         """Test scenario generation limits attendees to first 3 per meeting."""
         with patch("src.services.graph_scenario_generator.config") as mock_config:
             mock_config.__getitem__.side_effect = lambda key: {
@@ -278,10 +288,10 @@ class TestGraphScenarioGenerator:
             generator = GraphScenarioGenerator()
 
             # Test by mocking the _create_graph_scenario_content method
-            with patch.object(generator, "_create_graph_scenario_content") as mock_create:
+            with patch.object(generator, "_create_graph_scenario_content", new_callable=AsyncMock) as mock_create:
                 mock_create.return_value = "Test scenario content"
 
-                generator.generate_scenario_from_graph(graph_data)
+                await generator.generate_scenario_from_graph(graph_data)
 
                 # Verify the method was called with limited attendees
                 assert mock_create.called
@@ -0,0 +1,105 @@
+"""Tests for the latency module."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.latency import (
+    FIRST_AUDIO_PROXY_DELAY_METRIC,
+    TIME_TO_FIRST_AUDIO_METRIC,
+    TURN_DURATION_METRIC,
+    UPSTREAM_CONNECT_METRIC,
+    SessionTimeline,
+)
+from src.services.metrics import metrics
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestSessionTimeline:
+    """Test cases for SessionTimeline."""
+
+    def test_upstream_connect_time(self):
+        """Test the upstream connect time is measured from the connect attempt."""
+        clock = FakeClock()
+        timeline = SessionTimeline("s1", clock)
+
+        clock.now = 1.0
+        timeline.mark_upstream_connecting()
+        clock.now = 1.25
+        timeline.mark_upstream_connected()
+
+        assert timeline.upstream_connect_seconds == 0.25
+        assert metrics.get_histogram(UPSTREAM_CONNECT_METRIC)["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_turn_latencies(self):
+        """Test time to first audio, turn duration and proxy delay per turn."""
+        clock = FakeClock()
+        timeline = SessionTimeline("s1", clock)
+        send = timeline.track_client_send(AsyncMock())
+
+        clock.now = 10.0
+        timeline.observe_upstream_event("input_audio_buffer.speech_stopped")
+        clock.now = 10.4
+        timeline.observe_upstream_event("response.audio.delta")
+        clock.now = 10.401
+        await send('{"type": "response.audio.delta", "delta": "AAAA"}')
+        clock.now = 10.5
+        timeline.observe_upstream_event("response.audio.delta")
+        clock.now = 12.0
+        timeline.observe_upstream_event("response.done")
+
+        assert timeline.time_to_first_audio == [pytest.approx(0.4)]
+        assert timeline.turn_durations == [pytest.approx(2.0)]
+        assert metrics.get_histogram(TIME_TO_FIRST_AUDIO_METRIC)["count"] == 1
+        assert metrics.get_histogram(TURN_DURATION_METRIC)["count"] == 1
+        assert metrics.get_histogram(FIRST_AUDIO_PROXY_DELAY_METRIC)["sum"] == pytest.approx(0.001)
+
+    def test_response_without_user_turn(self):
+        """Test responses not preceded by user speech are counted but not timed."""
+        timeline = SessionTimeline("s1", FakeClock())
+
+        timeline.observe_upstream_event("response.audio.delta")
+        timeline.observe_upstream_event("response.done")
+
+        assert timeline.responses == 1
+        assert timeline.time_to_first_audio == []
+        assert timeline.turn_durations == []
+
+    def test_summary(self):
+        """Test the session summary fields."""
+        clock = FakeClock()
+        timeline = SessionTimeline("s1", clock)
+        timeline.agent_id = "agent-1"
+        timeline.observe_upstream_event("input_audio_buffer.speech_stopped")
+        clock.now = 0.5
+        timeline.observe_upstream_event("response.audio.delta")
+        clock.now = 1.0
+        timeline.observe_upstream_event("response.done")
+        clock.now = 30.0
+
+        summary = timeline.summary()
+
+        assert summary["session_id"] == "s1"
+        assert summary["agent_id"] == "agent-1"
+        assert summary["duration_s"] == 30.0
+        assert summary["turns"] == 1
+        assert summary["ttfa_mean_s"] == 0.5
+        assert summary["turn_max_s"] == 1.0
+        assert summary["upstream_connect_s"] is None
@@ -0,0 +1,42 @@
+"""Tests for the load generator's ramp profile and run comparison."""
+
+import pytest
+
+from tools.load_test import compare, parse_stages, target_sessions
+
+
+class TestRampProfile:
+    """Test cases for ramp stage parsing and targets."""
+
+    def test_parse_stages(self):
+        """Test stages are parsed into session counts and durations."""
+        assert parse_stages("10:30,50:60") == [(10, 30.0), (50, 60.0)]
+
+    @pytest.mark.parametrize(
+        "elapsed,expected",
+        [(0, 0), (15, 5), (30, 10), (45, 10), (75, 30), (89.9, 50)],
+    )
+    def test_target_ramps_linearly_between_stages(self, elapsed, expected):
+        """Test each stage moves linearly from the previous target to its own."""
+        stages = [(10, 30.0), (10, 30.0), (50, 30.0)]
+
+        assert target_sessions(stages, elapsed) == expected
+
+    def test_target_is_none_after_last_stage(self):
+        """Test the run ends once every stage has elapsed."""
+        assert target_sessions([(10, 30.0)], 30.0) is None
+
+
+class TestCompare:
+    """Test cases for comparing two runs."""
+
+    def test_reports_change_of_metrics_in_both_runs(self):
+        """Test only metrics present in both runs are compared."""
+        baseline = {"ttfa_ms": {"p50": 200.0}, "proxy": None}
+        current = {"ttfa_ms": {"p50": 150.0}, "proxy": {"cpu_pct_mean": 20.0}}
+
+        lines = compare(current, baseline)
+
+        assert len(lines) == 1
+        assert lines[0].startswith("ttfa_ms.p50")
+        assert lines[0].endswith("(-25.0%)")
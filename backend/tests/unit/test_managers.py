@@ -292,3 +292,30 @@ class TestAgentManager:
         assert agent_config["is_foundry_agent"] is True
         assert agent_config["foundry_config"]["requiresCustomAgent"] is True
         assert agent_config["agent_connection_type"] == "foundry"
+
+    @patch("src.services.managers.config")
+    def test_agent_listeners_follow_configuration_changes(self, mock_config):
+        """Test listeners are told about created, updated and deleted agents."""
+        mock_config.__getitem__.side_effect = lambda key: {
+            "use_azure_ai_agents": False,
+            "model_deployment_name": "gpt-4o",
+        }.get(key, "default")
+
+        manager = AgentManager()
+        listener = Mock()
+        manager.add_listener(listener)
+
+        agent_id = manager.create_agent("test-scenario", {"messages": [{"content": "Test instructions"}]})
+        created = manager.agents[agent_id]
+        listener.assert_called_with(agent_id, created)
+
+        updated = manager.update_agent(agent_id, {"temperature": 0.2})
+        assert updated is not created
+        assert created["temperature"] == 0.7
+        assert updated["temperature"] == 0.2
+        listener.assert_called_with(agent_id, updated)
+
+        manager.delete_agent(agent_id)
+        listener.assert_called_with(agent_id, None)
+        assert manager.update_agent(agent_id, {"temperature": 0.5}) is None
+        assert listener.call_count == 3
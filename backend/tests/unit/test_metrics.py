@@ -0,0 +1,71 @@
+"""Tests for the metrics module."""
+
+from src.services.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+
+    def test_counters_accumulate_per_label_set(self):
+        """Test counters are tracked separately per label set."""
+        registry = MetricsRegistry()
+
+        registry.increment("requests_total", route="a")
+        registry.increment("requests_total", 2, route="a")
+        registry.increment("requests_total", route="b")
+
+        assert registry.get("requests_total", route="a") == 3
+        assert registry.get("requests_total", route="b") == 1
+        assert registry.get("requests_total", route="c") == 0
+
+    def test_gauges_set_and_remove(self):
+        """Test gauges can be set, overwritten and removed."""
+        registry = MetricsRegistry()
+
+        registry.set_gauge("queue_depth", 5, session="s1")
+        registry.set_gauge("queue_depth", 3, session="s1")
+        assert registry.get("queue_depth", session="s1") == 3
+
+        registry.remove_gauge("queue_depth", session="s1")
+        assert "queue_depth" not in registry.snapshot()
+
+    def test_snapshot(self):
+        """Test the JSON snapshot groups series by name."""
+        registry = MetricsRegistry()
+        registry.increment("hits_total", target="model=gpt-4o")
+
+        snapshot = registry.snapshot()
+
+        assert snapshot == {"hits_total": [{"labels": {"target": "model=gpt-4o"}, "value": 1.0}]}
+
+    def test_render_prometheus(self):
+        """Test Prometheus text exposition output."""
+        registry = MetricsRegistry()
+        registry.increment("hits_total", target='a"b')
+        registry.set_gauge("idle", 2)
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE hits_total counter" in text
+        assert 'hits_total{target="a\\"b"} 1.0' in text
+        assert "# TYPE idle gauge" in text
+        assert "idle 2" in text
+
+    def test_histograms(self):
+        """Test histogram observations in snapshots and Prometheus output."""
+        registry = MetricsRegistry()
+
+        registry.observe("latency_seconds", 0.05, buckets=(0.1, 1.0), route="a")
+        registry.observe("latency_seconds", 0.5, buckets=(0.1, 1.0), route="a")
+        registry.observe("latency_seconds", 3.0, buckets=(0.1, 1.0), route="a")
+
+        histogram = registry.get_histogram("latency_seconds", route="a")
+        assert histogram == {"count": 3, "sum": 3.55, "buckets": {"0.1": 1, "1.0": 2, "+Inf": 3}}
+        assert registry.snapshot()["latency_seconds"] == [{"labels": {"route": "a"}, "value": histogram}]
+        assert registry.get_histogram("latency_seconds", route="b") is None
+
+        text = registry.render_prometheus()
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{route="a",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{route="a",le="+Inf"} 3' in text
+        assert 'latency_seconds_count{route="a"} 3' in text
@@ -0,0 +1,70 @@
+"""Tests for the mock Voice Live server, driven through the voice proxy."""
+
+import asyncio
+import base64
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.config import config
+from src.services.websocket_handler import VoiceProxyHandler
+from tools.mock_voice_live import MockVoiceLiveServer
+
+
+class _ScriptedClient:
+    """Client transport that sends fixed frames, then waits for the first response to finish."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.received = []
+        self.response_done = asyncio.Event()
+
+    async def receive(self):
+        if self.frames:
+            return self.frames.pop(0)
+        await self.response_done.wait()
+        return None
+
+    async def send(self, message):
+        event = json.loads(message)
+        self.received.append(event)
+        if event["type"] == "response.done":
+            self.response_done.set()
+
+    async def close(self, code=1000):
+        pass
+
+
+class TestMockVoiceLiveServer:
+    """Test cases for MockVoiceLiveServer."""
+
+    @pytest.mark.asyncio
+    async def test_proxy_session_against_mock_server(self):
+        """Test a full turn through the proxy when the upstream URL points at the mock server."""
+        mock_server = MockVoiceLiveServer(
+            port=0, latency_ms=0, turn_audio_ms=200, reply_audio_ms=300, replies=["Hello there"], realtime=False
+        )
+        audio = base64.b64encode(bytes(4800)).decode("ascii")
+        client = _ScriptedClient(
+            [json.dumps({"type": "session.update", "session": {}})]
+            + [json.dumps({"type": "input_audio_buffer.append", "audio": audio})] * 2
+        )
+
+        await mock_server.start()
+        try:
+            with patch.dict(config._config, {"voice_live_url": mock_server.url, "azure_openai_api_key": ""}):
+                await asyncio.wait_for(VoiceProxyHandler(Mock()).handle_connection(client), 10)
+        finally:
+            await mock_server.stop()
+
+        types = [event["type"] for event in client.received]
+        assert types[0] == "proxy.connected"
+        assert "session.updated" in types
+        assert types.count("response.audio.delta") == 3
+        user = next(e for e in client.received if e["type"].endswith("input_audio_transcription.completed"))
+        assistant = next(e for e in client.received if e["type"] == "response.audio_transcript.done")
+        assert user["transcript"] == "User turn 1"
+        assert assistant["transcript"] == "Hello there"
+        assert types.index("input_audio_buffer.speech_stopped") < types.index("response.audio.delta")
+        assert mock_server.sessions == 1
@@ -0,0 +1,53 @@
+"""Tests for the openai_client module."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.services.openai_client import SharedOpenAIClient
+
+_CONFIG = {
+    "azure_openai_endpoint": "https://test.openai.azure.com",
+    "azure_openai_api_key": "test-key",
+    "api_version": "2024-12-01-preview",
+}
+
+
+def _provider():
+    return SharedOpenAIClient(
+        max_connections=5, max_keepalive_connections=2, keepalive_expiry_seconds=30, timeout_seconds=10
+    )
+
+
+class TestSharedOpenAIClient:
+    """Test cases for SharedOpenAIClient."""
+
+    @patch.dict("src.services.openai_client.config._config", _CONFIG)
+    @pytest.mark.asyncio
+    async def test_client_is_shared_within_a_loop(self):
+        """Test every caller on a loop gets the same client and connection pool."""
+        provider = _provider()
+
+        client = provider.get()
+
+        assert provider.get() is client
+        assert client.timeout == 10
+        pool = client._client._transport._pool  # pylint: disable=protected-access
+        assert pool._max_connections == 5  # pylint: disable=protected-access
+        assert pool._max_keepalive_connections == 2  # pylint: disable=protected-access
+        await provider.aclose()
+        assert client.is_closed()
+
+    @patch.dict("src.services.openai_client.config._config", _CONFIG)
+    def test_each_loop_gets_its_own_client(self):
+        """Test connections are never shared across event loops."""
+        provider = _provider()
+
+        async def get_client():
+            return provider.get()
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+
+        assert first is not second
@@ -0,0 +1,190 @@
+"""Tests for the rolling_evaluator module."""
+
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.analyzers import ConversationAnalyzer
+from src.services.background_loop import BackgroundLoop
+from src.services.evaluation_cache import EvaluationCache
+from src.services.metrics import metrics
+from src.services.rolling_evaluator import (
+    ROLLING_EVALUATION_FINAL_METRIC,
+    ROLLING_EVALUATION_UPDATES_METRIC,
+    RollingEvaluator,
+)
+from src.services.session_capture import ASSISTANT_TRANSCRIPT_TYPE, USER_TRANSCRIPT_TYPE, SessionCaptureStore
+
+
+def _state(tone, evidence):
+    return {
+        "speaking_tone_style": {"professional_tone": tone, "active_listening": 5, "engagement_quality": 5, "total": 0},
+        "conversation_content": {"needs_assessment": 10, "value_proposition": 10, "objection_handling": 10, "total": 0},
+        "overall_score": 0,
+        "strengths": ["Clear opening"],
+        "improvements": [],
+        "specific_feedback": "Solid so far.",
+        "evidence": evidence,
+    }
+
+
+@pytest.fixture
+def loop():
+    """Provide a background loop that is stopped after the test."""
+    background = BackgroundLoop(name="rolling-test")
+    yield background
+    background.stop()
+
+
+class TestRollingEvaluator:
+    """Test cases for RollingEvaluator."""
+
+    def setup_method(self):
+        """Set up a captured session and an analyzer with a mocked model."""
+        metrics.reset()
+        self.store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60)
+        self.capture = self.store.start("s1", scenario_id="test")
+        self.analyzer = ConversationAnalyzer(cache=EvaluationCache(max_entries=10, ttl_seconds=60))
+        self.analyzer.evaluation_scenarios = {"test": {"messages": [{"content": "Evaluate"}]}}
+        self.analyzer.openai_client = Mock()
+
+    def _say(self, role, text):
+        event_type = USER_TRANSCRIPT_TYPE if role == "user" else ASSISTANT_TRANSCRIPT_TYPE
+        self.capture.add_transcript({"type": event_type, "transcript": text})
+
+    def test_turns_update_state_and_final_merge_is_local(self, loop):
+        """Test each turn sends only the new turns and the final evaluation needs no extra call."""
+        calls = []
+
+        async def evaluate_turns(_scenario_id, state, new_transcript):
+            calls.append((state, new_transcript))
+            return _state(len(calls) + 5, [f"note {len(calls)}"])
+
+        self.analyzer.evaluate_turns = evaluate_turns
+        evaluator = RollingEvaluator(self.analyzer, ttl_seconds=60, loop=loop)
+        self.store.add_turn_listener(evaluator.on_turn)
+
+        self._say("user", "Hi, I'd like to learn about your needs")
+        self._say("assistant", "Sure")
+        loop.run(asyncio.sleep(0.05))
+        self._say("user", "What is your budget?")
+        self._say("assistant", "About 10k")
+
+        final = loop.run(evaluator.final_evaluation("s1", "test"))
+
+        assert calls[0] == (None, "user: Hi, I'd like to learn about your needs\nassistant: Sure")
+        assert calls[1][0]["evidence"] == ["note 1"]
+        assert calls[1][1] == "user: What is your budget?\nassistant: About 10k"
+        assert len(calls) == 2
+        assert "evidence" not in final
+        assert final["speaking_tone_style"]["total"] == 17
+        assert final["conversation_content"]["total"] == 30
+        assert final["overall_score"] == 47
+        assert metrics.get(ROLLING_EVALUATION_FINAL_METRIC, result="merged") == 1
+
+    def test_final_evaluation_catches_up_on_trailing_turns(self, loop):
+        """Test turns after the last update are evaluated before merging."""
+        self.analyzer.evaluate_turns = AsyncMock(return_value=_state(7, []))
+        evaluator = RollingEvaluator(self.analyzer, ttl_seconds=60, loop=loop)
+        self.store.add_turn_listener(evaluator.on_turn)
+
+        self._say("user", "Hello")
+        self._say("assistant", "Hi")
+        self._say("user", "Thanks, goodbye")
+
+        final = loop.run(evaluator.final_evaluation("s1", "test"))
+
+        assert final is not None
+        assert self.analyzer.evaluate_turns.await_args.args[2].endswith("user: Thanks, goodbye")
+        assert metrics.get(ROLLING_EVALUATION_UPDATES_METRIC, result="updated") >= 1
+
+    def test_one_update_at_a_time(self, loop):
+        """Test turns completed during an update are evaluated together by the same update."""
+        release = threading.Event()
+        transcripts = []
+
+        async def evaluate_turns(_scenario_id, _state_so_far, new_transcript):
+            transcripts.append(new_transcript)
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+            return _state(5, [])
+
+        self.analyzer.evaluate_turns = evaluate_turns
+        evaluator = RollingEvaluator(self.analyzer, ttl_seconds=60, loop=loop)
+        self.store.add_turn_listener(evaluator.on_turn)
+
+        self._say("user", "One")
+        self._say("assistant", "Two")
+        loop.run(asyncio.sleep(0.05))
+        self._say("user", "Three")
+        self._say("assistant", "Four")
+        self._say("user", "Five")
+        self._say("assistant", "Six")
+        release.set()
+        loop.run(evaluator.final_evaluation("s1", "test"))
+
+        assert transcripts == [
+            "user: One\nassistant: Two",
+            "user: Three\nassistant: Four\nuser: Five\nassistant: Six",
+        ]
+
+    def test_failed_update_falls_back_to_full_analysis(self, loop):
+        """Test no merged evaluation is returned when the running one is incomplete."""
+        self.analyzer.evaluate_turns = AsyncMock(return_value=None)
+        evaluator = RollingEvaluator(self.analyzer, ttl_seconds=60, loop=loop)
+        self.store.add_turn_listener(evaluator.on_turn)
+
+        self._say("user", "Hello")
+        self._say("assistant", "Hi")
+
+        assert loop.run(evaluator.final_evaluation("s1", "test")) is None
+        assert loop.run(evaluator.final_evaluation("unknown", "test")) is None
+        assert metrics.get(ROLLING_EVALUATION_UPDATES_METRIC, result="failed") >= 1
+        assert metrics.get(ROLLING_EVALUATION_FINAL_METRIC, result="incomplete") == 1
+        assert metrics.get(ROLLING_EVALUATION_FINAL_METRIC, result="unavailable") == 1
+
+    def test_unknown_scenario_is_not_evaluated(self, loop):
+        """Test sessions without an evaluation scenario are ignored."""
+        self.analyzer.evaluate_turns = AsyncMock()
+        evaluator = RollingEvaluator(self.analyzer, ttl_seconds=60, loop=loop)
+        capture = self.store.start("s2", scenario_id="other")
+
+        evaluator.on_turn(capture)
+
+        self.analyzer.evaluate_turns.assert_not_awaited()
+
+
+class TestTurnEvaluation:
+    """Test cases for the turn evaluation methods of ConversationAnalyzer."""
+
+    @pytest.mark.asyncio
+    async def test_evaluate_turns_sends_state_and_new_turns(self):
+        """Test the running evaluation and only the new turns are sent, and evidence is capped."""
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = json.dumps(_state(6, [f"n{i}" for i in range(12)]))
+        client = Mock()
+        client.chat.completions.create = AsyncMock(return_value=response)
+        analyzer = ConversationAnalyzer()
+        analyzer.evaluation_scenarios = {"test": {"messages": [{"content": "Evaluate"}]}}
+        analyzer.openai_client = Mock(get=Mock(return_value=client))
+
+        state = await analyzer.evaluate_turns("test", _state(5, ["earlier note"]), "user: New turn")
+
+        assert state["evidence"] == [f"n{i}" for i in range(4, 12)]
+        kwargs = client.chat.completions.create.call_args.kwargs
+        prompt = kwargs["messages"][1]["content"]
+        assert "earlier note" in prompt
+        assert "user: New turn" in prompt
+        assert kwargs["response_format"]["json_schema"]["name"] == "rolling_sales_evaluation"
+        assert "evidence" in kwargs["response_format"]["json_schema"]["schema"]["required"]
+
+    @pytest.mark.asyncio
+    async def test_evaluate_turns_unknown_scenario(self):
+        """Test turns of an unknown scenario are not evaluated."""
+        analyzer = ConversationAnalyzer()
+        analyzer.evaluation_scenarios = {}
+
+        assert await analyzer.evaluate_turns("missing", None, "user: Hi") is None
@@ -0,0 +1,118 @@
+"""Tests for the session_capture module."""
+
+import json
+from unittest.mock import patch
+
+from src.services.metrics import metrics
+from src.services.session_capture import (
+    ASSISTANT_TRANSCRIPT_TYPE,
+    CAPTURE_EVICTED_METRIC,
+    USER_TRANSCRIPT_TYPE,
+    SessionCaptureStore,
+    extract_audio,
+)
+
+
+class TestExtractAudio:
+    """Test cases for extract_audio."""
+
+    def test_extract_audio(self):
+        """Test the audio field is read from append frames."""
+        assert extract_audio(json.dumps({"type": "input_audio_buffer.append", "audio": "QUJD"})) == b"ABC"
+        assert extract_audio('{"type":"input_audio_buffer.append","audio":"QUJD","event_id":"e1"}') == b"ABC"
+        assert extract_audio('{"type": "input_audio_buffer.append"}') is None
+        assert extract_audio('{"type": "input_audio_buffer.append", "audio": "QUJ"}') is None
+        assert extract_audio(b"\x00") is None
+
+
+class TestSessionCaptureStore:
+    """Test cases for SessionCaptureStore and SessionCapture."""
+
+    def test_capture_audio_and_transcript(self):
+        """Test captured audio and transcripts are returned in analysis form."""
+        store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60)
+        capture = store.start("s1")
+
+        capture.add_audio(b"AB")
+        capture.add_audio(b"C")
+        capture.add_transcript({"type": USER_TRANSCRIPT_TYPE, "transcript": "Hi there"})
+        capture.add_transcript({"type": ASSISTANT_TRANSCRIPT_TYPE, "transcript": "Hello, how can I help?"})
+        capture.add_transcript({"type": USER_TRANSCRIPT_TYPE, "transcript": ""})
+
+        assert store.get("s1") is capture
+        assert capture.audio_data() == [{"type": "user", "data": "QUJD"}]
+        assert capture.transcript() == "user: Hi there\nassistant: Hello, how can I help?"
+        assert capture.reference_text() == "Hi there"
+
+    def test_turn_listeners(self):
+        """Test listeners are called after each assistant turn with the tagged capture."""
+        store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60)
+        turns = []
+        store.add_turn_listener(lambda capture: turns.append((capture.scenario_id, capture.messages_since(0))))
+        store.add_turn_listener(lambda capture: 1 / 0)
+        capture = store.start("s1", scenario_id="scenario-a")
+
+        capture.add_transcript({"type": USER_TRANSCRIPT_TYPE, "transcript": "Hi there"})
+        assert not turns
+        capture.add_transcript({"type": ASSISTANT_TRANSCRIPT_TYPE, "transcript": "Hello"})
+
+        assert turns == [
+            ("scenario-a", [{"role": "user", "content": "Hi there"}, {"role": "assistant", "content": "Hello"}])
+        ]
+        assert capture.messages_since(1) == [{"role": "assistant", "content": "Hello"}]
+
+    def test_audio_size_limit(self):
+        """Test audio beyond the size limit is not captured."""
+        store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=0.0001)
+        capture = store.start("s1")
+
+        capture.add_audio(b"AAAA")
+        capture.add_audio(b"A" * 100)
+        capture.add_audio(b"B")
+
+        assert capture.audio_chunks == [b"AAAA"]
+        assert capture.truncated
+
+    def test_shared_budget_evicts_oldest_ended_captures(self):
+        """Test the shared audio budget drops the captures of the sessions that ended first."""
+        store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60, max_total_bytes=10)
+        first, second = store.start("s1"), store.start("s2")
+        first.add_audio(b"A" * 4)
+        second.add_audio(b"B" * 4)
+        with patch("src.services.session_capture.time.monotonic", return_value=100.0):
+            store.end("s2")
+        with patch("src.services.session_capture.time.monotonic", return_value=101.0):
+            store.end("s1")
+
+        with patch("src.services.session_capture.time.monotonic", return_value=102.0):
+            third = store.start("s3")
+            third.add_audio(b"C" * 4)
+
+            assert store.get("s2") is None
+            assert store.get("s1") is first
+            assert store.total_bytes == 8
+        assert metrics.get(CAPTURE_EVICTED_METRIC) >= 1
+
+    def test_shared_budget_truncates_running_sessions(self):
+        """Test audio stops being captured when only running sessions hold the budget."""
+        store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60, max_total_bytes=6)
+        first, second = store.start("s1"), store.start("s2")
+        first.add_audio(b"A" * 4)
+        second.add_audio(b"B" * 4)
+
+        assert second.truncated and not second.audio_chunks
+        assert store.get("s1") is first
+        assert store.total_bytes == 4
+
+    def test_capture_expires_after_session_end(self):
+        """Test captures are dropped once the TTL after the session end has passed."""
+        store = SessionCaptureStore(ttl_seconds=10, max_audio_seconds=60)
+        store.start("s1")
+
+        with patch("src.services.session_capture.time.monotonic", return_value=100.0):
+            store.end("s1")
+        with patch("src.services.session_capture.time.monotonic", return_value=105.0):
+            assert store.get("s1") is not None
+        with patch("src.services.session_capture.time.monotonic", return_value=111.0):
+            assert store.get("s1") is None
+        assert store.get("unknown") is None
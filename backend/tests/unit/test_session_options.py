@@ -0,0 +1,36 @@
+"""Tests for the session_options module."""
+
+import json
+
+from src.services.session_options import SessionOptions, parse_session_options
+
+
+class TestParseSessionOptions:
+    """Test cases for parse_session_options."""
+
+    def test_reads_agent_and_binary_audio(self):
+        """Test the agent ID and binary audio mode are read from the session update."""
+        message = json.dumps({"type": "session.update", "session": {"agent_id": "agent-1", "binary_audio": True}})
+
+        assert parse_session_options(message) == SessionOptions(agent_id="agent-1", binary_audio=True)
+
+    def test_binary_audio_requires_explicit_true(self):
+        """Test binary audio stays off unless requested with a boolean true."""
+        message = json.dumps({"type": "session.update", "session": {"agent_id": "agent-1", "binary_audio": "yes"}})
+
+        assert parse_session_options(message).binary_audio is False
+
+    def test_output_sample_rate_must_be_supported(self):
+        """Test only supported output sample rates are accepted."""
+        low = json.dumps({"type": "session.update", "session": {"output_sample_rate": 8000}})
+        unsupported = json.dumps({"type": "session.update", "session": {"output_sample_rate": 11025}})
+
+        assert parse_session_options(low).output_sample_rate == 8000
+        assert parse_session_options(unsupported).output_sample_rate == 24000
+
+    def test_defaults_for_other_messages(self):
+        """Test anything other than a JSON session update yields the defaults."""
+        assert parse_session_options(None) == SessionOptions()
+        assert parse_session_options(b"\x00\x01") == SessionOptions()
+        assert parse_session_options("not json") == SessionOptions()
+        assert parse_session_options('{"type": "response.create"}') == SessionOptions()
@@ -0,0 +1,87 @@
+"""Tests for the session_registry module."""
+
+import signal
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.services.metrics import metrics
+from src.services.session_registry import (
+    ACTIVE_SESSIONS_METRIC,
+    REJECTED_AT_CAPACITY,
+    REJECTED_DRAINING,
+    SESSIONS_REJECTED_METRIC,
+    SessionRegistry,
+    install_drain_on_sigterm,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestSessionRegistry:
+    """Test cases for SessionRegistry."""
+
+    def test_admits_up_to_limit(self):
+        """Test sessions beyond the limit are rejected until one is released."""
+        registry = SessionRegistry(max_sessions=2)
+
+        assert registry.try_admit("a") is None
+        assert registry.try_admit("b") is None
+        assert registry.try_admit("c") == REJECTED_AT_CAPACITY
+        assert metrics.get(ACTIVE_SESSIONS_METRIC) == 2
+        assert metrics.get(SESSIONS_REJECTED_METRIC, reason=REJECTED_AT_CAPACITY) == 1
+
+        registry.release("a")
+        assert registry.try_admit("c") is None
+
+    def test_unlimited_by_default(self):
+        """Test no limit applies when max_sessions is 0."""
+        registry = SessionRegistry()
+
+        assert all(registry.try_admit(str(i)) is None for i in range(100))
+        assert registry.active_count == 100
+
+    def test_draining_rejects_and_waits_for_sessions(self):
+        """Test draining stops admission and wait_idle returns once sessions end."""
+        registry = SessionRegistry()
+        registry.try_admit("a")
+        registry.start_draining()
+
+        assert registry.try_admit("b") == REJECTED_DRAINING
+        assert not registry.wait_idle(0.01)
+
+        threading.Timer(0.05, registry.release, args=("a",)).start()
+        assert registry.wait_idle(2)
+
+
+class TestInstallDrainOnSigterm:
+    """Test cases for install_drain_on_sigterm."""
+
+    def test_sigterm_drains_then_calls_previous_handler(self):
+        """Test SIGTERM starts draining and chains to the previous handler once idle."""
+        registry = SessionRegistry()
+        previous = Mock()
+        done = threading.Event()
+        previous.side_effect = lambda *args: done.set()
+        handlers = {}
+
+        with (
+            patch("src.services.session_registry.signal.getsignal", return_value=previous),
+            patch("src.services.session_registry.signal.signal", side_effect=handlers.__setitem__),
+        ):
+            install_drain_on_sigterm(registry, timeout=5)
+
+        registry.try_admit("a")
+        handlers[signal.SIGTERM](signal.SIGTERM, None)
+
+        assert registry.draining
+        assert not done.wait(0.05)
+        registry.release("a")
+        assert done.wait(2)
+        previous.assert_called_once_with(signal.SIGTERM, None)
@@ -0,0 +1,172 @@
+"""Tests for the state_store module."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.services.managers import AgentManager
+from src.services.state_store import (
+    MemoryStateStore,
+    RedisStateStore,
+    SqliteStateStore,
+    StateStoreError,
+    StoredMapping,
+    create_state_store,
+)
+from tools.mock_redis import MockRedisServer
+
+
+@pytest.fixture
+def redis_server():
+    """Run a local Redis stand-in for the duration of a test."""
+    server = MockRedisServer(port=0)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    """Provide each state store backend."""
+    if request.param == "memory":
+        yield MemoryStateStore()
+    elif request.param == "sqlite":
+        sqlite_store = SqliteStateStore(str(tmp_path / "state.db"))
+        yield sqlite_store
+        sqlite_store.close()
+    else:
+        server = request.getfixturevalue("redis_server")
+        redis_store = RedisStateStore.from_url(server.url)
+        yield redis_store
+        redis_store.close()
+
+
+class TestStateStores:
+    """Test cases shared by all state store backends."""
+
+    def test_set_get_delete(self, store):
+        """Test values round-trip and can be deleted."""
+        store.set("agents", "a1", {"model": "gpt-4o", "temperature": 0.7})
+
+        assert store.get("agents", "a1") == {"model": "gpt-4o", "temperature": 0.7}
+        assert store.get("agents", "missing") is None
+        assert store.delete("agents", "a1") is True
+        assert store.delete("agents", "a1") is False
+        assert store.get("agents", "a1") is None
+
+    def test_namespaces_are_separate(self, store):
+        """Test keys are listed per namespace."""
+        store.set("agents", "a1", {"n": 1})
+        store.set("agents", "a2", {"n": 2})
+        store.set("scenarios", "s1", {"n": 3})
+
+        assert sorted(store.keys("agents")) == ["a1", "a2"]
+        assert store.keys("scenarios") == ["s1"]
+        assert store.keys("empty") == []
+
+    def test_stored_mapping(self, store):
+        """Test the dict-like view used by the managers."""
+        agents = StoredMapping(store, "agents")
+        agents["a1"] = {"model": "gpt-4o"}
+
+        assert "a1" in agents
+        assert "a2" not in agents
+        assert agents["a1"] == {"model": "gpt-4o"}
+        assert agents.get("a2") is None
+        assert list(agents) == ["a1"]
+        assert len(agents) == 1
+        del agents["a1"]
+        with pytest.raises(KeyError):
+            del agents["a1"]
+        with pytest.raises(KeyError):
+            _ = agents["a1"]
+
+
+class TestSharedState:
+    """Test cases for state shared between workers."""
+
+    def test_sqlite_store_is_shared_between_connections(self, tmp_path):
+        """Test a value written by one worker is read by another."""
+        path = str(tmp_path / "state.db")
+        writer = SqliteStateStore(path)
+        reader = SqliteStateStore(path)
+
+        writer.set("agents", "a1", {"created_at": datetime(2025, 1, 2, 3, 4, 5)})
+
+        assert reader.get("agents", "a1") == {"created_at": "2025-01-02T03:04:05"}
+
+    @patch("src.services.managers.config")
+    def test_agent_created_by_one_worker_is_found_by_another(self, mock_config, redis_server):
+        """Test agents are visible to every manager using the same store."""
+        mock_config.__getitem__.side_effect = lambda key: {
+            "use_azure_ai_agents": False,
+            "model_deployment_name": "gpt-4o",
+        }.get(key, "default")
+        with patch("src.services.managers.DefaultAzureCredential"):
+            worker_a = AgentManager(store=RedisStateStore.from_url(redis_server.url))
+            worker_b = AgentManager(store=RedisStateStore.from_url(redis_server.url))
+
+        agent_id = worker_a.create_agent("test-scenario", {"messages": [{"content": "Test instructions"}]})
+        agent_config = worker_b.get_agent(agent_id)
+
+        assert agent_config is not None
+        assert agent_config["instructions"].startswith("Test instructions")
+        assert agent_config["model"] == "gpt-4o"
+
+        worker_b.delete_agent(agent_id)
+        assert worker_a.get_agent(agent_id) is None
+
+    def test_redis_store_reconnects_after_server_restart(self):
+        """Test a broken connection is replaced on the next command."""
+        server = MockRedisServer(port=0)
+        server.start()
+        port = server.server_address[1]
+        store = RedisStateStore(port=port)
+        store.set("agents", "a1", {"n": 1})
+        server.stop()
+
+        restarted = MockRedisServer(port=port)
+        restarted.start()
+        try:
+            store.set("agents", "a1", {"n": 2})
+            assert store.get("agents", "a1") == {"n": 2}
+        finally:
+            store.close()
+            restarted.stop()
+
+    def test_redis_error_reply_is_raised(self, redis_server):
+        """Test error replies surface as StateStoreError."""
+        store = RedisStateStore.from_url(redis_server.url)
+
+        with pytest.raises(StateStoreError):
+            store._command("UNKNOWN")
+        store.close()
+
+
+class TestCreateStateStore:
+    """Test cases for create_state_store."""
+
+    def test_memory_is_the_default(self):
+        """Test an empty URL keeps state in the process."""
+        assert isinstance(create_state_store(""), MemoryStateStore)
+        assert isinstance(create_state_store("memory://"), MemoryStateStore)
+
+    def test_sqlite_url(self, tmp_path):
+        """Test a SQLite URL with an absolute path."""
+        store = create_state_store(f"sqlite:///{tmp_path}/state.db")
+
+        assert isinstance(store, SqliteStateStore)
+        assert store.path == f"{tmp_path}/state.db"
+
+    def test_redis_url(self):
+        """Test a Redis URL with password and database."""
+        store = create_state_store("redis://:s%40cret@cache.local:6380/2")
+
+        assert isinstance(store, RedisStateStore)
+        assert (store.host, store.port, store.db, store.password) == ("cache.local", 6380, 2, "s@cret")
+
+    def test_unsupported_scheme(self):
+        """Test unknown schemes are rejected."""
+        with pytest.raises(ValueError):
+            create_state_store("etcd://localhost")
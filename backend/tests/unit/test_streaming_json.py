@@ -0,0 +1,55 @@
+"""Tests for the streaming_json module."""
+
+import json
+
+import pytest
+
+from src.services.streaming_json import IncrementalObjectParser
+
+EVALUATION = {
+    "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9, "total": 0},
+    "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18, "total": 0},
+    "overall_score": 84,
+    "strengths": ['Asked about "goals"', "Closed with {next steps}"],
+    "improvements": [],
+    "specific_feedback": "Good, but [brief].",
+}
+
+
+class TestIncrementalObjectParser:
+    """Test cases for IncrementalObjectParser."""
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_members_are_yielded_as_they_complete(self, indent):
+        """Test feeding one character at a time yields each member once, in order."""
+        parser = IncrementalObjectParser()
+        members = []
+        for char in json.dumps(EVALUATION, indent=indent):
+            members.extend(parser.feed(char))
+
+        assert members == list(EVALUATION.items())
+        assert parser.done
+
+    def test_member_is_yielded_before_the_object_ends(self):
+        """Test a nested object is available as soon as its closing brace arrives."""
+        parser = IncrementalObjectParser()
+
+        assert parser.feed('{"speaking_tone_style": {"professional_tone": 8') == []
+        assert parser.feed(', "total": 8}') == [("speaking_tone_style", {"professional_tone": 8, "total": 8})]
+        assert parser.feed(', "overall_score": 8') == []
+        assert parser.feed("4}") == [("overall_score", 84)]
+        assert parser.done
+
+    def test_scalars_and_escapes(self):
+        """Test literals and escaped quotes inside strings."""
+        text = '{"a": true, "b": null, "c": -1.5e3, "d": "x\\\\\\"}"}'
+        parser = IncrementalObjectParser()
+
+        assert parser.feed(text) == [("a", True), ("b", None), ("c", -1500.0), ("d", 'x\\"}')]
+
+    def test_incomplete_object(self):
+        """Test a truncated response is not reported as done."""
+        parser = IncrementalObjectParser()
+        parser.feed('{"overall_score": 84, "strengths": ["a"')
+
+        assert not parser.done
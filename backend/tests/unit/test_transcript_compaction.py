@@ -0,0 +1,193 @@
+"""Tests for the transcript_compaction module."""
+
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.analyzers import ConversationAnalyzer
+from src.services.evaluation_cache import EvaluationCache
+from src.services.metrics import metrics
+from src.services.transcript_compaction import (
+    TRANSCRIPT_TOKENS_SAVED_METRIC,
+    TranscriptCompactor,
+    count_tokens,
+)
+
+
+class TestCountTokens:
+    """Test cases for count_tokens."""
+
+    def test_words_punctuation_and_long_words(self):
+        """Test words and punctuation count once and long words once per six characters."""
+        assert count_tokens("") == 0
+        assert count_tokens("Hello, world!") == 4
+        assert count_tokens("internationalization") == 4
+
+
+class TestTranscriptCompactor:
+    """Test cases for TranscriptCompactor."""
+
+    def setup_method(self):
+        """Reset metrics between tests."""
+        metrics.reset()
+
+    def test_filler_and_stutter_are_removed_from_user_turns(self):
+        """Test speech recognition noise is removed without changing the words that matter."""
+        compacted = TranscriptCompactor(1, 40).compact("user: Um, so I I I wanted to, uh, hmm, ask about pricing.")
+
+        assert compacted.text == "user: so I wanted to, ask about pricing."
+
+    def test_real_words_and_repeats_are_kept(self):
+        """Test units and deliberate repetitions are not mistaken for filler or stutter."""
+        transcript = "user: We had had 5 mm bolts, and that that was very very cheap. Hmm."
+
+        compacted = TranscriptCompactor(1, 40).compact(transcript)
+
+        assert compacted.text == "user: We had had 5 mm bolts, and that that was very very cheap."
+
+    @pytest.mark.parametrize(
+        "content, expected",
+        [
+            ("No no, that is not what I meant.", "No no, that is not what I meant."),
+            ("We spent so so much on it.", "We spent so so much on it."),
+            ("I want to to see the numbers.", "I want to see the numbers."),
+            ("The the the price is high.", "The price is high."),
+        ],
+    )
+    def test_only_stutters_are_collapsed(self, content, expected):
+        """Test emphatic repeats are kept while words that are never doubled, or said three times, collapse."""
+        compacted = TranscriptCompactor(1, 40).compact(f"user: {content}")
+
+        assert compacted.text == f"user: {expected}"
+
+    def test_duplicated_fragments_are_merged(self):
+        """Test a partial transcript repeated by a fuller one is kept once."""
+        transcript = "\n".join(
+            [
+                "user: What is your",
+                "user: What is your budget for this year?",
+                "user: And the timeline?",
+                "assistant: Around 200k.",
+            ]
+        )
+
+        compacted = TranscriptCompactor(1, 40).compact(transcript)
+
+        assert compacted.text == "user: What is your budget for this year? And the timeline?\nassistant: Around 200k."
+
+    @pytest.mark.parametrize(
+        "previous, current",
+        [
+            ("I know the budget is tight.", "No."),
+            ("Let me look at the numbers first.", "OK."),
+            ("Is that your final offer?", "Your final"),
+        ],
+    )
+    def test_short_turns_inside_other_words_are_kept(self, previous, current):
+        """Test only whole-word prefixes and suffixes count as repeated fragments."""
+        compacted = TranscriptCompactor(1, 40).compact(f"user: {previous}\nuser: {current}")
+
+        assert compacted.text == f"user: {previous} {current}"
+
+    def test_fragment_repeated_at_the_end_is_merged(self):
+        """Test a trailing fragment repeated on its own is kept once."""
+        compacted = TranscriptCompactor(1, 40).compact("user: I think we need a discount.\nuser: a discount")
+
+        assert compacted.text == "user: I think we need a discount."
+
+    def test_assistant_turns_are_trimmed_to_leading_sentences(self):
+        """Test assistant turns keep whole sentences up to the word limit."""
+        transcript = (
+            "user: Tell me about your priorities.\n"
+            "assistant: We are evaluating vendors. Cost matters most. Migration effort is the other big worry."
+        )
+
+        compacted = TranscriptCompactor(0, 8).compact(transcript)
+
+        assert (
+            compacted.text
+            == "user: Tell me about your priorities.\nassistant: We are evaluating vendors. Cost matters most. …"
+        )
+        assert compacted.tokens < compacted.original_tokens
+
+    def test_budget_omits_oldest_turns_but_keeps_opening_and_end(self):
+        """Test turns after the opening one are left out until the transcript fits."""
+        turns = [f"user: Question number {i} about the rollout plan?" for i in range(20)]
+        transcript = "\n".join(turn + "\nassistant: Good question." for turn in turns)
+
+        compacted = TranscriptCompactor(60, 40).compact(transcript)
+        lines = compacted.text.splitlines()
+
+        assert compacted.tokens <= 60
+        assert lines[0] == "user: Question number 0 about the rollout plan?"
+        assert lines[1].endswith("earlier turn(s) omitted]")
+        assert lines[-1] == "assistant: Good question."
+        assert metrics.get(TRANSCRIPT_TOKENS_SAVED_METRIC) == compacted.tokens_saved > 0
+
+    def test_unprefixed_lines_continue_the_previous_turn(self):
+        """Test multi-line turns are kept together."""
+        compacted = TranscriptCompactor(1, 40).compact("user: First line\nsecond line\nassistant: Ok")
+
+        assert compacted.text == "user: First line second line\nassistant: Ok"
+
+    @pytest.mark.parametrize("budget", [0, 100])
+    def test_within_budget_only_assistant_turns_are_trimmed(self, budget):
+        """Test user turns are only cleaned over an enabled budget, while assistant turns are always trimmed."""
+        transcript = "user: Um, so I I I wanted to ask.\nuser: ask\nassistant: Sure. We can talk about it now."
+
+        compacted = TranscriptCompactor(budget, 2).compact(transcript)
+
+        assert compacted.text == "user: Um, so I I I wanted to ask.\nuser: ask\nassistant: Sure. …"
+        assert metrics.get(TRANSCRIPT_TOKENS_SAVED_METRIC) == compacted.tokens_saved > 0
+
+    def test_zero_assistant_turn_limit_keeps_turns_whole(self):
+        """Test a word limit of 0 disables trimming of assistant turns within the budget."""
+        transcript = "user: Hello\nassistant: Sure. We can talk about it now."
+
+        assert TranscriptCompactor(0, 0).compact(transcript).text == transcript
+
+
+class TestAnalyzerCompaction:
+    """Test cases for compaction in ConversationAnalyzer."""
+
+    @pytest.mark.asyncio
+    async def test_compacted_transcript_is_sent_and_keys_the_cache(self):
+        """Test the prompt carries the compacted transcript, so noisy retries share a cache entry."""
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = json.dumps(
+            {
+                "speaking_tone_style": {
+                    "professional_tone": 8,
+                    "active_listening": 7,
+                    "engagement_quality": 9,
+                    "total": 0,
+                },
+                "conversation_content": {
+                    "needs_assessment": 20,
+                    "value_proposition": 22,
+                    "objection_handling": 18,
+                    "total": 0,
+                },
+                "overall_score": 84,
+                "strengths": [],
+                "improvements": [],
+                "specific_feedback": "",
+            }
+        )
+        client = Mock()
+        client.chat.completions.create = AsyncMock(return_value=response)
+        analyzer = ConversationAnalyzer(
+            cache=EvaluationCache(max_entries=10, ttl_seconds=60), compactor=TranscriptCompactor(1, 40)
+        )
+        analyzer.openai_client = Mock(get=Mock(return_value=client))
+        scenario = {"messages": [{"content": "Evaluate"}]}
+
+        await analyzer._call_evaluation_model(scenario, "user: Um, hello there")
+        await analyzer._call_evaluation_model(scenario, "user: hello there")
+
+        prompt = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "user: hello there" in prompt
+        assert "Um" not in prompt
+        client.chat.completions.create.assert_awaited_once()
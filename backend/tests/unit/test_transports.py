@@ -0,0 +1,133 @@
+"""Tests for the transports module."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+import simple_websocket.ws
+import websockets
+
+from src.services.executors import WEBSOCKET_RECEIVE_EXECUTOR, WEBSOCKET_SEND_EXECUTOR, ExecutorRegistry
+from src.services.transports import AsgiClientTransport, BlockingClientTransport, WebSocketsClientTransport
+
+
+class TestWebSocketsClientTransport:
+    """Test cases for WebSocketsClientTransport."""
+
+    @pytest.mark.asyncio
+    async def test_receive_returns_frame(self):
+        """Test receiving a frame from the connection."""
+        connection = AsyncMock()
+        connection.recv.return_value = "hello"
+
+        transport = WebSocketsClientTransport(connection)
+
+        assert await transport.receive() == "hello"
+
+    @pytest.mark.asyncio
+    async def test_receive_returns_none_when_closed(self):
+        """Test receive maps a closed connection to None."""
+        connection = AsyncMock()
+        connection.recv.side_effect = websockets.ConnectionClosed(None, None)
+
+        transport = WebSocketsClientTransport(connection)
+
+        assert await transport.receive() is None
+
+    @pytest.mark.asyncio
+    async def test_send(self):
+        """Test sending a frame to the connection."""
+        connection = AsyncMock()
+
+        transport = WebSocketsClientTransport(connection)
+        await transport.send("hello")
+
+        connection.send.assert_awaited_once_with("hello")
+
+
+class TestBlockingClientTransport:
+    """Test cases for BlockingClientTransport."""
+
+    @pytest.mark.asyncio
+    async def test_receive_and_send(self):
+        """Test receive and send are delegated to the blocking connection."""
+        ws = Mock()
+        ws.receive.return_value = "hello"
+
+        transport = BlockingClientTransport(ws)
+
+        assert await transport.receive() == "hello"
+        await transport.send("world")
+        ws.send.assert_called_once_with("world")
+
+    @pytest.mark.asyncio
+    async def test_send_does_not_wait_for_pending_receives(self):
+        """Test sends run in their own executor while every receive worker is blocked."""
+        release = threading.Event()
+        ws = Mock()
+        ws.receive.side_effect = lambda: release.wait(5) and None
+        sizes = {WEBSOCKET_RECEIVE_EXECUTOR: 1, WEBSOCKET_SEND_EXECUTOR: 1}
+
+        with patch("src.services.transports.executors", ExecutorRegistry(sizes)):
+            transport = BlockingClientTransport(ws)
+            receives = [asyncio.ensure_future(transport.receive()) for _ in range(2)]
+            await asyncio.wait_for(transport.send("world"), 1)
+            release.set()
+            await asyncio.gather(*receives)
+
+        ws.send.assert_called_once_with("world")
+
+    @pytest.mark.asyncio
+    async def test_receive_returns_none_when_closed(self):
+        """Test receive maps a closed connection to None."""
+        ws = Mock()
+        ws.receive.side_effect = simple_websocket.ws.ConnectionClosed()
+
+        transport = BlockingClientTransport(ws)
+
+        assert await transport.receive() is None
+
+
+class TestAsgiClientTransport:
+    """Test cases for AsgiClientTransport."""
+
+    @pytest.mark.asyncio
+    async def test_accept_and_receive(self):
+        """Test the handshake and receiving text and binary frames."""
+        events = [
+            {"type": "websocket.connect"},
+            {"type": "websocket.receive", "text": "hello"},
+            {"type": "websocket.receive", "bytes": b"\x00\x01"},
+            {"type": "websocket.disconnect", "code": 1000},
+        ]
+        send = AsyncMock()
+
+        async def receive():
+            return events.pop(0)
+
+        transport = AsgiClientTransport(receive, send)
+
+        assert await transport.accept() is True
+        send.assert_awaited_once_with({"type": "websocket.accept"})
+        assert await transport.receive() == "hello"
+        assert await transport.receive() == b"\x00\x01"
+        assert await transport.receive() is None
+        assert await transport.receive() is None
+
+    @pytest.mark.asyncio
+    async def test_send_and_close(self):
+        """Test sending frames and closing only once."""
+        send = AsyncMock()
+        transport = AsgiClientTransport(AsyncMock(), send)
+
+        await transport.send("text")
+        await transport.send(b"bytes")
+        await transport.close()
+        await transport.close()
+
+        assert [c.args[0] for c in send.call_args_list] == [
+            {"type": "websocket.send", "text": "text"},
+            {"type": "websocket.send", "bytes": b"bytes"},
+            {"type": "websocket.close", "code": 1000},
+        ]
@@ -0,0 +1,39 @@
+"""Tests for the upstream_resume module."""
+
+import json
+
+from src.services.upstream_resume import ConversationHistory
+
+
+class TestConversationHistory:
+    """Test cases for ConversationHistory."""
+
+    def test_replay_events_recreate_turns_in_order(self):
+        """Test completed turns are replayed as text conversation items."""
+        history = ConversationHistory()
+        history.add_transcript({"type": "conversation.item.input_audio_transcription.completed", "transcript": "Hi"})
+        history.add_transcript({"type": "response.audio_transcript.done", "transcript": "Hello, how can I help?"})
+
+        events = [json.loads(event) for event in history.replay_events()]
+
+        assert events == [
+            {
+                "type": "conversation.item.create",
+                "item": {"type": "message", "role": "user", "content": [{"type": "input_text", "text": "Hi"}]},
+            },
+            {
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": [{"type": "text", "text": "Hello, how can I help?"}],
+                },
+            },
+        ]
+
+    def test_empty_transcripts_are_ignored(self):
+        """Test transcript events without text add nothing to replay."""
+        history = ConversationHistory()
+        history.add_transcript({"type": "response.audio_transcript.done", "transcript": ""})
+
+        assert history.replay_events() == []
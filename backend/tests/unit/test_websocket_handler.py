@@ -1,13 +1,65 @@
 """Tests for the websocket_handler module."""
 
+import asyncio
+import base64
 import json
-from unittest.mock import AsyncMock, Mock, patch
+import threading
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
+from src.config import DEFAULT_UPSTREAM_RECONNECT_ATTEMPTS
+from src.services.audio_resampler import ResponseAudioDownsampler
+from src.services.event_filter import EventFilter
+from src.services.metrics import metrics
+from src.services.session_capture import SessionCaptureStore
+from src.services.session_options import SessionOptions
+from src.services.session_registry import SessionRegistry
 from src.services.websocket_handler import VoiceProxyHandler
 
 
+class _FakeUpstream:
+    """Upstream connection yielding fixed messages, optionally staying open afterwards."""
+
+    def __init__(self, messages=(), stay_open=False):
+        self.messages = list(messages)
+        self.stay_open = stay_open
+        self.sent = []
+        self.closed = False
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    async def close(self):
+        self.closed = True
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for message in self.messages:
+            yield message
+        if self.stay_open:
+            await asyncio.Event().wait()
+
+
+class _StalledUpstream(_FakeUpstream):
+    """Upstream whose sends never complete and which fails once told to."""
+
+    def __init__(self):
+        super().__init__()
+        self.fail = asyncio.Event()
+
+    async def send(self, message):
+        self.sent.append(message)
+        await asyncio.Event().wait()
+
+    async def _iterate(self):
+        await self.fail.wait()
+        return
+        yield  # pylint: disable=unreachable
+
+
 class TestVoiceProxyHandler:
     """Test cases for VoiceProxyHandler."""
 
@@ -18,19 +70,21 @@ class TestVoiceProxyHandler:
         handler = VoiceProxyHandler(agent_manager)
 
         assert handler.agent_manager == agent_manager
+        assert handler.upstream_reconnect_attempts == DEFAULT_UPSTREAM_RECONNECT_ATTEMPTS > 0
 
     @patch("src.services.websocket_handler.config")
     def test_build_azure_url_with_azure_agent(self, mock_config):
         """Test building Azure URL with Azure agent configuration."""
         mock_config.__getitem__.side_effect = lambda key: {
             "azure_ai_resource_name": "test-resource",
+            "voice_live_url": "",
             "azure_ai_project_name": "test-project",
         }.get(key, "default")
 
         handler = VoiceProxyHandler(Mock())
         agent_config = {"is_azure_agent": True, "model": "gpt-4o"}
 
-        url = handler._build_azure_url("agent-123", agent_config)
+        url = handler.session_payloads.get("agent-123", agent_config).url()
 
         assert "agent-id=agent-123" in url
         assert "test-resource" in url
@@ -41,14 +95,21 @@ class TestVoiceProxyHandler:
         """Test building Azure URL with local agent configuration."""
         mock_config.__getitem__.side_effect = lambda key: {
             "azure_ai_resource_name": "test-resource",
+            "voice_live_url": "",
             "azure_ai_project_name": "test-project",
             "model_deployment_name": "gpt-4o",
         }.get(key, "default")
 
         handler = VoiceProxyHandler(Mock())
-        agent_config = {"is_azure_agent": False, "model": "gpt-4"}
+        agent_config = {
+            "is_azure_agent": False,
+            "model": "gpt-4",
+            "instructions": "Test instructions",
+            "temperature": 0.7,
+            "max_tokens": 1000,
+        }
 
-        url = handler._build_azure_url("local-agent-123", agent_config)
+        url = handler.session_payloads.get("local-agent-123", agent_config).url()
 
         assert "model=gpt-4" in url
         assert "agent-id=" not in url or "agent-id=&" in url
@@ -59,28 +120,39 @@ class TestVoiceProxyHandler:
         """Test building Azure URL without agent configuration."""
         mock_config.__getitem__.side_effect = lambda key: {
             "azure_ai_resource_name": "test-resource",
+            "voice_live_url": "",
             "azure_ai_project_name": "test-project",
             "agent_id": "static-agent-123",
         }.get(key, "default")
 
         handler = VoiceProxyHandler(Mock())
 
-        url = handler._build_azure_url(None, None)
+        url = handler.session_payloads.get(None, None).url()
 
         assert "agent-id=static-agent-123" in url
         assert "test-resource" in url
 
     @patch("src.services.websocket_handler.config")
-    @pytest.mark.asyncio
-    async def test_send_initial_config_with_agent(self, mock_config):
-        """Test sending initial configuration with agent config."""
+    def test_build_azure_url_with_url_override(self, mock_config):
+        """Test the Voice Live endpoint can be pointed at a local stand-in server."""
+        mock_config.__getitem__.side_effect = lambda key: {
+            "voice_live_url": "ws://127.0.0.1:8765/voice-agent/realtime",
+            "model_deployment_name": "gpt-4o",
+            "agent_id": "",
+        }.get(key, "default")
+
+        url = VoiceProxyHandler(Mock()).session_payloads.get(None, None).url()
+
+        assert url.startswith("ws://127.0.0.1:8765/voice-agent/realtime?api-version=")
+        assert url.endswith("&model=gpt-4o")
+
+    @patch("src.services.websocket_handler.config")
+    def test_session_update_with_agent(self, mock_config):
+        """Test the compiled session update carries the local agent configuration."""
         mock_config.__getitem__.side_effect = lambda key: {"model_deployment_name": "gpt-4o"}.get(key, "default")
 
         handler = VoiceProxyHandler(Mock())
 
-        # Mock WebSocket
-        mock_azure_ws = AsyncMock()
-
         agent_config = {
             "model": "gpt-4",
             "instructions": "Test instructions",
@@ -88,56 +160,348 @@ class TestVoiceProxyHandler:
             "max_tokens": 1000,
         }
 
-        await handler._send_initial_config(mock_azure_ws, agent_config)
-
-        # Verify send was called
-        mock_azure_ws.send.assert_called_once()
-
-        # Parse the sent message
-        sent_message = json.loads(mock_azure_ws.send.call_args[0][0])
+        sent_message = json.loads(handler.session_payloads.get("local-agent-1", agent_config).session_update)
 
         assert sent_message["type"] == "session.update"
         assert sent_message["session"]["instructions"] == "Test instructions"
         assert sent_message["session"]["temperature"] == 0.8
         assert sent_message["session"]["max_response_output_tokens"] == 1000
 
-    @pytest.mark.asyncio
-    async def test_send_initial_config_without_agent(self):
-        """Test sending initial configuration without agent config."""
+    def test_session_update_without_agent(self):
+        """Test the compiled default session update has no agent configuration."""
         handler = VoiceProxyHandler(Mock())
 
-        # Mock WebSocket
-        mock_azure_ws = AsyncMock()
-
-        await handler._send_initial_config(mock_azure_ws, None)
-
-        # Verify send was called
-        mock_azure_ws.send.assert_called_once()
-
-        # Parse the sent message
-        sent_message = json.loads(mock_azure_ws.send.call_args[0][0])
+        sent_message = json.loads(handler.session_payloads.get(None, None).session_update)
 
         assert sent_message["type"] == "session.update"
         assert "model" not in sent_message["session"]
         assert "instructions" not in sent_message["session"]
 
+    @patch("src.services.websocket_handler.config")
+    def test_agent_session_compiled_at_creation(self, mock_config):
+        """Test agents are compiled when created, reused on connect, and dropped when deleted."""
+        mock_config.__getitem__.side_effect = lambda key: {"voice_live_url": "", "model_deployment_name": "gpt-4o"}.get(
+            key, "default"
+        )
+        agent_manager = Mock()
+        handler = VoiceProxyHandler(agent_manager)
+        on_agent_changed = agent_manager.add_listener.call_args[0][0]
+        agent_config = {"model": "gpt-4", "instructions": "Be brief", "temperature": 0.5, "max_tokens": 100}
+
+        compile_session = Mock(wraps=handler._compile_session)
+        handler.session_payloads._compile = compile_session
+
+        on_agent_changed("local-agent-1", agent_config)
+        first = handler.session_payloads.get("local-agent-1", agent_config)
+        second = handler.session_payloads.get("local-agent-1", agent_config)
+
+        assert compile_session.call_count == 1
+        assert first is second
+        assert first.url() != second.url()
+        assert first.url().endswith("&model=gpt-4")
+
+        updated = {**agent_config, "instructions": "Be verbose"}
+        on_agent_changed("local-agent-1", updated)
+        session = json.loads(handler.session_payloads.get("local-agent-1", updated).session_update)["session"]
+        assert session["instructions"] == "Be verbose"
+        assert compile_session.call_count == 2
+
+        on_agent_changed("local-agent-1", None)
+        assert len(handler.session_payloads) == 0
+
     @pytest.mark.asyncio
     async def test_send_message(self):
         """Test sending a message to WebSocket."""
         handler = VoiceProxyHandler(Mock())
 
-        # Mock WebSocket with executor
-        mock_ws = Mock()
+        mock_ws = AsyncMock()
+
+        message = {"type": "test", "data": "test data"}
+        await handler._send_message(mock_ws, message)
+
+        mock_ws.send.assert_awaited_once()
+        assert json.loads(mock_ws.send.call_args[0][0]) == message
+
+    @pytest.mark.asyncio
+    async def test_forward_client_to_azure_stops_on_disconnect(self):
+        """Test client frames are forwarded until the client disconnects."""
+        handler = VoiceProxyHandler(Mock())
+
+        client_ws = AsyncMock()
+        client_ws.receive.side_effect = ['{"type": "a"}', '{"type": "b"}', None]
+        inbound = AsyncMock()
+
+        await handler._forward_client_to_azure(client_ws, inbound)
+
+        assert [c.args[0] for c in inbound.put.call_args_list] == ['{"type": "a"}', '{"type": "b"}']
+
+    @pytest.mark.asyncio
+    async def test_handle_message_forwarding_removes_queue_gauges(self):
+        """Test forwarding ends on client disconnect and drops its queue depth gauges."""
+        handler = VoiceProxyHandler(Mock())
+
+        client_ws = AsyncMock()
+        client_ws.receive.side_effect = ['{"type": "a"}', None]
+        azure_ws = MagicMock()
+        azure_ws.send = AsyncMock()
+        azure_ws.__aiter__.return_value = []
+
+        await handler._handle_message_forwarding(client_ws, azure_ws, "session-1")
+
+        assert "voice_proxy_queue_depth" not in metrics.snapshot()
+
+    @pytest.mark.asyncio
+    async def test_forward_azure_to_client_applies_event_filter(self):
+        """Test filtered upstream events are not queued for the client."""
+        handler = VoiceProxyHandler(Mock(), event_filter=EventFilter(deny=["rate_limits.updated"]))
+
+        azure_ws = MagicMock()
+        azure_ws.__aiter__.return_value = ['{"type": "rate_limits.updated"}', '{"type": "response.done"}']
+        outbound = AsyncMock()
+
+        await handler._forward_azure_to_client(azure_ws, outbound)
+
+        assert [c.args[0] for c in outbound.put.call_args_list] == ['{"type": "response.done"}']
+
+    @pytest.mark.asyncio
+    async def test_forwarding_captures_audio_and_transcripts(self):
+        """Test user audio and completed transcripts are captured for the session."""
+        store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60)
+        handler = VoiceProxyHandler(Mock(), capture_store=store)
+        capture = store.start("s1")
+
+        client_ws = AsyncMock()
+        client_ws.receive.side_effect = ['{"type": "input_audio_buffer.append", "audio": "QUJD"}', None]
+        await handler._forward_client_to_azure(client_ws, AsyncMock(), capture)
+
+        azure_ws = MagicMock()
+        azure_ws.__aiter__.return_value = [
+            json.dumps({"type": "conversation.item.input_audio_transcription.completed", "transcript": "Hi"}),
+            json.dumps({"type": "response.audio_transcript.done", "transcript": "Hello"}),
+        ]
+        await handler._forward_azure_to_client(azure_ws, AsyncMock(), capture)
+
+        assert capture.audio_chunks == [b"ABC"]
+        assert capture.transcript() == "user: Hi\nassistant: Hello"
+
+    @pytest.mark.asyncio
+    async def test_binary_audio_frames_are_wrapped_and_captured(self):
+        """Test binary PCM frames become append events when the client negotiated binary audio."""
+        store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60)
+        handler = VoiceProxyHandler(Mock(), capture_store=store)
+        capture = store.start("s1")
+
+        client_ws = AsyncMock()
+        client_ws.receive.side_effect = [b"ABC", '{"type": "response.create"}', None]
+        inbound = AsyncMock()
+        await handler._forward_client_to_azure(client_ws, inbound, capture, binary_audio=True)
+
+        queued = [c.args[0] for c in inbound.put.call_args_list]
+        assert json.loads(queued[0]) == {"type": "input_audio_buffer.append", "audio": "QUJD"}
+        assert queued[1] == '{"type": "response.create"}'
+        assert capture.audio_chunks == [b"ABC"]
+
+    @pytest.mark.asyncio
+    async def test_forward_azure_to_client_downsamples_response_audio(self):
+        """Test response audio is resampled for sessions that asked for a lower rate."""
+        handler = VoiceProxyHandler(Mock())
+        delta = json.dumps({"type": "response.audio.delta", "delta": base64.b64encode(bytes(4800)).decode()})
+
+        azure_ws = MagicMock()
+        azure_ws.__aiter__.return_value = [delta, '{"type": "response.done"}']
+        outbound = AsyncMock()
+        await handler._forward_azure_to_client(azure_ws, outbound, downsampler=ResponseAudioDownsampler("s1", 8000))
+
+        queued = [c.args[0] for c in outbound.put.call_args_list]
+        assert len(base64.b64decode(json.loads(queued[0])["delta"])) == 1600
+        assert queued[1] == '{"type": "response.done"}'
+
+    @pytest.mark.asyncio
+    async def test_binary_frames_pass_through_without_negotiation(self):
+        """Test binary frames are forwarded unchanged unless binary audio was negotiated."""
+        handler = VoiceProxyHandler(Mock())
+
+        client_ws = AsyncMock()
+        client_ws.receive.side_effect = [b"ABC", None]
+        inbound = AsyncMock()
+        await handler._forward_client_to_azure(client_ws, inbound)
+
+        inbound.put.assert_awaited_once_with(b"ABC")
+
+    @pytest.mark.asyncio
+    async def test_handle_connection_rejects_when_at_capacity(self):
+        """Test sessions over the limit get a retry hint and a try-again-later close."""
+        registry = SessionRegistry(max_sessions=1, retry_after_seconds=2)
+        registry.try_admit("existing")
+        handler = VoiceProxyHandler(Mock(), session_registry=registry)
+        client_ws = AsyncMock()
+
+        await handler.handle_connection(client_ws)
+
+        error = json.loads(client_ws.send.call_args.args[0])
+        assert error["error"]["code"] == "session_rejected_capacity"
+        assert error["error"]["retry_after_ms"] == 2000
+        client_ws.close.assert_awaited_once_with(1013)
+        client_ws.receive.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_session_id_sent_only_when_captured(self):
+        """Test the client only gets a session id to analyze by when its session is captured."""
+        for store in (None, SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60)):
+            handler = VoiceProxyHandler(Mock(), capture_store=store)
+            handler._connect_to_azure = AsyncMock(return_value=_FakeUpstream())
+            client_ws = AsyncMock()
+            client_ws.receive.side_effect = ["{}", None]
+
+            await handler.handle_connection(client_ws)
+
+            connected = json.loads(client_ws.send.call_args_list[0].args[0])
+            assert connected["type"] == "proxy.connected"
+            assert ("session_id" in connected) == (store is not None)
+            if store is not None:
+                assert store.get(connected["session_id"]) is not None
+
+    @patch("src.services.websocket_handler.config")
+    @pytest.mark.asyncio
+    async def test_connect_to_azure_uses_warm_connection(self, mock_config):
+        """Test a pooled connection only receives the agent-specific session update."""
+        mock_config.__getitem__.side_effect = lambda key: {"model_deployment_name": "gpt-4o"}.get(key, "default")
+
+        agent_manager = Mock()
+        agent_manager.get_agent.return_value = {
+            "is_azure_agent": False,
+            "model": "gpt-4o",
+            "instructions": "Be a customer",
+            "temperature": 0.7,
+            "max_tokens": 500,
+        }
+        handler = VoiceProxyHandler(agent_manager, upstream_pool_size=1)
+        warm_ws = AsyncMock()
+        handler.connection_pool = Mock()
+        handler.connection_pool.acquire = AsyncMock(return_value=warm_ws)
+
+        azure_ws = await handler._connect_to_azure("local-agent-1")
+
+        assert azure_ws is warm_ws
+        sent_message = json.loads(warm_ws.send.call_args[0][0])
+        assert sent_message["session"] == {
+            "model": "gpt-4o",
+            "instructions": "Be a customer",
+            "temperature": 0.7,
+            "max_response_output_tokens": 500,
+        }
+
+    @pytest.mark.asyncio
+    async def test_agent_lookup_runs_off_the_event_loop(self):
+        """Test a blocking state store lookup does not run on the event loop thread."""
+        lookup_threads = []
+        agent_manager = Mock()
+        agent_manager.get_agent.side_effect = lambda agent_id: lookup_threads.append(threading.get_ident()) or {
+            "scenario_id": "scenario-a"
+        }
+        store = SessionCaptureStore(ttl_seconds=60, max_audio_seconds=60)
+        handler = VoiceProxyHandler(agent_manager, capture_store=store)
+
+        capture = await handler._start_capture("s1", "agent-1")
+
+        assert capture is not None and capture.scenario_id == "scenario-a"
+        assert lookup_threads and threading.get_ident() not in lookup_threads
+        assert await handler._get_agent(None) is None
+
+    def test_pool_disabled_by_default(self):
+        """Test no connection pool is created unless a size is configured."""
+        handler = VoiceProxyHandler(Mock())
+
+        assert handler.connection_pool is None
+
+    @pytest.mark.asyncio
+    async def test_forwarding_resumes_on_new_upstream_after_failure(self):
+        """Test a dropped upstream is replaced and the conversation replayed while the client stays connected."""
+        handler = VoiceProxyHandler(Mock(), upstream_reconnect_attempts=2, upstream_reconnect_backoff_seconds=0)
+        dropped_ws = _FakeUpstream(
+            [
+                json.dumps({"type": "conversation.item.input_audio_transcription.completed", "transcript": "Hi"}),
+                json.dumps({"type": "response.audio_transcript.done", "transcript": "Hello"}),
+            ]
+        )
+        new_ws = _FakeUpstream(stay_open=True)
+        handler._connect_to_azure = AsyncMock(side_effect=[None, new_ws])
+
+        async def receive():
+            while len(new_ws.sent) < 2:
+                await asyncio.sleep(0.01)
+            return None
+
+        client_ws = AsyncMock()
+        client_ws.receive.side_effect = receive
+        successes = metrics.get("voice_proxy_upstream_reconnects_total", result="success")
+
+        await handler._handle_message_forwarding(
+            client_ws, dropped_ws, "s1", options=SessionOptions(agent_id="agent-1")
+        )
+
+        handler._connect_to_azure.assert_awaited_with("agent-1")
+        assert [json.loads(event)["item"]["role"] for event in new_ws.sent] == ["user", "assistant"]
+        assert dropped_ws.closed and new_ws.closed
+        sent_types = [json.loads(c.args[0])["type"] for c in client_ws.send.call_args_list]
+        assert "proxy.upstream.reconnecting" in sent_types
+        assert "proxy.upstream.reconnected" in sent_types
+        assert metrics.get("voice_proxy_upstream_reconnects_total", result="success") == successes + 1
+
+    @pytest.mark.parametrize("audio_coalesce_ms", [0, 200])
+    @pytest.mark.asyncio
+    async def test_reconnect_keeps_inbound_frames_in_flight(self, audio_coalesce_ms):
+        """Test frames being sent to, or buffered for, a failed upstream reach the new one."""
+        handler = VoiceProxyHandler(
+            Mock(),
+            upstream_reconnect_attempts=1,
+            upstream_reconnect_backoff_seconds=0,
+            audio_coalesce_ms=audio_coalesce_ms,
+        )
+        dropped_ws = _StalledUpstream()
+        new_ws = _FakeUpstream(stay_open=True)
+        handler._connect_to_azure = AsyncMock(return_value=new_ws)
+        frames = [
+            json.dumps({"type": "input_audio_buffer.append", "audio": "QUJD"}),
+            json.dumps({"type": "input_audio_buffer.append", "audio": "REVG"}),
+        ]
+
+        async def receive():
+            if frames:
+                return frames.pop(0)
+            # Let the drain take the frames before the upstream fails
+            await asyncio.sleep(0.05)
+            dropped_ws.fail.set()
+            for _ in range(100):
+                if new_ws.sent:
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            return None
+
+        client_ws = AsyncMock()
+        client_ws.receive.side_effect = receive
+
+        await handler._handle_message_forwarding(client_ws, dropped_ws, "s1")
+
+        audio = b"".join(base64.b64decode(json.loads(frame)["audio"]) for frame in new_ws.sent)
+        assert audio == b"ABCDEF"
+
+    @pytest.mark.asyncio
+    async def test_forwarding_ends_when_reconnect_fails(self):
+        """Test the session ends with an error once every reconnect attempt has failed."""
+        handler = VoiceProxyHandler(Mock(), upstream_reconnect_attempts=2, upstream_reconnect_backoff_seconds=0)
+        handler._connect_to_azure = AsyncMock(return_value=None)
+
+        async def receive():
+            await asyncio.Event().wait()
 
-        with patch("asyncio.get_event_loop") as mock_loop:
-            mock_loop.return_value.run_in_executor = AsyncMock(return_value=None)
+        client_ws = AsyncMock()
+        client_ws.receive.side_effect = receive
+        failures = metrics.get("voice_proxy_upstream_reconnects_total", result="failure")
 
-            message = {"type": "test", "data": "test data"}
-            await handler._send_message(mock_ws, message)
+        await handler._handle_message_forwarding(client_ws, _FakeUpstream(), "s1")
 
-            # Verify executor was called with correct arguments
-            mock_loop.return_value.run_in_executor.assert_called_once()
-            args = mock_loop.return_value.run_in_executor.call_args[0]
-            assert args[0] is None  # executor
-            assert args[1] == mock_ws.send  # function
-            assert json.loads(args[2]) == message  # message
+        assert handler._connect_to_azure.await_count == 2
+        assert json.loads(client_ws.send.call_args.args[0])["type"] == "error"
+        assert metrics.get("voice_proxy_upstream_reconnects_total", result="failure") == failures + 1
@@ -0,0 +1 @@
+"""Developer tooling (benchmarks and load testing) for the upskilling agent backend."""
@@ -0,0 +1,87 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Compare binary PCM16 microphone frames against JSON ``input_audio_buffer.append`` frames.
+
+For each chunk duration it reports the client-to-proxy payload size and the proxy CPU
+time spent turning the client frame into the upstream frame, with session capture
+enabled as in the default configuration. WebSocket framing adds the same few bytes of
+header to both modes and is not included.
+
+Usage:
+    cd backend && python -m tools.bench_binary_audio --iterations 20000
+"""
+
+import argparse
+import base64
+import json
+import os
+import timeit
+from typing import Any, Callable, Dict, List
+from unittest.mock import Mock
+
+from src.services.session_capture import SessionCapture
+from src.services.transports import Frame
+from src.services.websocket_handler import VoiceProxyHandler
+
+# Bytes per millisecond of 24 kHz PCM16 audio
+PCM_BYTES_PER_MS = 48
+DURATIONS_MS = (20, 100, 200, 500)
+
+
+def _time_per_call(func: Callable[[], Any], iterations: int) -> float:
+    """Return the best-of-three time per call in microseconds."""
+    return min(timeit.repeat(func, number=iterations, repeat=3)) / iterations * 1_000_000
+
+
+def _prepare(handler: VoiceProxyHandler, frame: Frame, binary_audio: bool) -> Callable[[], Any]:
+    """Build a call that prepares one client frame with a capture that never fills up."""
+    capture = SessionCapture("bench", max_audio_bytes=0)
+    capture.truncated = True
+    return lambda: handler._prepare_client_frame(frame, capture, binary_audio)  # pylint: disable=protected-access
+
+
+def main() -> None:
+    """Run the binary audio benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="Calls per measurement")
+    parser.add_argument("--output", help="Optional path to write JSON results")
+    args = parser.parse_args()
+
+    handler = VoiceProxyHandler(Mock())
+    results: List[Dict[str, Any]] = []
+    for duration_ms in DURATIONS_MS:
+        pcm = os.urandom(duration_ms * PCM_BYTES_PER_MS)
+        json_frame = json.dumps({"type": "input_audio_buffer.append", "audio": base64.b64encode(pcm).decode("ascii")})
+        assert handler._prepare_client_frame(pcm, None, True) == json_frame  # pylint: disable=protected-access
+
+        json_us = _time_per_call(_prepare(handler, json_frame, False), args.iterations)
+        binary_us = _time_per_call(_prepare(handler, pcm, True), args.iterations)
+        results.append(
+            {
+                "audio_ms": duration_ms,
+                "json_bytes": len(json_frame),
+                "binary_bytes": len(pcm),
+                "bytes_saved_pct": round(100 * (1 - len(pcm) / len(json_frame)), 1),
+                "json_proxy_us": round(json_us, 3),
+                "binary_proxy_us": round(binary_us, 3),
+            }
+        )
+
+    for result in results:
+        print(
+            f"{result['audio_ms']:>4}ms: json={result['json_bytes']}B binary={result['binary_bytes']}B "
+            f"(-{result['bytes_saved_pct']}%) proxy cpu json={result['json_proxy_us']:.2f}us "
+            f"binary={result['binary_proxy_us']:.2f}us"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Microbenchmark event type classification against a full JSON decode.
+
+Frames are shaped like the ``response.audio.delta`` and ``input_audio_buffer.append``
+events the proxy forwards, carrying base64 PCM16 audio at 24 kHz.
+
+Usage:
+    cd backend && python -m tools.bench_classifier --iterations 20000
+"""
+
+import argparse
+import base64
+import json
+import os
+import timeit
+from typing import Any, Dict, List
+
+from src.services.event_classifier import classify_event_type
+
+# Bytes per millisecond of 24 kHz PCM16 audio
+PCM_BYTES_PER_MS = 48
+DURATIONS_MS = (20, 100, 200, 500)
+
+
+def _frames(duration_ms: int) -> Dict[str, str]:
+    """Build realistic audio event frames for a chunk duration."""
+    audio = base64.b64encode(os.urandom(duration_ms * PCM_BYTES_PER_MS)).decode("ascii")
+    return {
+        "response.audio.delta": json.dumps(
+            {
+                "type": "response.audio.delta",
+                "event_id": "event_B3kL9pQz7XwR2mNv",
+                "response_id": "resp_B3kL9oYx1VtQ8sLm",
+                "item_id": "item_B3kL9oZy2WuR9tMn",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": audio,
+            }
+        ),
+        "input_audio_buffer.append": json.dumps({"type": "input_audio_buffer.append", "audio": audio}),
+    }
+
+
+def _time_per_call(func: Any, frame: str, iterations: int) -> float:
+    """Return the best-of-three time per call in microseconds."""
+    return min(timeit.repeat(lambda: func(frame), number=iterations, repeat=3)) / iterations * 1_000_000
+
+
+def main() -> None:
+    """Run the classifier microbenchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="Calls per measurement")
+    parser.add_argument("--output", help="Optional path to write JSON results")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for duration_ms in DURATIONS_MS:
+        for event_type, frame in _frames(duration_ms).items():
+            assert classify_event_type(frame) == event_type
+            json_us = _time_per_call(lambda f: json.loads(f)["type"], frame, args.iterations)
+            classifier_us = _time_per_call(classify_event_type, frame, args.iterations)
+            results.append(
+                {
+                    "type": event_type,
+                    "audio_ms": duration_ms,
+                    "frame_bytes": len(frame),
+                    "json_loads_us": round(json_us, 3),
+                    "classifier_us": round(classifier_us, 3),
+                    "speedup": round(json_us / classifier_us, 1),
+                }
+            )
+
+    for result in results:
+        print(
+            f"{result['type']:>26} {result['audio_ms']:>4}ms {result['frame_bytes']:>6}B: "
+            f"json.loads={result['json_loads_us']:.2f}us classifier={result['classifier_us']:.2f}us "
+            f"({result['speedup']}x)"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Benchmark voice proxy forwarding latency and CPU per session.
+
+Compares the threaded transport used by the Flask/flask-sock route (every receive and
+send handed to a thread pool) with the native asyncio transport. The proxy runs in a
+child process so its CPU time can be measured in isolation; clients and a local echo
+server that stands in for Azure run in the parent.
+
+Usage:
+    cd backend && python -m tools.bench_forwarding --sessions 20 --messages 100
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import multiprocessing.connection
+import multiprocessing.process
+import os
+import statistics
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from unittest.mock import Mock
+
+import websockets
+import websockets.asyncio.client
+import websockets.asyncio.server
+import websockets.sync.server
+
+from src.services.transports import BlockingClientTransport, WebSocketsClientTransport
+from src.services.websocket_handler import VoiceProxyHandler
+
+MODES = ("blocking", "native")
+HOST = "127.0.0.1"
+# 100 ms of 24 kHz PCM16, matching the browser recorder worklet
+AUDIO_CHUNK_BYTES = 4800
+STOP_POLL_INTERVAL = 0.05
+DRAIN_TIMEOUT = 30.0
+# Seconds to wait for the proxy process to start or to report its CPU time
+PROXY_TIMEOUT = 30.0
+
+
+class _SimpleWebSocketShim:
+    """Expose a sync ``websockets`` connection with the ``simple_websocket`` API."""
+
+    def __init__(self, connection: websockets.sync.server.ServerConnection):
+        self.connection = connection
+
+    def receive(self) -> Optional[Any]:
+        try:
+            return self.connection.recv()
+        except websockets.ConnectionClosed:
+            return None
+
+    def send(self, message: Any) -> None:
+        self.connection.send(message)
+
+    def close(self, reason: int = 1000) -> None:
+        self.connection.close(reason)
+
+
+def _proxy_process(mode: str, upstream_url: str, conn: multiprocessing.connection.Connection) -> None:
+    """Run the proxy in a child process and report its CPU time when stopped."""
+    handler = VoiceProxyHandler(Mock())
+
+    async def forward(transport: Any) -> None:
+        async with websockets.asyncio.client.connect(upstream_url, compression=None) as upstream:
+            await handler._handle_message_forwarding(  # pylint: disable=protected-access
+                transport, upstream, uuid.uuid4().hex
+            )
+
+    cpu_start = time.process_time()
+
+    if mode == "native":
+
+        async def serve() -> None:
+            async def on_connection(connection: websockets.asyncio.server.ServerConnection) -> None:
+                await forward(WebSocketsClientTransport(connection))
+
+            async with websockets.asyncio.server.serve(on_connection, HOST, 0, compression=None) as server:
+                conn.send(list(server.sockets)[0].getsockname()[1])
+                while not conn.poll():
+                    await asyncio.sleep(STOP_POLL_INTERVAL)
+
+        asyncio.run(serve())
+    else:
+
+        def on_sync_connection(connection: websockets.sync.server.ServerConnection) -> None:
+            asyncio.run(forward(BlockingClientTransport(_SimpleWebSocketShim(connection))))  # type: ignore[arg-type]
+
+        server = websockets.sync.server.serve(on_sync_connection, HOST, 0, compression=None)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        conn.send(server.socket.getsockname()[1])
+        while not conn.poll(STOP_POLL_INTERVAL):
+            pass
+        server.shutdown()
+
+    conn.recv()
+    conn.send(time.process_time() - cpu_start)
+
+
+async def _echo(connection: websockets.asyncio.server.ServerConnection) -> None:
+    """Stand-in for the Azure Voice API that echoes every frame back."""
+    async for message in connection:
+        await connection.send(message)
+
+
+async def _run_session(port: int, messages: int, interval: float, audio: str) -> List[float]:
+    """Stream audio frames through the proxy and return per-message round-trip latencies."""
+    sent_at: Dict[int, float] = {}
+    latencies: List[float] = []
+
+    async with websockets.asyncio.client.connect(f"ws://{HOST}:{port}", compression=None) as ws:
+
+        async def receiver() -> None:
+            async for message in ws:
+                seq = json.loads(message)["seq"]
+                latencies.append(time.perf_counter() - sent_at.pop(seq))
+                if len(latencies) == messages:
+                    return
+
+        receive_task = asyncio.create_task(receiver())
+        for seq in range(messages):
+            sent_at[seq] = time.perf_counter()
+            await ws.send(json.dumps({"seq": seq, "type": "input_audio_buffer.append", "audio": audio}))
+            await asyncio.sleep(interval)
+        await asyncio.wait_for(receive_task, DRAIN_TIMEOUT)
+
+    return latencies
+
+
+async def _run_clients(port: int, args: argparse.Namespace) -> List[float]:
+    """Run all client sessions concurrently."""
+    audio = base64.b64encode(os.urandom(AUDIO_CHUNK_BYTES)).decode("ascii")
+    results = await asyncio.gather(
+        *(_run_session(port, args.messages, args.interval, audio) for _ in range(args.sessions))
+    )
+    return [latency for session in results for latency in session]
+
+
+def _receive_from_proxy(
+    conn: multiprocessing.connection.Connection, process: multiprocessing.process.BaseProcess
+) -> Any:
+    """Wait for a message from the proxy process, failing if it exits or does not answer in time."""
+    deadline = time.monotonic() + PROXY_TIMEOUT
+    while not conn.poll(STOP_POLL_INTERVAL):
+        if not process.is_alive():
+            raise RuntimeError(f"Proxy process exited with code {process.exitcode}")
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Proxy process did not answer within {PROXY_TIMEOUT} seconds")
+    return conn.recv()
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Return the given percentile of a list of values."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _benchmark_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Benchmark a single transport mode."""
+    async with websockets.asyncio.server.serve(_echo, HOST, 0, compression=None) as upstream:
+        upstream_url = f"ws://{HOST}:{list(upstream.sockets)[0].getsockname()[1]}"
+
+        parent_conn, child_conn = multiprocessing.get_context("spawn").Pipe()
+        process = multiprocessing.get_context("spawn").Process(
+            target=_proxy_process, args=(mode, upstream_url, child_conn), daemon=True
+        )
+        process.start()
+        loop = asyncio.get_running_loop()
+        try:
+            port = await loop.run_in_executor(None, _receive_from_proxy, parent_conn, process)
+
+            started = time.perf_counter()
+            latencies = await _run_clients(port, args)
+            elapsed = time.perf_counter() - started
+
+            parent_conn.send("stop")
+            proxy_cpu = await loop.run_in_executor(None, _receive_from_proxy, parent_conn, process)
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    total_messages = len(latencies)
+    return {
+        "mode": mode,
+        "sessions": args.sessions,
+        "messages": total_messages,
+        "elapsed_s": round(elapsed, 3),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 3),
+            "p50": round(_percentile(latencies, 50) * 1000, 3),
+            "p95": round(_percentile(latencies, 95) * 1000, 3),
+            "p99": round(_percentile(latencies, 99) * 1000, 3),
+        },
+        "proxy_cpu_ms_per_session": round(proxy_cpu * 1000 / args.sessions, 3),
+        "proxy_cpu_us_per_message": round(proxy_cpu * 1_000_000 / max(total_messages, 1), 3),
+    }
+
+
+def main() -> None:
+    """Run the forwarding benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=(*MODES, "both"), default="both")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent client sessions")
+    parser.add_argument("--messages", type=int, default=100, help="Audio frames sent per session")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between frames (0.1 = real time)")
+    parser.add_argument("--output", help="Optional path to write JSON results")
+    args = parser.parse_args()
+
+    modes = MODES if args.mode == "both" else (args.mode,)
+    results = [asyncio.run(_benchmark_mode(mode, args)) for mode in modes]
+
+    for result in results:
+        latency = result["latency_ms"]
+        print(
+            f"{result['mode']:>8}: p50={latency['p50']:.2f}ms p95={latency['p95']:.2f}ms "
+            f"p99={latency['p99']:.2f}ms cpu/session={result['proxy_cpu_ms_per_session']:.1f}ms "
+            f"cpu/msg={result['proxy_cpu_us_per_message']:.1f}us"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Concurrent-session load generator for the voice proxy.
+
+Opens many ``/ws/voice`` clients against a running proxy, streams PCM16 audio at
+real-time pace and records:
+
+- time to ``proxy.connected`` and rejected or failed sessions
+- forwarding latency of every upstream event that carries a ``sent_at`` stamp
+  (run the mock Voice Live server with ``--timestamps`` on the same host)
+- time to first audio, from the last audio chunk sent before ``speech_stopped`` to the
+  first ``response.audio.delta``
+- message and byte throughput in both directions
+- CPU and RSS of the proxy process (``--proxy-pid``, Linux only)
+
+The number of sessions follows ramp stages ``<sessions>:<seconds>``. Each stage moves
+linearly from the previous target to its own over its duration, so ``50:30,50:60``
+ramps up to 50 sessions over 30 s and holds them for 60 s. Results are written as JSON
+and can be compared with an earlier run.
+
+Usage:
+    cd backend
+    python -m tools.mock_voice_live --timestamps &
+    VOICE_LIVE_URL=ws://127.0.0.1:8765/voice-agent/realtime python src/app.py &
+    python -m tools.load_test --stages 50:30,50:60,200:60 --proxy-pid <pid> --output run.json
+    python -m tools.load_test --stages 50:30,50:60,200:60 --proxy-pid <pid> --compare run.json
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import resource
+import time
+import wave
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import websockets
+import websockets.asyncio.client
+
+DEFAULT_URL = "ws://127.0.0.1:8000/ws/voice"
+SAMPLE_RATE = 24000
+CHUNK_MS = 100
+# Bytes per 100 ms of 24 kHz PCM16, matching the browser recorder worklet
+CHUNK_BYTES = SAMPLE_RATE * 2 * CHUNK_MS // 1000
+CONTROL_INTERVAL = 0.1
+CONNECT_TIMEOUT = 30.0
+
+# Metrics compared between runs, as (section, key) paths into the results
+COMPARED_METRICS = (
+    ("connect_ms", "p95"),
+    ("forwarding_latency_ms", "p50"),
+    ("forwarding_latency_ms", "p99"),
+    ("ttfa_ms", "p50"),
+    ("ttfa_ms", "p95"),
+    ("throughput", "received_msgs_per_s"),
+    ("proxy", "cpu_pct_mean"),
+    ("proxy", "rss_mb_max"),
+)
+
+Stage = Tuple[int, float]
+
+
+def parse_stages(value: str) -> List[Stage]:
+    """
+    Parse ramp stages such as ``"10:30,50:60"``.
+
+    Args:
+        value: Comma-separated ``<sessions>:<seconds>`` pairs
+
+    Returns:
+        List[Stage]: Target session counts and stage durations
+    """
+    stages = []
+    for part in value.split(","):
+        sessions, seconds = part.split(":")
+        stages.append((int(sessions), float(seconds)))
+    return stages
+
+
+def target_sessions(stages: Sequence[Stage], elapsed: float) -> Optional[int]:
+    """
+    Get the session count a ramp profile asks for at a point in time.
+
+    Args:
+        stages: The ramp stages
+        elapsed: Seconds since the start of the run
+
+    Returns:
+        Optional[int]: Target session count, or None once the last stage has ended
+    """
+    previous = 0
+    for sessions, seconds in stages:
+        if elapsed < seconds:
+            return round(previous + (sessions - previous) * elapsed / seconds)
+        elapsed -= seconds
+        previous = sessions
+    return None
+
+
+def load_audio(path: Optional[str]) -> bytes:
+    """
+    Load 24 kHz mono PCM16 audio from a WAV file, or synthesize speech-like audio.
+
+    Args:
+        path: WAV file path, or None
+
+    Returns:
+        bytes: PCM16 samples
+    """
+    if path is None:
+        # Three seconds of a modulated tone followed by one second of silence
+        t = np.arange(3 * SAMPLE_RATE) / SAMPLE_RATE
+        speech = np.sin(2 * np.pi * 180 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)) * 8000
+        return np.concatenate((speech, np.zeros(SAMPLE_RATE))).astype("<i2").tobytes()
+    with wave.open(path, "rb") as wav:
+        if wav.getframerate() != SAMPLE_RATE or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"{path} must be 24 kHz mono 16-bit PCM")
+        return wav.readframes(wav.getnframes())
+
+
+def percentiles(values: List[float]) -> Optional[Dict[str, float]]:
+    """Summarize values in milliseconds, or None if there are none."""
+    if not values:
+        return None
+    ordered = np.sort(np.asarray(values)) * 1000
+    return {
+        "count": len(values),
+        "mean": round(float(ordered.mean()), 3),
+        "p50": round(float(np.percentile(ordered, 50)), 3),
+        "p95": round(float(np.percentile(ordered, 95)), 3),
+        "p99": round(float(np.percentile(ordered, 99)), 3),
+        "max": round(float(ordered[-1]), 3),
+    }
+
+
+class LoadStats:
+    """Measurements shared by all client sessions of a run."""
+
+    def __init__(self) -> None:
+        self.started = 0
+        self.connected = 0
+        self.failed = 0
+        self.rejected = 0
+        self.connect_times: List[float] = []
+        self.forwarding_latencies: List[float] = []
+        self.ttfa: List[float] = []
+        self.sent_messages = 0
+        self.sent_bytes = 0
+        self.received_messages = 0
+        self.received_bytes = 0
+
+
+class ProcessSampler:
+    """Samples CPU and RSS of a process from ``/proc``."""
+
+    def __init__(self, pid: int, interval: float = 1.0):
+        """
+        Initialize the sampler.
+
+        Args:
+            pid: The process to sample
+            interval: Seconds between samples
+        """
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[Dict[str, float]] = []
+        self._ticks_per_second = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+
+    def _read(self) -> Tuple[float, float]:
+        """Read the process CPU seconds and RSS in MB."""
+        with open(f"/proc/{self.pid}/stat", encoding="ascii") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{self.pid}/statm", encoding="ascii") as f:
+            rss_pages = int(f.read().split()[1])
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self._ticks_per_second
+        return cpu_seconds, rss_pages * self._page_size / 1024 / 1024
+
+    async def run(self, started: float) -> None:
+        """Sample until cancelled."""
+        last_cpu, _ = self._read()
+        last_time = time.monotonic()
+        while True:
+            await asyncio.sleep(self.interval)
+            cpu, rss_mb = self._read()
+            now = time.monotonic()
+            self.samples.append(
+                {
+                    "t": round(now - started, 1),
+                    "cpu_pct": round(100 * (cpu - last_cpu) / (now - last_time), 1),
+                    "rss_mb": round(rss_mb, 1),
+                }
+            )
+            last_cpu, last_time = cpu, now
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """Summarize the samples."""
+        if not self.samples:
+            return None
+        cpu = [sample["cpu_pct"] for sample in self.samples]
+        return {
+            "pid": self.pid,
+            "cpu_pct_mean": round(sum(cpu) / len(cpu), 1),
+            "cpu_pct_max": max(cpu),
+            "rss_mb_max": max(sample["rss_mb"] for sample in self.samples),
+            "samples": self.samples,
+        }
+
+
+async def run_session(args: argparse.Namespace, audio: bytes, stats: LoadStats, stop: asyncio.Event) -> None:
+    """
+    Run one client session until asked to stop.
+
+    Args:
+        args: Command line arguments
+        audio: PCM16 audio streamed in a loop
+        stats: Shared measurements
+        stop: Set when the session should end
+    """
+    stats.started += 1
+    opened = time.monotonic()
+    try:
+        async with websockets.asyncio.client.connect(
+            args.url, compression=None, open_timeout=CONNECT_TIMEOUT, max_size=None
+        ) as ws:
+            session: Dict[str, Any] = {"binary_audio": args.binary}
+            if args.agent_id:
+                session["agent_id"] = args.agent_id
+            await ws.send(json.dumps({"type": "session.update", "session": session}))
+
+            connected = await asyncio.wait_for(_wait_connected(ws, stats), CONNECT_TIMEOUT)
+            if connected is None:
+                return
+            stats.connected += 1
+            stats.connect_times.append(time.monotonic() - opened)
+
+            turn = {"last_append": 0.0, "turn_end": None}
+            receiver = asyncio.create_task(_receive(ws, stats, turn))
+            try:
+                await _stream_audio(ws, audio, connected.get("binary_audio") is True, stats, turn, stop)
+            finally:
+                receiver.cancel()
+    except (OSError, asyncio.TimeoutError, websockets.WebSocketException):
+        stats.failed += 1
+
+
+async def _wait_connected(ws: websockets.asyncio.client.ClientConnection, stats: LoadStats) -> Optional[Dict[str, Any]]:
+    """Wait for ``proxy.connected``, or return None if the session was refused."""
+    async for message in ws:
+        event = json.loads(message)
+        if event.get("type") == "proxy.connected":
+            return event
+        if event.get("type") == "error":
+            if str(event.get("error", {}).get("code", "")).startswith("session_rejected"):
+                stats.rejected += 1
+            else:
+                stats.failed += 1
+            return None
+    stats.failed += 1
+    return None
+
+
+async def _stream_audio(
+    ws: websockets.asyncio.client.ClientConnection,
+    audio: bytes,
+    binary: bool,
+    stats: LoadStats,
+    turn: Dict[str, Any],
+    stop: asyncio.Event,
+) -> None:
+    """Send audio chunks at real-time pace until stopped."""
+    chunks = [audio[i : i + CHUNK_BYTES] for i in range(0, len(audio), CHUNK_BYTES)]
+    frames = chunks if binary else [_append_frame(chunk) for chunk in chunks]
+    started = time.monotonic()
+    index = 0
+    while not stop.is_set():
+        frame = frames[index % len(frames)]
+        await ws.send(frame)
+        turn["last_append"] = time.monotonic()
+        stats.sent_messages += 1
+        stats.sent_bytes += len(frame)
+        index += 1
+        delay = started + index * CHUNK_MS / 1000 - time.monotonic()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(stop.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+def _append_frame(chunk: bytes) -> str:
+    """Build a JSON ``input_audio_buffer.append`` frame."""
+    return json.dumps({"type": "input_audio_buffer.append", "audio": base64.b64encode(chunk).decode("ascii")})
+
+
+async def _receive(ws: websockets.asyncio.client.ClientConnection, stats: LoadStats, turn: Dict[str, Any]) -> None:
+    """Record latency and throughput of events forwarded by the proxy."""
+    async for message in ws:
+        received_at = time.time()
+        now = time.monotonic()
+        stats.received_messages += 1
+        stats.received_bytes += len(message)
+        event = json.loads(message)
+        sent_at = event.get("sent_at")
+        if isinstance(sent_at, (int, float)):
+            stats.forwarding_latencies.append(received_at - sent_at)
+        event_type = event.get("type")
+        if event_type == "input_audio_buffer.speech_stopped":
+            turn["turn_end"] = turn["last_append"]
+        elif event_type == "response.audio.delta" and turn["turn_end"] is not None:
+            stats.ttfa.append(now - turn["turn_end"])
+            turn["turn_end"] = None
+
+
+async def run_load(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run sessions following the ramp stages and summarize the measurements.
+
+    Args:
+        args: Command line arguments
+
+    Returns:
+        Dict[str, Any]: The run results
+    """
+    stages = parse_stages(args.stages)
+    audio = load_audio(args.audio)
+    stats = LoadStats()
+    sampler = ProcessSampler(args.proxy_pid) if args.proxy_pid else None
+    sessions: List[Tuple[asyncio.Task[None], asyncio.Event]] = []
+    timeline: List[Dict[str, Any]] = []
+
+    started = time.monotonic()
+    cpu_started = resource.getrusage(resource.RUSAGE_SELF)
+    sampler_task = asyncio.create_task(sampler.run(started)) if sampler else None
+    next_report = 0.0
+    while True:
+        elapsed = time.monotonic() - started
+        target = target_sessions(stages, elapsed)
+        if target is None:
+            break
+        sessions = [(task, stop) for task, stop in sessions if not task.done()]
+        while len(sessions) < target:
+            stop = asyncio.Event()
+            sessions.append((asyncio.create_task(run_session(args, audio, stats, stop)), stop))
+        while len(sessions) > target:
+            sessions.pop()[1].set()
+        if elapsed >= next_report:
+            timeline.append({"t": round(elapsed, 1), "target": target, "active": len(sessions)})
+            print(f"t={elapsed:6.1f}s sessions={len(sessions):4d} rejected={stats.rejected} failed={stats.failed}")
+            next_report += 1.0
+        await asyncio.sleep(CONTROL_INTERVAL)
+
+    for _, stop in sessions:
+        stop.set()
+    await asyncio.gather(*(task for task, _ in sessions), return_exceptions=True)
+    if sampler_task:
+        sampler_task.cancel()
+    duration = time.monotonic() - started
+    cpu_ended = resource.getrusage(resource.RUSAGE_SELF)
+
+    return {
+        "config": {
+            "url": args.url,
+            "stages": stages,
+            "binary": args.binary,
+            "audio": args.audio,
+        },
+        "duration_s": round(duration, 1),
+        "sessions": {
+            "started": stats.started,
+            "connected": stats.connected,
+            "rejected": stats.rejected,
+            "failed": stats.failed,
+            "peak": max((point["active"] for point in timeline), default=0),
+        },
+        "connect_ms": percentiles(stats.connect_times),
+        "forwarding_latency_ms": percentiles(stats.forwarding_latencies),
+        "ttfa_ms": percentiles(stats.ttfa),
+        "throughput": {
+            "sent_msgs_per_s": round(stats.sent_messages / duration, 1),
+            "received_msgs_per_s": round(stats.received_messages / duration, 1),
+            "sent_bytes_per_s": round(stats.sent_bytes / duration),
+            "received_bytes_per_s": round(stats.received_bytes / duration),
+        },
+        "proxy": sampler.summary() if sampler else None,
+        "generator_cpu_s": round(
+            cpu_ended.ru_utime + cpu_ended.ru_stime - cpu_started.ru_utime - cpu_started.ru_stime, 2
+        ),
+        "timeline": timeline,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Compare key metrics of two runs.
+
+    Args:
+        current: Results of this run
+        baseline: Results of an earlier run
+
+    Returns:
+        List[str]: One line per metric present in both runs
+    """
+    lines = []
+    for section, key in COMPARED_METRICS:
+        new = (current.get(section) or {}).get(key)
+        old = (baseline.get(section) or {}).get(key)
+        if new is None or old is None:
+            continue
+        change = f"{100 * (new - old) / old:+.1f}%" if old else "n/a"
+        lines.append(f"{section + '.' + key:<32} {old:>12} -> {new:<12} ({change})")
+    return lines
+
+
+def _print_summary(results: Dict[str, Any]) -> None:
+    """Print the headline figures of a run."""
+    print(json.dumps({key: value for key, value in results.items() if key not in ("timeline", "proxy")}, indent=2))
+    proxy = results["proxy"]
+    if proxy:
+        print(f"proxy cpu mean={proxy['cpu_pct_mean']}% max={proxy['cpu_pct_max']}% rss max={proxy['rss_mb_max']} MB")
+
+
+def main() -> None:
+    """Run the load generator."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="Voice proxy WebSocket URL")
+    parser.add_argument("--stages", default="10:10,10:30", help="Ramp stages as <sessions>:<seconds>,...")
+    parser.add_argument("--audio", help="24 kHz mono 16-bit WAV file streamed in a loop (synthesized if omitted)")
+    parser.add_argument("--binary", action="store_true", help="Negotiate binary PCM16 microphone frames")
+    parser.add_argument("--agent-id", help="Agent ID sent in the first session.update")
+    parser.add_argument("--proxy-pid", type=int, help="PID of the proxy process to sample CPU and RSS from")
+    parser.add_argument("--output", help="Path to write JSON results")
+    parser.add_argument("--compare", help="Earlier results JSON to compare this run with")
+    args = parser.parse_args()
+
+    if args.proxy_pid and not os.path.exists(f"/proc/{args.proxy_pid}/stat"):
+        parser.error("--proxy-pid needs a running process and a /proc filesystem")
+
+    results = asyncio.run(run_load(args))
+    _print_summary(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare}:")
+        for line in compare(results, baseline):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Local stand-in for a Redis server, for running several workers against a shared state store.
+
+Implements the commands the Redis state store uses: ``PING``, ``AUTH``, ``SELECT``,
+``HGET``, ``HSET``, ``HDEL`` and ``HKEYS``. Data is kept in memory and lost on exit.
+
+Usage:
+    cd backend && python -m tools.mock_redis --port 6390
+
+Then point every worker at it:
+    STATE_STORE_URL=redis://127.0.0.1:6390/0 uvicorn src.asgi:application --workers 4
+"""
+
+import argparse
+import logging
+import socketserver
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 6390
+
+
+def _simple(value: str) -> bytes:
+    return f"+{value}\r\n".encode("utf-8")
+
+
+def _error(message: str) -> bytes:
+    return f"-ERR {message}\r\n".encode("utf-8")
+
+
+def _integer(value: int) -> bytes:
+    return f":{value}\r\n".encode("ascii")
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _array(values: List[bytes]) -> bytes:
+    return b"*%d\r\n%s" % (len(values), b"".join(_bulk(value) for value in values))
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    """Serve commands from one client connection."""
+
+    server: "MockRedisServer"
+
+    def handle(self) -> None:
+        db = 0
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            name = command[0].upper().decode("utf-8") if command else ""
+            if name == "SELECT":
+                db = int(command[1])
+                reply = _simple("OK")
+            else:
+                reply = self.server.execute(db, name, command[1:])
+            self.wfile.write(reply)
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line.startswith(b"*"):
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+
+class MockRedisServer(socketserver.ThreadingTCPServer):
+    """An in-memory server for the hash commands of the Redis protocol."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        super().__init__((host, port), _RespHandler)
+        self.hashes: Dict[Tuple[int, bytes], Dict[bytes, bytes]] = {}
+        self.commands = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """The server URL, usable as the proxy's ``STATE_STORE_URL``."""
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> None:
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info("Mock Redis server listening on %s", self.url)
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self.shutdown()
+        self.server_close()
+
+    def execute(self, db: int, name: str, args: List[bytes]) -> bytes:
+        """Run one command and return its encoded reply."""
+        with self._lock:
+            self.commands += 1
+            if name == "PING":
+                return _simple("PONG")
+            if name == "AUTH":
+                return _simple("OK")
+            if name in ("HGET", "HSET", "HDEL", "HKEYS") and not args:
+                return _error(f"wrong number of arguments for '{name.lower()}' command")
+            fields = self.hashes.get((db, args[0]), {}) if args else {}
+            if name == "HGET":
+                return _bulk(fields.get(args[1]))
+            if name == "HSET":
+                fields = self.hashes.setdefault((db, args[0]), {})
+                pairs = list(zip(args[1::2], args[2::2]))
+                added = sum(1 for key, _ in pairs if key not in fields)
+                fields.update(pairs)
+                return _integer(added)
+            if name == "HDEL":
+                return _integer(sum(1 for key in args[1:] if fields.pop(key, None) is not None))
+            if name == "HKEYS":
+                return _array(list(fields))
+            return _error(f"unknown command '{name}'")
+
+
+def main() -> None:
+    """Run the mock Redis server."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockRedisServer(args.host, args.port)
+    print(f"Mock Redis server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
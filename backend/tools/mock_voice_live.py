@@ -0,0 +1,302 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Local stand-in for the Azure Voice Live realtime endpoint, for offline and load testing.
+
+Implements the part of the realtime protocol the voice proxy depends on:
+
+- ``session.update`` is acknowledged with ``session.updated``
+- ``input_audio_buffer.append`` audio is consumed; once a turn's worth of audio has
+  arrived the server reports ``speech_started``/``speech_stopped``, a user transcript,
+  and then a scripted response; audio received while a response is pending is ignored
+- ``input_audio_buffer.commit`` and ``response.create`` trigger a response immediately
+- ``conversation.item.create`` is acknowledged with ``conversation.item.created``
+
+A response waits for the configured latency plus random jitter, then streams
+``response.audio.delta`` chunks of 24 kHz PCM16 at real-time pace, followed by the
+assistant transcript and ``response.done``. With ``--timestamps`` every event carries
+its wall-clock send time, so a load generator on the same host can measure how long
+the proxy took to forward it.
+
+Usage:
+    cd backend && python -m tools.mock_voice_live --port 8765 --latency-ms 400 --jitter-ms 100
+
+Then point the proxy at it:
+    VOICE_LIVE_URL=ws://127.0.0.1:8765/voice-agent/realtime AZURE_OPENAI_API_KEY=local python src/app.py
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import websockets
+import websockets.asyncio.server
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SAMPLE_RATE = 24000
+# Bytes per millisecond of 24 kHz PCM16 audio
+PCM_BYTES_PER_MS = 48
+AUDIO_CHUNK_MS = 100
+DEFAULT_REPLIES = (
+    "Thanks for calling. What can you tell me about your product?",
+    "That sounds interesting, but how does the pricing compare to what we use today?",
+    "I see. Could you send me a proposal so I can discuss it with my team?",
+)
+
+
+def _event(event_type: str, **fields: Any) -> str:
+    """Serialize a server event with a fresh event id."""
+    return json.dumps({"type": event_type, "event_id": f"event_{uuid.uuid4().hex[:16]}", **fields})
+
+
+def _reply_audio(duration_ms: int) -> bytes:
+    """Generate a quiet tone standing in for synthesized speech."""
+    t = np.arange(duration_ms * SAMPLE_RATE // 1000) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 220 * t) * 3000).astype("<i2").tobytes()
+
+
+class MockVoiceLiveServer:
+    """A scripted realtime server that stands in for Azure Voice Live."""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        latency_ms: float = 300,
+        jitter_ms: float = 0,
+        turn_audio_ms: int = 2000,
+        reply_audio_ms: int = 2000,
+        replies: Sequence[str] = DEFAULT_REPLIES,
+        realtime: bool = True,
+        timestamps: bool = False,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency_ms: Delay before a response starts
+            jitter_ms: Maximum random delay added to the latency
+            turn_audio_ms: Input audio that makes up one user turn
+            reply_audio_ms: Length of each response's audio
+            replies: Assistant transcripts, used in turn
+            realtime: Stream response audio at playback pace instead of as fast as possible
+            timestamps: Add the wall-clock send time to every event as ``sent_at``
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.turn_audio_ms = turn_audio_ms
+        self.reply_audio_ms = reply_audio_ms
+        self.replies = list(replies)
+        self.realtime = realtime
+        self.timestamps = timestamps
+        self.sessions = 0
+        self.reply_chunks = self._chunk(_reply_audio(reply_audio_ms))
+        self._server: Optional[websockets.asyncio.server.Server] = None
+
+    @staticmethod
+    def _chunk(audio: bytes) -> List[str]:
+        """Split audio into base64 chunks of ``AUDIO_CHUNK_MS``."""
+        size = AUDIO_CHUNK_MS * PCM_BYTES_PER_MS
+        return [base64.b64encode(audio[i : i + size]).decode("ascii") for i in range(0, len(audio), size)]
+
+    @property
+    def url(self) -> str:
+        """The realtime endpoint URL, usable as the proxy's ``VOICE_LIVE_URL``."""
+        return f"ws://{self.host}:{self.port}/voice-agent/realtime"
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await websockets.asyncio.server.serve(self._handle, self.host, self.port, compression=None)
+        self.port = list(self._server.sockets)[0].getsockname()[1]
+        logger.info("Mock Voice Live server listening on %s", self.url)
+
+    async def stop(self) -> None:
+        """Stop listening and close open sessions."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, connection: websockets.asyncio.server.ServerConnection) -> None:
+        """Serve one realtime session."""
+        self.sessions += 1
+        session = _MockSession(self, connection)
+        try:
+            await session.run()
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            session.cancel()
+
+
+class _MockSession:
+    """State of one connection to the mock server."""
+
+    def __init__(self, server: MockVoiceLiveServer, connection: websockets.asyncio.server.ServerConnection):
+        self.server = server
+        self.connection = connection
+        self.session: Dict[str, Any] = {}
+        self.turn_audio_bytes = 0
+        self.speaking = False
+        self.turns = 0
+        self._response: Optional["asyncio.Task[None]"] = None
+
+    def _event(self, event_type: str, **fields: Any) -> str:
+        """Serialize a server event, stamped with its send time if enabled."""
+        if self.server.timestamps:
+            fields["sent_at"] = time.time()
+        return _event(event_type, **fields)
+
+    async def run(self) -> None:
+        """Handle client events until the connection closes."""
+        await self.connection.send(self._event("session.created", session={"id": f"sess_{uuid.uuid4().hex[:16]}"}))
+        async for message in self.connection:
+            event = json.loads(message)
+            event_type = event.get("type")
+            if event_type == "session.update":
+                self.session.update(event.get("session") or {})
+                await self.connection.send(self._event("session.updated", session=self.session))
+            elif event_type == "input_audio_buffer.append":
+                await self._on_audio(event.get("audio") or "")
+            elif event_type == "input_audio_buffer.commit":
+                await self._end_user_turn()
+            elif event_type == "response.create":
+                self._start_response()
+            elif event_type == "conversation.item.create":
+                item = {"id": f"item_{uuid.uuid4().hex[:16]}", **(event.get("item") or {})}
+                await self.connection.send(self._event("conversation.item.created", item=item))
+
+    async def _on_audio(self, audio: str) -> None:
+        """Consume input audio and end the user turn once enough has arrived."""
+        if self._response is not None and not self._response.done():
+            # Audio heard while the assistant is answering is treated as echo
+            return
+        if not self.speaking:
+            self.speaking = True
+            await self.connection.send(self._event("input_audio_buffer.speech_started"))
+        self.turn_audio_bytes += len(audio) * 3 // 4
+        if self.turn_audio_bytes >= self.server.turn_audio_ms * PCM_BYTES_PER_MS:
+            await self._end_user_turn()
+
+    async def _end_user_turn(self) -> None:
+        """Report the end of the user's speech and respond to it."""
+        self.speaking = False
+        self.turn_audio_bytes = 0
+        self.turns += 1
+        item_id = f"item_{uuid.uuid4().hex[:16]}"
+        await self.connection.send(self._event("input_audio_buffer.speech_stopped", item_id=item_id))
+        await self.connection.send(self._event("input_audio_buffer.committed", item_id=item_id))
+        await self.connection.send(
+            self._event(
+                "conversation.item.input_audio_transcription.completed",
+                item_id=item_id,
+                content_index=0,
+                transcript=f"User turn {self.turns}",
+            )
+        )
+        self._start_response()
+
+    def _start_response(self) -> None:
+        """Start a response unless one is already streaming."""
+        if self._response is None or self._response.done():
+            self._response = asyncio.create_task(self._respond())
+
+    async def _respond(self) -> None:
+        """Stream a scripted response after the configured latency."""
+        server = self.server
+        delay_ms = server.latency_ms + random.uniform(0, server.jitter_ms)
+        await asyncio.sleep(delay_ms / 1000)
+
+        response_id = f"resp_{uuid.uuid4().hex[:16]}"
+        item_id = f"item_{uuid.uuid4().hex[:16]}"
+        transcript = server.replies[(self.turns - 1) % len(server.replies)] if server.replies else ""
+        ids = {"response_id": response_id, "item_id": item_id, "output_index": 0, "content_index": 0}
+        try:
+            await self.connection.send(
+                self._event("response.created", response={"id": response_id, "status": "in_progress"})
+            )
+            for chunk in server.reply_chunks:
+                await self.connection.send(self._event("response.audio.delta", delta=chunk, **ids))
+                if server.realtime:
+                    await asyncio.sleep(AUDIO_CHUNK_MS / 1000)
+            await self.connection.send(self._event("response.audio.done", **ids))
+            await self.connection.send(self._event("response.audio_transcript.done", transcript=transcript, **ids))
+            await self.connection.send(
+                self._event("response.done", response={"id": response_id, "status": "completed"})
+            )
+        except websockets.ConnectionClosed:
+            pass
+
+    def cancel(self) -> None:
+        """Stop any response still streaming."""
+        if self._response:
+            self._response.cancel()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run the server until interrupted."""
+    replies = DEFAULT_REPLIES
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            replies = json.load(f)
+    server = MockVoiceLiveServer(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        turn_audio_ms=args.turn_audio_ms,
+        reply_audio_ms=args.reply_audio_ms,
+        replies=replies,
+        realtime=not args.fast,
+        timestamps=args.timestamps,
+    )
+    await server.start()
+    print(f"Mock Voice Live server listening on {server.url}")
+    try:
+        await asyncio.Future()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    """Run the mock Voice Live server."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=300, help="Delay before each response starts")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Maximum random delay added to the latency")
+    parser.add_argument("--turn-audio-ms", type=int, default=2000, help="Input audio that ends a user turn")
+    parser.add_argument("--reply-audio-ms", type=int, default=2000, help="Audio length of each response")
+    parser.add_argument("--script", help="JSON file with a list of assistant replies")
+    parser.add_argument("--fast", action="store_true", help="Send response audio without real-time pacing")
+    parser.add_argument(
+        "--timestamps", action="store_true", help="Stamp events with their send time for forwarding latency"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
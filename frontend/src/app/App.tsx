@@ -22,7 +22,7 @@ import { useRealtime } from '../hooks/useRealtime'
 import { useWebRTC } from '../hooks/useWebRTC'
 import { useRecorder } from '../hooks/useRecorder'
 import { useAudioPlayer } from '../hooks/useAudioPlayer'
-import { api } from '../services/api'
+import { api, PartialAIAssessment } from '../services/api'
 import { Assessment } from '../types'
 
 const useStyles = makeStyles({
@@ -64,6 +64,8 @@ export default function App() {
   const [showAssessment, setShowAssessment] = useState(false)
   const [currentAgent, setCurrentAgent] = useState<string | null>(null)
   const [assessment, setAssessment] = useState<Assessment | null>(null)
+  const [partialAssessment, setPartialAssessment] =
+    useState<PartialAIAssessment>({})
   const [selectedScenarioData, setSelectedScenarioData] = useState<any>(null)
 
   const { scenarios, selectedScenario, setSelectedScenario, loading } =
@@ -103,12 +105,18 @@ export default function App() {
     }
   }, [])
 
-  const { connected, messages, send, clearMessages, getRecordings } =
-    useRealtime({
-      agentId: currentAgent,
-      onMessage: handleWebRTCMessage,
-      onAudioDelta: playAudio,
-    })
+  const {
+    connected,
+    messages,
+    send,
+    sendAudio,
+    clearMessages,
+    getRecordings,
+  } = useRealtime({
+    agentId: currentAgent,
+    onMessage: handleWebRTCMessage,
+    onAudioDelta: playAudio,
+  })
 
   const sendOffer = useCallback(
     (sdp: string) => {
@@ -119,15 +127,8 @@ export default function App() {
 
   const { setupWebRTC, handleAnswer, videoRef } = useWebRTC(sendOffer)
 
-  const sendAudioChunk = useCallback(
-    (base64: string) => {
-      send({ type: 'input_audio_buffer.append', audio: base64 })
-    },
-    [send]
-  )
-
   const { recording, toggleRecording, getAudioRecording } =
-    useRecorder(sendAudioChunk)
+    useRecorder(sendAudio)
 
   const handleStart = async () => {
     if (!selectedScenario) return
@@ -150,6 +151,7 @@ export default function App() {
     if (!recordings.conversation.length) return
 
     setShowLoading(true)
+    setPartialAssessment({})
 
     try {
       const transcript = recordings.conversation
@@ -160,7 +162,9 @@ export default function App() {
         selectedScenario,
         transcript,
         [...audioData, ...recordings.audio],
-        recordings.conversation
+        recordings.conversation,
+        recordings.sessionId,
+        setPartialAssessment
       )
 
       setAssessment(result)
@@ -219,6 +223,27 @@ export default function App() {
               >
                 This may take up to 30 seconds
               </Text>
+              {partialAssessment.speaking_tone_style && (
+                <Text
+                  size={200}
+                  block
+                  style={{ marginTop: tokens.spacingVerticalS }}
+                >
+                  Speaking tone & style:{' '}
+                  {partialAssessment.speaking_tone_style.total}/30
+                </Text>
+              )}
+              {partialAssessment.conversation_content && (
+                <Text size={200} block>
+                  Conversation content:{' '}
+                  {partialAssessment.conversation_content.total}/70
+                </Text>
+              )}
+              {partialAssessment.strengths?.map(strength => (
+                <Text key={strength} size={200} block>
+                  ✓ {strength}
+                </Text>
+              ))}
             </div>
           </DialogBody>
         </DialogSurface>
@@ -17,7 +17,7 @@ export function useAudioPlayer() {
   }, [])
 
   const playAudio = useCallback(
-    (base64: string) => {
+    (base64: string, sampleRate = 24000) => {
       const audioCtx = initAudio()
       audioCtx.resume?.()
 
@@ -29,7 +29,7 @@ export function useAudioPlayer() {
         float32[i] = int16[i] / 32768
       }
 
-      const buffer = audioCtx.createBuffer(1, float32.length, 24000)
+      const buffer = audioCtx.createBuffer(1, float32.length, sampleRate)
       buffer.getChannelData(0).set(float32)
 
       const src = audioCtx.createBufferSource()
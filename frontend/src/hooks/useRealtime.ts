@@ -9,14 +9,32 @@ import { Message } from '../types'
 interface RealtimeOptions {
   agentId?: string | null
   onMessage?: (msg: any) => void
-  onAudioDelta?: (delta: string) => void
+  onAudioDelta?: (delta: string, sampleRate: number) => void
   onTranscript?: (role: 'user' | 'assistant', text: string) => void
 }
 
+const DEFAULT_OUTPUT_SAMPLE_RATE = 24000
+const OUTPUT_SAMPLE_RATES = [24000, 16000, 8000]
+
+// Response audio rate to ask the proxy for: `?audio_rate=` wins, data saver gets 16 kHz
+function preferredOutputSampleRate(): number {
+  const requested = Number(
+    new URLSearchParams(location.search).get('audio_rate')
+  )
+  if (OUTPUT_SAMPLE_RATES.includes(requested)) return requested
+  return (navigator as any).connection?.saveData
+    ? 16000
+    : DEFAULT_OUTPUT_SAMPLE_RATE
+}
+
 export function useRealtime(options: RealtimeOptions) {
   const [connected, setConnected] = useState(false)
   const [messages, setMessages] = useState<Message[]>([])
   const wsRef = useRef<WebSocket | null>(null)
+  const sessionIdRef = useRef<string | null>(null)
+  const binaryAudioRef = useRef(false)
+  const outputSampleRateRef = useRef(DEFAULT_OUTPUT_SAMPLE_RATE)
+  const retryAfterRef = useRef<number | null>(null)
   const audioRecording = useRef<any[]>([])
   const conversationRecording = useRef<any[]>([])
 
@@ -33,7 +51,12 @@ export function useRealtime(options: RealtimeOptions) {
         ws.send(
           JSON.stringify({
             type: 'session.update',
-            session: { agent_id: options.agentId },
+            // Ask the proxy to accept raw PCM16 microphone frames instead of base64 JSON
+            session: {
+              agent_id: options.agentId,
+              binary_audio: true,
+              output_sample_rate: preferredOutputSampleRate(),
+            },
           })
         )
       }
@@ -44,9 +67,19 @@ export function useRealtime(options: RealtimeOptions) {
       options.onMessage?.(msg)
 
       switch (msg.type) {
+        case 'proxy.connected':
+          sessionIdRef.current = msg.session_id ?? null
+          binaryAudioRef.current = msg.binary_audio === true
+          outputSampleRateRef.current =
+            msg.output_sample_rate ?? DEFAULT_OUTPUT_SAMPLE_RATE
+          break
+        case 'error':
+          // The server is at capacity or draining and asks us to come back later
+          retryAfterRef.current = msg.error?.retry_after_ms ?? null
+          break
         case 'response.audio.delta':
           if (msg.delta) {
-            options.onAudioDelta?.(msg.delta)
+            options.onAudioDelta?.(msg.delta, outputSampleRateRef.current)
             audioRecording.current.push({
               type: 'assistant',
               data: msg.delta,
@@ -89,7 +122,17 @@ export function useRealtime(options: RealtimeOptions) {
       }
     }
 
-    ws.onclose = () => setConnected(false)
+    ws.onclose = () => {
+      setConnected(false)
+      binaryAudioRef.current = false
+      if (retryAfterRef.current !== null && wsRef.current === ws) {
+        const delay = retryAfterRef.current
+        retryAfterRef.current = null
+        setTimeout(() => {
+          if (wsRef.current === ws) connect()
+        }, delay)
+      }
+    }
     wsRef.current = ws
   }, [options.agentId])
 
@@ -99,6 +142,17 @@ export function useRealtime(options: RealtimeOptions) {
     }
   }, [])
 
+  const sendAudio = useCallback((base64: string, pcm: ArrayBuffer) => {
+    if (wsRef.current?.readyState !== WebSocket.OPEN) return
+    if (binaryAudioRef.current) {
+      wsRef.current.send(pcm)
+    } else {
+      wsRef.current.send(
+        JSON.stringify({ type: 'input_audio_buffer.append', audio: base64 })
+      )
+    }
+  }, [])
+
   const clearMessages = useCallback(() => {
     setMessages([])
     conversationRecording.current = []
@@ -107,6 +161,7 @@ export function useRealtime(options: RealtimeOptions) {
 
   const getRecordings = useCallback(
     () => ({
+      sessionId: sessionIdRef.current,
       conversation: conversationRecording.current,
       audio: audioRecording.current,
     }),
@@ -115,13 +170,18 @@ export function useRealtime(options: RealtimeOptions) {
 
   useEffect(() => {
     connect()
-    return () => wsRef.current?.close()
+    return () => {
+      retryAfterRef.current = null
+      wsRef.current?.close()
+      wsRef.current = null
+    }
   }, [connect])
 
   return {
     connected,
     messages,
     send,
+    sendAudio,
     clearMessages,
     getRecordings,
   }
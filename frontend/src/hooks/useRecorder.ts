@@ -39,7 +39,9 @@ class AudioRecorderProcessor extends AudioWorkletProcessor {
 registerProcessor('audio-recorder', AudioRecorderProcessor)
 `
 
-export function useRecorder(onAudioChunk: (base64: string) => void) {
+export function useRecorder(
+  onAudioChunk: (base64: string, pcm: ArrayBuffer) => void
+) {
   const [recording, setRecording] = useState(false)
   const audioCtxRef = useRef<AudioContext | null>(null)
   const workletRef = useRef<AudioWorkletNode | null>(null)
@@ -92,7 +94,7 @@ export function useRecorder(onAudioChunk: (base64: string) => void) {
           data: base64,
           timestamp: new Date().toISOString(),
         })
-        onAudioChunk(base64)
+        onAudioChunk(base64, int16.buffer)
       }
     }
 
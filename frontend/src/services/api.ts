@@ -13,6 +13,35 @@ function extractUserText(conversationMessages: any[]): string {
     .trim()
 }
 
+export type PartialAIAssessment = Partial<
+  NonNullable<Assessment['ai_assessment']>
+>
+
+// Resolves with the full result once the job's event stream reports it done,
+// passing the AI assessment sections received so far to onPartial as they arrive
+function waitForAnalysisJob(
+  eventsUrl: string,
+  onPartial?: (partial: PartialAIAssessment) => void
+): Promise<Assessment> {
+  return new Promise((resolve, reject) => {
+    const events = new EventSource(eventsUrl)
+    let partial: PartialAIAssessment = {}
+    events.addEventListener('ai_assessment.partial', event => {
+      const { section, value } = JSON.parse((event as MessageEvent).data)
+      partial = { ...partial, [section]: value }
+      onPartial?.(partial)
+    })
+    events.addEventListener('done', event => {
+      events.close()
+      resolve(JSON.parse((event as MessageEvent).data))
+    })
+    events.onerror = () => {
+      events.close()
+      reject(new Error('Analysis failed'))
+    }
+  })
+}
+
 export const api = {
   async getConfig() {
     const res = await fetch('/api/config')
@@ -38,22 +67,34 @@ export const api = {
     scenarioId: string,
     transcript: string,
     audioData: any[],
-    conversationMessages: any[]
+    conversationMessages: any[],
+    sessionId?: string | null,
+    onPartial?: (partial: PartialAIAssessment) => void
   ): Promise<Assessment> {
     const referenceText = extractUserText(conversationMessages)
+    const submit = (body: Record<string, unknown>) =>
+      fetch('/api/analyze/jobs', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          scenario_id: scenarioId,
+          transcript,
+          reference_text: referenceText,
+          ...body,
+        }),
+      })
 
-    const res = await fetch('/api/analyze', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({
-        scenario_id: scenarioId,
-        transcript,
-        audio_data: audioData,
-        reference_text: referenceText,
-      }),
-    })
+    // The proxy captures the session audio, so only its id needs to be sent,
+    // unless the capture is gone and the locally recorded audio is needed after all
+    let res = await submit(
+      sessionId ? { session_id: sessionId } : { audio_data: audioData }
+    )
+    if (sessionId && res.status === 404) {
+      res = await submit({ session_id: sessionId, audio_data: audioData })
+    }
     if (!res.ok) throw new Error('Analysis failed')
-    return res.json()
+    const job = await res.json()
+    return waitForAnalysisJob(job.events_url, onPartial)
   },
 
   async generateGraphScenario(): Promise<Scenario> {